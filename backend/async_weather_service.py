@@ -0,0 +1,273 @@
+import asyncio
+import logging
+import time
+from typing import Dict, Optional, Tuple
+
+import httpx
+
+# Setup project path for imports
+from utils.path_helper import setup_project_path
+setup_project_path()
+
+from config.settings import (
+    OPENWEATHER_API_KEY, OPENWEATHER_BASE_URL, TEMPERATURE_UNIT,
+    WEATHER_CACHE_TTL_SECONDS, WEATHER_CACHE_MAX_ENTRIES, WEATHER_CACHE_STALE_WHILE_REVALIDATE,
+    HTTP_POOL_MAXSIZE, HTTP_MAX_RETRIES, HTTP_BACKOFF_FACTOR, HTTP_TIMEOUT_SECONDS,
+    HTTP_MAX_RETRY_AFTER_SECONDS,
+    HISTORY_ENABLED, HISTORY_DIRECTORY,
+    PERSISTENT_CACHE_ENABLED, PERSISTENT_CACHE_PATH, PERSISTENT_CACHE_MAX_AGE_SECONDS, PERSISTENT_CACHE_MAX_BYTES
+)
+from backend.http_transport import RETRYABLE_STATUS_CODES
+from backend.metrics import increment, timed
+from backend.single_flight import AsyncSingleFlightGroup
+from backend.weather_cache import WeatherResponseCache, build_weather_cache_key
+from backend.weather_observation import WeatherObservation
+from backend.weather_service import WeatherDataService, WeatherLookup, last_known_age
+
+weather_logger = logging.getLogger(__name__)
+
+
+class AsyncWeatherDataService:
+    """Asyncio twin of WeatherDataService built on a pooled httpx.AsyncClient"""
+
+    # Processing is pure CPU work on the payload and shared with the sync service
+    process_weather_information = WeatherDataService.process_weather_information
+    # Disk access is shared too, but always called through asyncio.to_thread: SQLite can wait up to
+    # its busy timeout on a writer lock held by the scheduler threads, and history appends take a file lock
+    record_history = WeatherDataService.record_history
+    _restore_persisted_info = WeatherDataService._restore_persisted_info
+    persist_payload = WeatherDataService.persist_payload
+
+    def __init__(self, response_cache: Optional[WeatherResponseCache] = None,
+                 stale_while_revalidate: bool = WEATHER_CACHE_STALE_WHILE_REVALIDATE,
+                 pool_maxsize: int = HTTP_POOL_MAXSIZE,
+                 max_retries: int = HTTP_MAX_RETRIES,
+                 backoff_factor: float = HTTP_BACKOFF_FACTOR,
+                 history_store=None,
+                 call_budget=None,
+                 persistent_cache=None):
+        self.api_key = OPENWEATHER_API_KEY
+        self.base_url = OPENWEATHER_BASE_URL
+        self.units = TEMPERATURE_UNIT
+
+        # Pass the sync service's cache to share readings between both services
+        self.response_cache = response_cache or WeatherResponseCache(
+            WEATHER_CACHE_TTL_SECONDS, WEATHER_CACHE_MAX_ENTRIES
+        )
+        self.stale_while_revalidate = stale_while_revalidate
+        self.pool_maxsize = pool_maxsize
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        # Optional TokenBucket shared with the refresh scheduler; searches may spend every token
+        self.call_budget = call_budget
+
+        # The client binds to the running event loop, so it is created on first use
+        self._http_client: Optional[httpx.AsyncClient] = None
+        self._refresh_tasks: Dict[str, asyncio.Task] = {}
+        
+        # Concurrent misses for the same city (e.g. from several sessions) share one request
+        self.request_coalescer = AsyncSingleFlightGroup()
+        
+        # Every fresh reading is appended to the local history store
+        self.history_store = history_store
+        if self.history_store is None and HISTORY_ENABLED:
+            from backend.observation_store import ObservationHistoryStore
+            self.history_store = ObservationHistoryStore(HISTORY_DIRECTORY)
+
+        # Raw payloads are also kept on disk: restarts start warm and outages fall back to the last good reading
+        self.persistent_cache = persistent_cache
+        if self.persistent_cache is None and PERSISTENT_CACHE_ENABLED:
+            from backend.persistent_cache import PersistentResponseCache
+            self.persistent_cache = PersistentResponseCache(
+                PERSISTENT_CACHE_PATH, PERSISTENT_CACHE_MAX_AGE_SECONDS, PERSISTENT_CACHE_MAX_BYTES
+            )
+
+        # Validate API key is available
+        if not self.api_key:
+            raise ValueError("OpenWeatherMap API key is not configured. Please check your .env file.")
+
+        weather_logger.info("Async weather service initialized successfully")
+
+    def _get_http_client(self) -> httpx.AsyncClient:
+        """Return the pooled async client, creating it inside the running loop"""
+        if self._http_client is None or self._http_client.is_closed:
+            self._http_client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=self.pool_maxsize,
+                    max_keepalive_connections=self.pool_maxsize
+                ),
+                timeout=HTTP_TIMEOUT_SECONDS,
+                transport=httpx.AsyncHTTPTransport(retries=self.max_retries)
+            )
+        return self._http_client
+
+    def _retry_delay_seconds(self, api_response: httpx.Response, attempt: int) -> float:
+        """Use Retry-After when the server sends it, capped at HTTP_MAX_RETRY_AFTER_SECONDS, else backoff"""
+        retry_after = api_response.headers.get("Retry-After")
+        if retry_after and retry_after.strip().isdigit():
+            return min(float(retry_after.strip()), HTTP_MAX_RETRY_AFTER_SECONDS)
+        return self.backoff_factor * (2 ** attempt)
+
+    async def _wait_for_call_budget(self):
+        """Sleep until the shared API call budget allows another call"""
+        if self.call_budget is None:
+            return
+        while not self.call_budget.try_acquire():
+            await asyncio.sleep(self.call_budget.seconds_until_available())
+
+    async def fetch_weather_data(self, city_name: str, city_id: Optional[int] = None) -> Optional[Dict]:
+        """
+        Fetch weather data from OpenWeatherMap API without blocking the event loop
+
+        Args:
+            city_name (str): Name of the city to get weather for
+            city_id (int): OpenWeatherMap city ID, queried instead of the name when given
+
+        Returns:
+            Dict: Weather data or None if request fails
+        """
+        request_params = {"appid": self.api_key, "units": self.units}
+        if city_id is not None:
+            request_params["id"] = city_id
+        else:
+            request_params["q"] = city_name
+        http_client = self._get_http_client()
+
+        try:
+            weather_logger.info(f"Fetching weather data for: {city_name}")
+            for attempt in range(self.max_retries + 1):
+                await self._wait_for_call_budget()
+                # Wall time of the request on the event loop, including waits for other tasks
+                with timed("http_request"):
+                    api_response = await http_client.get(self.base_url, params=request_params)
+                increment("api_requests")
+                if api_response.status_code not in RETRYABLE_STATUS_CODES or attempt == self.max_retries:
+                    break
+                increment("api_retries")
+                await asyncio.sleep(self._retry_delay_seconds(api_response, attempt))
+
+            api_response.raise_for_status()
+            with timed("json_decode"):
+                return api_response.json()
+
+        except httpx.HTTPError as request_error:
+            weather_logger.error(f"Error fetching weather data: {request_error}")
+            increment("api_failures")
+            return None
+        except ValueError as decode_error:
+            weather_logger.error(f"Unexpected error: {decode_error}")
+            return None
+
+    async def _lookup_cached_info(self, cache_key: str) -> Tuple[Optional[WeatherObservation], bool]:
+        """Look a reading up in the memory cache, then in the persistent cache on a worker thread"""
+        cached_info, is_fresh = self.response_cache.lookup(cache_key)
+        if cached_info is not None or self.persistent_cache is None:
+            return cached_info, is_fresh
+        return await asyncio.to_thread(self._restore_persisted_info, cache_key)
+
+    def weather_cache_key(self, city_name: str, city_id: Optional[int] = None) -> str:
+        """Build the response cache key for a lookup, by city ID when it is known"""
+        return build_weather_cache_key(f"id:{city_id}" if city_id is not None else city_name, self.units)
+
+    async def get_complete_weather_info(self, city_name: str,
+                                        city_id: Optional[int] = None) -> Optional[WeatherObservation]:
+        """
+        Get complete weather information for a city
+
+        Concurrent misses for the same city and units await a single fetch,
+        which keeps running if one of the waiting callers is cancelled.
+        Readings are restored from the persistent cache after a restart, and
+        the last known reading is returned if the fetch fails; use
+        lookup_weather_info to tell the two apart.
+
+        Args:
+            city_name (str): Name of the city
+            city_id (int): OpenWeatherMap city ID, queried instead of the name when known
+
+        Returns:
+            WeatherObservation: Complete processed weather information or None
+        """
+        return (await self.lookup_weather_info(city_name, city_id)).weather_info
+
+    async def lookup_weather_info(self, city_name: str, city_id: Optional[int] = None) -> WeatherLookup:
+        """
+        Get a city's weather like get_complete_weather_info, reporting whether it fell back
+
+        Args:
+            city_name (str): Name of the city
+            city_id (int): OpenWeatherMap city ID, queried instead of the name when known
+
+        Returns:
+            WeatherLookup: The reading (None if unavailable), whether it is the last known
+                           reading served after a failed fetch, and its age
+        """
+        cache_key = self.weather_cache_key(city_name, city_id)
+        cached_info, is_fresh = await self._lookup_cached_info(cache_key)
+
+        if cached_info is not None:
+            cached_age = self.response_cache.entry_age(cache_key)
+            if is_fresh:
+                increment("lookups_fresh")
+                return WeatherLookup(cached_info, age_seconds=cached_age)
+            if self.stale_while_revalidate:
+                increment("lookups_stale")
+                self._schedule_background_refresh(cache_key, city_name, city_id)
+                return WeatherLookup(cached_info, age_seconds=cached_age)
+
+        increment("lookups_fetched")
+        fetch_started = time.monotonic()
+        fresh_info = await self.request_coalescer.do(
+            cache_key, lambda: self._fetch_and_cache(cache_key, city_name, city_id)
+        )
+        if fresh_info is None and cached_info is not None:
+            weather_logger.warning(f"Live weather for {city_name} unavailable, serving the last known reading")
+            increment("lookups_last_known_good")
+            return WeatherLookup(cached_info, is_last_known=True,
+                                 age_seconds=last_known_age(cached_age, fetch_started))
+        return WeatherLookup(fresh_info, age_seconds=0.0 if fresh_info is not None else None)
+
+    async def _fetch_and_cache(self, cache_key: str, city_name: str,
+                               city_id: Optional[int] = None) -> Optional[WeatherObservation]:
+        """Fetch and process a city's weather, storing successful results in the cache"""
+        raw_data = await self.fetch_weather_data(city_name, city_id)
+        if raw_data:
+            processed_data = self.process_weather_information(raw_data)
+            if processed_data:
+                self.response_cache.store(cache_key, processed_data)
+                await asyncio.to_thread(self._store_locally, cache_key, raw_data, processed_data)
+            return processed_data
+        return None
+
+    def _store_locally(self, cache_key: str, raw_data: Dict, processed_data: WeatherObservation):
+        """Write a fresh reading to the persistent cache and history store (blocking; run on a worker thread)"""
+        self.persist_payload(cache_key, raw_data)
+        self.record_history(processed_data)
+
+    def _schedule_background_refresh(self, cache_key: str, city_name: str, city_id: Optional[int] = None):
+        """Refresh a stale cache entry in a background task, at most once per key"""
+        if cache_key in self._refresh_tasks:
+            return
+
+        refresh_task = asyncio.create_task(
+            self.request_coalescer.do(cache_key, lambda: self._fetch_and_cache(cache_key, city_name, city_id))
+        )
+        self._refresh_tasks[cache_key] = refresh_task
+        refresh_task.add_done_callback(lambda _: self._refresh_tasks.pop(cache_key, None))
+
+    def get_cache_stats(self) -> Dict:
+        """Get response cache counters"""
+        return self.response_cache.get_stats()
+
+    def get_service_stats(self) -> Dict:
+        """Get memory cache, persistent cache and request coalescing counters"""
+        return {
+            "cache": self.get_cache_stats(),
+            "persistent_cache": self.persistent_cache.get_stats() if self.persistent_cache is not None else None,
+            "coalescing": self.request_coalescer.get_stats()
+        }
+
+    async def close(self):
+        """Close the pooled HTTP client"""
+        if self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
@@ -0,0 +1,339 @@
+import csv
+import json
+import logging
+import os
+import re
+import sys
+import time
+from collections import deque
+from typing import Dict, Iterator, Optional, TextIO
+
+# Setup project path for imports
+from utils.path_helper import setup_project_path
+setup_project_path()
+
+from config.settings import (
+    BULK_FETCH_MAX_CONCURRENCY, CHART_RENDER_WORKERS, CHART_RENDER_USE_PROCESSES, EXPORT_OUTPUT_DIRECTORY,
+    EXPORT_PROGRESS_EVERY
+)
+from backend.city_comparison import COMPARISON_METRICS, CityComparisonBuilder
+from backend.weather_observation import FIELD_NAMES
+
+weather_logger = logging.getLogger(__name__)
+
+EXPORT_FORMATS = ("jsonl", "csv")
+EXPORT_CHART_KINDS = ("overview", "simple", "none")
+EXPORT_COMPARISON_LAYOUTS = ("bars", "heatmap", "small_multiples")
+EXPORT_COLUMNS = ("city", "error", "is_last_known", "age_seconds", "chart_path") + FIELD_NAMES
+
+
+def read_city_list(city_list_path: str) -> Iterator[str]:
+    """
+    Stream city names or IDs from a text file, one per line
+
+    Blank lines and lines starting with # are skipped. Use "-" for stdin.
+
+    Args:
+        city_list_path (str): Path to the city list
+
+    Yields:
+        str: One city name or ID per line
+    """
+    city_list_file = sys.stdin if city_list_path == "-" else open(city_list_path, encoding="utf-8")
+    try:
+        for line in city_list_file:
+            city = line.strip()
+            if city and not city.startswith("#"):
+                yield city
+    finally:
+        if city_list_file is not sys.stdin:
+            city_list_file.close()
+
+
+def chart_file_name(weather_info) -> str:
+    """File name for a city's chart, unique per city ID when the payload has one"""
+    city_slug = re.sub(r"[^\w-]+", "_", f"{weather_info['city_name']}_{weather_info['country_code']}").strip("_")
+    city_id = weather_info.get("city_id")
+    return f"{city_id}_{city_slug}.png" if city_id is not None else f"{city_slug}.png"
+
+
+class _ExportRecordWriter:
+    """Writes one export record at a time as JSON lines or CSV rows"""
+
+    def __init__(self, output_file: TextIO, export_format: str):
+        self.output_file = output_file
+        self.export_format = export_format
+        self._csv_writer = None
+        if export_format == "csv":
+            self._csv_writer = csv.DictWriter(output_file, fieldnames=EXPORT_COLUMNS)
+            self._csv_writer.writeheader()
+
+    def write(self, export_record: Dict):
+        if self._csv_writer is not None:
+            self._csv_writer.writerow(export_record)
+        else:
+            self.output_file.write(json.dumps(export_record, ensure_ascii=False) + "\n")
+
+
+class BatchWeatherExporter:
+    """
+    Headless pipeline: stream cities, fetch in parallel, render charts on a pool, write results
+
+    Every stage is bounded: the city list is read lazily, the weather service keeps
+    a fixed number of requests in flight, and at most `max_pending_renders` charts
+    wait for the rendering pool. Records are written as soon as their chart is done,
+    so memory stays flat however long the list is.
+    """
+
+    def __init__(self, weather_service, chart_engine=None, output_directory: str = EXPORT_OUTPUT_DIRECTORY,
+                 export_format: str = "jsonl", chart_kind: str = "overview",
+                 max_concurrency: int = BULK_FETCH_MAX_CONCURRENCY,
+                 max_pending_renders: int = CHART_RENDER_WORKERS * 2,
+                 progress_every: int = EXPORT_PROGRESS_EVERY,
+                 comparison_layout: Optional[str] = None, comparison_sort_by: Optional[str] = None,
+                 comparison_top_n: Optional[int] = None):
+        """
+        Args:
+            weather_service (WeatherDataService): Service used for the bulk lookups
+            chart_engine (ChartRenderingEngine): Rendering pool; required unless chart_kind is "none"
+            output_directory (str): Receives weather.<format> and a charts/ folder
+            export_format (str): "jsonl" or "csv"
+            chart_kind (str): "overview", "simple" or "none"
+            max_concurrency (int): Parallel API calls
+            max_pending_renders (int): Charts queued on the pool before the pipeline waits
+            progress_every (int): Print progress after this many cities (0 = never)
+            comparison_layout (str): Also draw every exported city into one comparison.png
+                                     ("bars", "heatmap" or "small_multiples"); keeps a few floats per city,
+                                     or only the top cities when comparison_top_n and comparison_sort_by are set
+            comparison_sort_by (str): Metric the comparison ranks cities by
+            comparison_top_n (int): Cities kept in the comparison after ranking
+        """
+        if export_format not in EXPORT_FORMATS:
+            raise ValueError(f"Unknown export format '{export_format}', expected one of {EXPORT_FORMATS}")
+        if chart_kind not in EXPORT_CHART_KINDS:
+            raise ValueError(f"Unknown chart kind '{chart_kind}', expected one of {EXPORT_CHART_KINDS}")
+        # Checked up front so a typo fails before the export, not after it
+        if comparison_layout is not None and comparison_layout not in EXPORT_COMPARISON_LAYOUTS:
+            raise ValueError(f"Unknown comparison layout '{comparison_layout}', "
+                             f"expected one of {EXPORT_COMPARISON_LAYOUTS}")
+        if comparison_sort_by is not None and comparison_sort_by not in COMPARISON_METRICS:
+            raise ValueError(f"Unknown comparison field '{comparison_sort_by}', expected one of {tuple(COMPARISON_METRICS)}")
+
+        self.weather_service = weather_service
+        self.chart_engine = chart_engine
+        self.output_directory = output_directory
+        self.export_format = export_format
+        self.chart_kind = chart_kind
+        self.max_concurrency = max_concurrency
+        self.max_pending_renders = max(1, max_pending_renders)
+        self.progress_every = progress_every
+        self.comparison_layout = comparison_layout
+        self.comparison_sort_by = comparison_sort_by
+        self.comparison_top_n = comparison_top_n
+        self.comparison_builder = CityComparisonBuilder(
+            sort_by=comparison_sort_by, top_n=comparison_top_n
+        ) if comparison_layout else None
+
+        self.charts_directory = os.path.join(output_directory, "charts")
+        self.output_path = os.path.join(output_directory, f"weather.{export_format}")
+        self.comparison_path = os.path.join(output_directory, "comparison.png")
+
+        self.cities_read = 0
+        self.cities_exported = 0
+        self.cities_failed = 0
+        self.charts_written = 0
+        self.chart_failures = 0
+
+    def _submit_chart(self, weather_info):
+        """Queue the city's chart on the rendering pool"""
+        chart_save_path = os.path.join(self.charts_directory, chart_file_name(weather_info))
+        if self.chart_kind == "simple":
+            return self.chart_engine.submit_simple_temperature_chart(weather_info, chart_save_path)
+        return self.chart_engine.submit_overview_chart(weather_info, chart_save_path)
+
+    def _build_record(self, batch_result: Dict, error_message: Optional[str],
+                      chart_path: Optional[str] = None) -> Dict:
+        # A last known reading is exported with its age, so stale rows can be told from fresh ones
+        weather_info = batch_result["weather"]
+        export_record = {
+            "city": batch_result["city"], "error": error_message, "is_last_known": batch_result["is_last_known"],
+            "age_seconds": batch_result["age_seconds"], "chart_path": chart_path
+        }
+        for field_name in FIELD_NAMES:
+            export_record[field_name] = weather_info[field_name] if weather_info is not None else None
+        return export_record
+
+    def _finish_oldest_render(self, pending_renders: deque, record_writer: _ExportRecordWriter):
+        """Wait for the oldest queued chart and write its city's record"""
+        batch_result, chart_future = pending_renders.popleft()
+        try:
+            chart_path = chart_future.result()
+            self.charts_written += 1
+            record_writer.write(self._build_record(batch_result, None, chart_path))
+        except Exception as chart_error:
+            self.chart_failures += 1
+            record_writer.write(self._build_record(batch_result, f"Chart failed: {chart_error}"))
+        self.cities_exported += 1
+
+    def _write_comparison_chart(self) -> str:
+        """Draw every exported city into one comparison chart, ranked and trimmed first"""
+        from backend.chart_generator import prepare_city_comparison, render_comparison_chart_png
+
+        city_comparison = prepare_city_comparison(
+            self.comparison_builder.build(), self.comparison_layout, sort_by=self.comparison_sort_by,
+            top_n=self.comparison_top_n
+        )
+        if self.chart_engine is not None:
+            png_bytes = self.chart_engine.submit_comparison_chart_png(city_comparison, self.comparison_layout).result()
+        else:
+            png_bytes = render_comparison_chart_png(city_comparison, self.comparison_layout)
+        with open(self.comparison_path, "wb") as comparison_file:
+            comparison_file.write(png_bytes)
+        return self.comparison_path
+
+    def _report_progress(self, start_time: float, output_file: TextIO):
+        """Flush what is written so far and print a progress line"""
+        output_file.flush()
+        elapsed_seconds = time.perf_counter() - start_time
+        print(f"  {self.cities_read} cities read, {self.cities_exported} exported, {self.cities_failed} failed "
+              f"({self.cities_read / elapsed_seconds:.1f} cities/s)", file=sys.stderr, flush=True)
+
+    def export(self, cities) -> Dict:
+        """
+        Run the pipeline over a stream of city names or IDs
+
+        Args:
+            cities (Iterable): City names and/or OpenWeatherMap city IDs, e.g. from read_city_list
+
+        Returns:
+            Dict: Counts, elapsed time, throughput and the service's cache and transport counters
+        """
+        os.makedirs(self.output_directory, exist_ok=True)
+        if self.chart_kind != "none":
+            os.makedirs(self.charts_directory, exist_ok=True)
+
+        def counted_cities():
+            for city in cities:
+                self.cities_read += 1
+                yield city
+
+        start_time = time.perf_counter()
+        results_seen = 0
+        pending_renders = deque()
+        with open(self.output_path, "w", encoding="utf-8", newline="") as output_file:
+            record_writer = _ExportRecordWriter(output_file, self.export_format)
+
+            for batch_result in self.weather_service.get_complete_weather_info_many(
+                counted_cities(), max_concurrency=self.max_concurrency
+            ):
+                weather_info = batch_result["weather"]
+                if weather_info is not None and self.comparison_builder is not None:
+                    self.comparison_builder.add(weather_info)
+                if weather_info is None:
+                    self.cities_failed += 1
+                    record_writer.write(self._build_record(batch_result, batch_result["error"]))
+                elif self.chart_kind == "none":
+                    self.cities_exported += 1
+                    record_writer.write(self._build_record(batch_result, None))
+                else:
+                    pending_renders.append((batch_result, self._submit_chart(weather_info)))
+                    while len(pending_renders) > self.max_pending_renders:
+                        self._finish_oldest_render(pending_renders, record_writer)
+
+                results_seen += 1
+                if self.progress_every and results_seen % self.progress_every == 0:
+                    self._report_progress(start_time, output_file)
+
+            while pending_renders:
+                self._finish_oldest_render(pending_renders, record_writer)
+
+        comparison_path = (self._write_comparison_chart()
+                           if self.comparison_builder is not None and len(self.comparison_builder) else None)
+        elapsed_seconds = time.perf_counter() - start_time
+        return {
+            "output_path": self.output_path,
+            "cities_read": self.cities_read,
+            "cities_exported": self.cities_exported,
+            "cities_failed": self.cities_failed,
+            "charts_written": self.charts_written,
+            "chart_failures": self.chart_failures,
+            "comparison_path": comparison_path,
+            "elapsed_seconds": elapsed_seconds,
+            "cities_per_second": self.cities_read / elapsed_seconds if elapsed_seconds else 0.0,
+            "service": self.weather_service.get_service_stats(),
+            "charts": self.chart_engine.get_stats() if self.chart_engine is not None else None,
+        }
+
+
+def peak_memory_megabytes() -> Optional[float]:
+    """Peak resident memory of this process, where the platform reports it"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak_rss / (1024 * 1024) if sys.platform == "darwin" else peak_rss / 1024
+
+
+def run_batch_export(city_list_path: str, output_directory: str = EXPORT_OUTPUT_DIRECTORY,
+                     export_format: str = "jsonl", chart_kind: str = "overview",
+                     max_concurrency: int = BULK_FETCH_MAX_CONCURRENCY,
+                     render_processes: bool = CHART_RENDER_USE_PROCESSES,
+                     comparison_layout: Optional[str] = None, comparison_sort_by: Optional[str] = None,
+                     comparison_top_n: Optional[int] = None) -> Dict:
+    """
+    Export weather and charts for every city in a list, then print throughput stats
+
+    Names are resolved through the city index when it is installed, so they are
+    fetched in group requests of up to GROUP_REQUEST_MAX_IDS.
+
+    Args:
+        city_list_path (str): Text file with one city name or ID per line ("-" for stdin)
+        output_directory (str): Where weather.<format> and charts/ are written
+        export_format (str): "jsonl" or "csv"
+        chart_kind (str): "overview", "simple" or "none"
+        max_concurrency (int): Parallel API calls
+        render_processes (bool): Render charts on a process pool, using every core
+        comparison_layout (str): Also write comparison.png with every city ("bars", "heatmap", "small_multiples")
+        comparison_sort_by (str): Metric the comparison ranks cities by
+        comparison_top_n (int): Cities kept in the comparison after ranking
+
+    Returns:
+        Dict: Export statistics as returned by BatchWeatherExporter.export
+    """
+    from backend.shared_services import get_shared_city_index
+    from backend.weather_service import WeatherDataService
+
+    weather_service = WeatherDataService(city_index=get_shared_city_index())
+    chart_engine = None
+    if chart_kind != "none":
+        from backend.chart_generator import ChartRenderingEngine
+        chart_engine = ChartRenderingEngine(use_processes=render_processes)
+
+    exporter = BatchWeatherExporter(weather_service, chart_engine, output_directory, export_format, chart_kind,
+                                    max_concurrency=max_concurrency, comparison_layout=comparison_layout,
+                                    comparison_sort_by=comparison_sort_by, comparison_top_n=comparison_top_n)
+    try:
+        export_stats = exporter.export(read_city_list(city_list_path))
+    finally:
+        if chart_engine is not None:
+            chart_engine.shutdown()
+        weather_service.close()
+
+    transport_stats = export_stats["service"]["transport"]
+    cache_stats = export_stats["service"]["cache"]
+    persistent_cache_stats = export_stats["service"]["persistent_cache"]
+    print(f"Exported {export_stats['cities_exported']} of {export_stats['cities_read']} cities "
+          f"({export_stats['cities_failed']} failed) to {export_stats['output_path']}")
+    print(f"{export_stats['elapsed_seconds']:.1f} s = {export_stats['cities_per_second']:.1f} cities/s   "
+          f"charts written: {export_stats['charts_written']} ({export_stats['chart_failures']} failed)")
+    if export_stats["comparison_path"]:
+        print(f"comparison chart: {export_stats['comparison_path']}")
+    print(f"API requests: {transport_stats['requests_sent']}   retries: {transport_stats['retries_performed']}   "
+          f"cache hits: {cache_stats['hits']}   "
+          f"disk cache hits: {persistent_cache_stats['hits'] if persistent_cache_stats else 0}")
+    peak_memory = peak_memory_megabytes()
+    if peak_memory is not None:
+        print(f"peak memory: {peak_memory:.0f} MB")
+    return export_stats
@@ -0,0 +1,187 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Mapping, Optional
+
+from config.settings import CHART_CACHE_MAX_DISK_BYTES
+from backend.weather_observation import WeatherObservation
+
+
+def build_chart_content_key(weather_info: Mapping, render_settings: Dict) -> str:
+    """
+    Hash a reading and the settings it is drawn with into a chart cache key
+
+    Args:
+        weather_info (Mapping): Processed weather information (WeatherObservation or dict)
+        render_settings (Dict): Everything besides the data that changes the image
+
+    Returns:
+        str: Hex digest that is identical for identical charts
+    """
+    # IDs and timestamps don't change the pixels, so a re-fetched identical reading reuses its chart
+    visual_fields = {
+        field_name: field_value for field_name, field_value in weather_info.items()
+        if field_name not in WeatherObservation.NON_VISUAL_FIELDS
+    }
+    chart_content = {"weather": visual_fields, "settings": render_settings}
+    serialized_content = json.dumps(chart_content, sort_keys=True, default=str)
+    return hashlib.sha256(serialized_content.encode("utf-8")).hexdigest()
+
+
+class ChartImageCache:
+    """Size-bounded in-memory LRU of PNG bytes that spills evicted charts to a size-bounded directory"""
+
+    def __init__(self, max_memory_bytes: int, spill_directory: str,
+                 max_disk_bytes: int = CHART_CACHE_MAX_DISK_BYTES):
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.spill_directory = spill_directory
+        os.makedirs(self.spill_directory, exist_ok=True)
+
+        self._images: "OrderedDict[str, bytes]" = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+
+        # Spilled charts, least recently written or read first; files from earlier runs are ordered by mtime
+        self._spilled_sizes: "OrderedDict[str, int]" = OrderedDict()
+        self._disk_bytes = 0
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.spills = 0
+        self.disk_evictions = 0
+        self._index_spill_directory()
+
+    def _index_spill_directory(self):
+        """Record the charts already on disk, oldest first, and trim them to max_disk_bytes"""
+        spilled_files = []
+        with os.scandir(self.spill_directory) as directory_entries:
+            for directory_entry in directory_entries:
+                if directory_entry.name.endswith(".png") and directory_entry.is_file():
+                    file_stat = directory_entry.stat()
+                    spilled_files.append((file_stat.st_mtime, directory_entry.name[:-4], file_stat.st_size))
+        for _, chart_key, file_size in sorted(spilled_files):
+            self._spilled_sizes[chart_key] = file_size
+            self._disk_bytes += file_size
+        self._remove_spill_files(self._take_disk_evictions())
+
+    def spill_path(self, chart_key: str) -> str:
+        """Return the on-disk location for a chart key"""
+        return os.path.join(self.spill_directory, f"{chart_key}.png")
+
+    def get(self, chart_key: str) -> Optional[bytes]:
+        """
+        Get cached PNG bytes, promoting spilled charts back into memory
+
+        Args:
+            chart_key (str): Key built with build_chart_content_key
+
+        Returns:
+            bytes: PNG image or None if the chart was never rendered
+        """
+        with self._lock:
+            png_bytes = self._images.get(chart_key)
+            if png_bytes is not None:
+                self._images.move_to_end(chart_key)
+                self.memory_hits += 1
+                return png_bytes
+
+        try:
+            with open(self.spill_path(chart_key), "rb") as spilled_file:
+                png_bytes = spilled_file.read()
+        except OSError:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.disk_hits += 1
+            if chart_key in self._spilled_sizes:
+                self._spilled_sizes.move_to_end(chart_key)
+        self.put(chart_key, png_bytes)
+        return png_bytes
+
+    def put(self, chart_key: str, png_bytes: bytes):
+        """Store PNG bytes in memory, spilling least recently used charts to disk"""
+        evicted_images = []
+        with self._lock:
+            previous_bytes = self._images.pop(chart_key, None)
+            if previous_bytes is not None:
+                self._memory_bytes -= len(previous_bytes)
+            self._images[chart_key] = png_bytes
+            self._memory_bytes += len(png_bytes)
+
+            while self._memory_bytes > self.max_memory_bytes and len(self._images) > 1:
+                evicted_key, evicted_bytes = self._images.popitem(last=False)
+                self._memory_bytes -= len(evicted_bytes)
+                evicted_images.append((evicted_key, evicted_bytes))
+
+        # Disk writes happen outside the lock
+        for evicted_key, evicted_bytes in evicted_images:
+            self._write_spill_file(evicted_key, evicted_bytes)
+
+    def ensure_file(self, chart_key: str, png_bytes: bytes) -> str:
+        """Make sure a chart exists on disk (for callers that need a path) and return it"""
+        chart_path = self.spill_path(chart_key)
+        if not os.path.exists(chart_path):
+            self._write_spill_file(chart_key, png_bytes)
+        return chart_path
+
+    def _write_spill_file(self, chart_key: str, png_bytes: bytes):
+        """Atomically write a chart to the spill directory, deleting the oldest charts beyond max_disk_bytes"""
+        chart_path = self.spill_path(chart_key)
+        if os.path.exists(chart_path):
+            with self._lock:
+                if chart_key in self._spilled_sizes:
+                    self._spilled_sizes.move_to_end(chart_key)
+            return
+        temporary_path = f"{chart_path}.{threading.get_ident()}.tmp"
+        with open(temporary_path, "wb") as spill_file:
+            spill_file.write(png_bytes)
+        os.replace(temporary_path, chart_path)
+        with self._lock:
+            self.spills += 1
+            self._disk_bytes += len(png_bytes) - self._spilled_sizes.pop(chart_key, 0)
+            self._spilled_sizes[chart_key] = len(png_bytes)
+            evicted_keys = self._take_disk_evictions(keep_key=chart_key)
+        self._remove_spill_files(evicted_keys)
+
+    def _take_disk_evictions(self, keep_key: Optional[str] = None) -> List[str]:
+        """Drop the oldest spilled charts from the index until under max_disk_bytes (call with the lock held)"""
+        evicted_keys = []
+        while self._disk_bytes > self.max_disk_bytes and self._spilled_sizes:
+            oldest_key, oldest_size = next(iter(self._spilled_sizes.items()))
+            if oldest_key == keep_key:
+                break  # a single chart larger than the budget is kept until the next one arrives
+            del self._spilled_sizes[oldest_key]
+            self._disk_bytes -= oldest_size
+            evicted_keys.append(oldest_key)
+        self.disk_evictions += len(evicted_keys)
+        return evicted_keys
+
+    def _remove_spill_files(self, chart_keys: List[str]):
+        for chart_key in chart_keys:
+            try:
+                os.remove(self.spill_path(chart_key))
+            except OSError:
+                pass  # already gone, e.g. removed by another process sharing the directory
+
+    def get_stats(self) -> Dict:
+        """Return a snapshot of the cache counters"""
+        with self._lock:
+            return {
+                "entries_in_memory": len(self._images),
+                "memory_bytes": self._memory_bytes,
+                "max_memory_bytes": self.max_memory_bytes,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "spills": self.spills,
+                "disk_files": len(self._spilled_sizes),
+                "disk_bytes": self._disk_bytes,
+                "max_disk_bytes": self.max_disk_bytes,
+                "disk_evictions": self.disk_evictions,
+            }
@@ -0,0 +1,52 @@
+from typing import List, Mapping, Tuple
+
+# Chart contents shared by every overview renderer (matplotlib figures and native Flet charts)
+TEMPERATURE_LABELS = ['Current Temp', 'Feels Like']
+ATMOSPHERIC_LABELS = ['Humidity (%)', 'Pressure (kPa)', 'Cloudiness (%)']
+WIND_VISIBILITY_LABELS = ['Wind Speed (m/s)', 'Visibility (km)']
+
+TEMPERATURE_COLORS = ['#ff6b6b', '#feca57']
+ATMOSPHERIC_COLORS = ['#48cae4', '#023e8a', '#6c757d']
+WIND_VISIBILITY_COLORS = ['#90e0ef', '#0077b6']
+
+
+def overview_chart_values(weather_info: Mapping) -> Tuple[List[float], List[float], List[float]]:
+    """
+    Extract the bar values shown on the overview chart
+    
+    Args:
+        weather_info (Mapping): Processed weather information (WeatherObservation or dict)
+        
+    Returns:
+        Tuple: Temperature, atmospheric and wind/visibility bar values
+    """
+    temperature_data = [
+        weather_info['current_temperature'], 
+        weather_info['feels_like_temperature']
+    ]
+    atmospheric_metrics = [
+        weather_info['humidity_percentage'],
+        weather_info['atmospheric_pressure'] / 10,  # Scale down for better visualization
+        weather_info['cloudiness_percentage']
+    ]
+    wind_visibility_data = [
+        weather_info['wind_speed'],
+        weather_info['visibility_meters'] / 1000  # Convert to km
+    ]
+    return temperature_data, atmospheric_metrics, wind_visibility_data
+
+
+def overview_summary_text(weather_info: Mapping) -> str:
+    """Build the text block shown in the overview chart's summary panel"""
+    return f"""
+Weather Summary
+
+Condition: {weather_info['weather_main']}
+Description: {weather_info['weather_description'].title()}
+
+Temperature: {weather_info['current_temperature']}°C
+Feels Like: {weather_info['feels_like_temperature']}°C
+Humidity: {weather_info['humidity_percentage']}%
+Pressure: {weather_info['atmospheric_pressure']} hPa
+Wind Speed: {weather_info['wind_speed']} m/s
+        """
@@ -1,142 +1,832 @@
-import matplotlib.pyplot as plt
-import seaborn as sns
+import matplotlib.style
+import numpy as np
+import io
 import os
-from typing import Dict
-from config.settings import CHARTS_DIRECTORY, CHART_FILENAME
+import threading
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import BinaryIO, Callable, Dict, Iterable, Mapping, Optional, Sequence, Tuple, Union
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from backend.chart_cache import ChartImageCache, build_chart_content_key
+from backend.chart_data import (
+    TEMPERATURE_LABELS, ATMOSPHERIC_LABELS, WIND_VISIBILITY_LABELS,
+    TEMPERATURE_COLORS, ATMOSPHERIC_COLORS, WIND_VISIBILITY_COLORS,
+    overview_chart_values, overview_summary_text
+)
+from backend.city_comparison import DEFAULT_COMPARISON_METRICS, CityComparison, build_city_comparison
+from backend.metrics import increment, timed
+from backend.single_flight import SingleFlightGroup
+from config.settings import (
+    CHARTS_DIRECTORY, CHART_REUSE_FIGURE, CHART_DPI, CHART_STYLE,
+    CHART_RENDER_WORKERS, CHART_RENDER_USE_PROCESSES,
+    CHART_CACHE_DIRECTORY, CHART_CACHE_MAX_MEMORY_BYTES,
+    COMPARISON_LAYOUT, COMPARISON_MAX_LABELLED_CITIES, COMPARISON_ANNOTATE_MAX_CITIES,
+    COMPARISON_INCHES_PER_CITY, COMPARISON_MAX_HEIGHT_INCHES
+)
 
-class WeatherChartGenerator:
-    """Class to generate weather data visualizations"""
+COMPARISON_LAYOUTS = ("bars", "heatmap", "small_multiples")
+# Metrics drawn when the caller picks none; grouped bars share one axis, so only same-unit metrics
+COMPARISON_LAYOUT_METRICS = {
+    "bars": ("current_temperature", "feels_like_temperature"),
+    "heatmap": DEFAULT_COMPARISON_METRICS,
+    "small_multiples": DEFAULT_COMPARISON_METRICS,
+}
+# Each metric keeps its overview chart color
+COMPARISON_METRIC_COLORS = dict(zip(
+    DEFAULT_COMPARISON_METRICS, TEMPERATURE_COLORS + ATMOSPHERIC_COLORS + WIND_VISIBILITY_COLORS
+))
+
+def apply_chart_style():
+    """Apply the dashboard's matplotlib style; run once per process"""
+    # seaborn pulls in pandas, so it is only imported once a chart is actually needed
+    import seaborn as sns
+    
+    matplotlib.style.use(CHART_STYLE)
+    sns.set_palette("husl")
+
+
+def draw_weather_overview_figure(weather_info: Mapping) -> Figure:
+    """
+    Draw a comprehensive weather overview figure without touching pyplot state
+    
+    Args:
+        weather_info (Mapping): Processed weather information (WeatherObservation or dict)
+        
+    Returns:
+        Figure: Agg-backed figure ready to be saved
+    """
+    city_display_name = f"{weather_info['city_name']}, {weather_info['country_code']}"
+    
+    # Create figure with subplots
+    figure = Figure(figsize=(12, 10))
+    FigureCanvasAgg(figure)
+    chart_axes = figure.subplots(2, 2)
+    figure.suptitle(f'Weather Dashboard - {city_display_name}', fontsize=16, fontweight='bold')
+    
+    temperature_data, atmospheric_metrics, wind_visibility_data = overview_chart_values(weather_info)
+    
+    # Temperature Chart
+    chart_axes[0, 0].bar(TEMPERATURE_LABELS, temperature_data, color=TEMPERATURE_COLORS)
+    chart_axes[0, 0].set_title('Temperature (°C)', fontweight='bold')
+    chart_axes[0, 0].set_ylabel('Temperature (°C)')
+    
+    # Add value labels on bars
+    for i, temp_value in enumerate(temperature_data):
+        chart_axes[0, 0].text(i, temp_value + 0.5, f'{temp_value}°C', 
+                            ha='center', fontweight='bold')
+    
+    # Atmospheric Conditions
+    chart_axes[0, 1].bar(ATMOSPHERIC_LABELS, atmospheric_metrics, 
+                       color=ATMOSPHERIC_COLORS)
+    chart_axes[0, 1].set_title('Atmospheric Conditions', fontweight='bold')
+    chart_axes[0, 1].tick_params(axis='x', rotation=45)
+    
+    # Wind and Visibility
+    chart_axes[1, 0].bar(WIND_VISIBILITY_LABELS, wind_visibility_data,
+                       color=WIND_VISIBILITY_COLORS)
+    chart_axes[1, 0].set_title('Wind & Visibility', fontweight='bold')
+    
+    # Weather Summary (Text)
+    chart_axes[1, 1].axis('off')
+    chart_axes[1, 1].text(0.1, 0.9, overview_summary_text(weather_info), transform=chart_axes[1, 1].transAxes,
+                        fontsize=11, verticalalignment='top',
+                        bbox=dict(boxstyle='round', facecolor='lightblue', alpha=0.8))
+    
+    figure.tight_layout()
+    return figure
+
+
+def draw_simple_temperature_figure(weather_info: Mapping) -> Figure:
+    """
+    Draw a simple temperature comparison figure without touching pyplot state
+    
+    Args:
+        weather_info (Mapping): Processed weather information (WeatherObservation or dict)
+        
+    Returns:
+        Figure: Agg-backed figure ready to be saved
+    """
+    figure = Figure(figsize=(8, 6))
+    FigureCanvasAgg(figure)
+    chart_axes = figure.subplots()
+    
+    temperature_values = [
+        weather_info['current_temperature'],
+        weather_info['feels_like_temperature']
+    ]
+    temperature_types = ['Actual Temperature', 'Feels Like Temperature']
+    
+    bars = chart_axes.bar(temperature_types, temperature_values, 
+                          color=TEMPERATURE_COLORS, alpha=0.8)
+    
+    chart_axes.set_title(f"Temperature in {weather_info['city_name']}", 
+                         fontsize=14, fontweight='bold')
+    chart_axes.set_ylabel('Temperature (°C)')
+    chart_axes.tick_params(axis='x', rotation=45)
+    
+    # Add value labels
+    for bar, temp_value in zip(bars, temperature_values):
+        chart_axes.text(bar.get_x() + bar.get_width()/2, bar.get_height() + 0.5,
+                        f'{temp_value}°C', ha='center', fontweight='bold')
+    
+    figure.tight_layout()
+    return figure
+
+
+def draw_history_figure(city_display_name: str, history_aggregates: Dict) -> Figure:
+    """
+    Draw temperature, humidity and pressure trends from downsampled history
+    
+    Args:
+        city_display_name (str): Title shown above the charts
+        history_aggregates (Dict): Output of ObservationHistoryStore.downsample
+        
+    Returns:
+        Figure: Agg-backed figure ready to be saved
+    """
+    figure = Figure(figsize=(12, 8))
+    FigureCanvasAgg(figure)
+    temperature_axes, humidity_axes, pressure_axes = figure.subplots(3, 1, sharex=True)
+    figure.suptitle(f'Weather History - {city_display_name}', fontsize=16, fontweight='bold')
+    
+    bucket_times = history_aggregates['bucket_start'].astype('datetime64[s]')
+    
+    temperature_axes.fill_between(bucket_times, history_aggregates['current_temperature_min'],
+                                  history_aggregates['current_temperature_max'], color='#ff6b6b', alpha=0.25)
+    temperature_axes.plot(bucket_times, history_aggregates['current_temperature_mean'], color='#ff6b6b')
+    temperature_axes.set_ylabel('Temperature (°C)')
+    
+    humidity_axes.plot(bucket_times, history_aggregates['humidity_percentage_mean'], color='#48cae4')
+    humidity_axes.set_ylabel('Humidity (%)')
+    
+    pressure_axes.plot(bucket_times, history_aggregates['atmospheric_pressure_mean'], color='#023e8a')
+    pressure_axes.set_ylabel('Pressure (hPa)')
+    
+    figure.autofmt_xdate()
+    figure.tight_layout()
+    return figure
+
+
+def draw_forecast_figure(forecast_series, daily_forecast: Dict) -> Figure:
+    """
+    Draw a 5-day forecast straight from its arrays
+    
+    Args:
+        forecast_series (ForecastSeries): Parsed 3-hour forecast
+        daily_forecast (Dict): One city's rows from aggregate_daily_forecasts
+        
+    Returns:
+        Figure: Agg-backed figure ready to be saved
+    """
+    figure = Figure(figsize=(12, 8))
+    FigureCanvasAgg(figure)
+    temperature_axes, precipitation_axes = figure.subplots(2, 1, sharex=True)
+    figure.suptitle(f'5-Day Forecast - {forecast_series.city_name}, {forecast_series.country_code}',
+                    fontsize=16, fontweight='bold')
+    
+    slot_times = (forecast_series.timestamps + forecast_series.timezone_offset).astype('datetime64[s]')
+    day_centers = daily_forecast['day'].astype('datetime64[s]') + np.timedelta64(12, 'h')
+    
+    # 3-hour temperature line over the daily min/max range
+    temperature_axes.bar(day_centers, daily_forecast['temperature_max'] - daily_forecast['temperature_min'],
+                         bottom=daily_forecast['temperature_min'], width=np.timedelta64(20, 'h'),
+                         color='#feca57', alpha=0.35, label='Daily range')
+    temperature_axes.plot(slot_times, forecast_series.column('temperature'), color='#ff6b6b',
+                          marker='o', markersize=3, label='Temperature')
+    temperature_axes.set_ylabel('Temperature (°C)')
+    temperature_axes.legend(loc='upper right')
+    
+    # Precipitation per slot with the daily totals annotated
+    precipitation_axes.bar(slot_times, forecast_series.column('precipitation'),
+                           width=np.timedelta64(150, 'm'), color='#0077b6', label='Precipitation (mm/3h)')
+    precipitation_axes.set_ylabel('Precipitation (mm)')
+    probability_axes = precipitation_axes.twinx()
+    probability_axes.plot(slot_times, forecast_series.column('precipitation_probability') * 100,
+                          color='#6c757d', linestyle='--', label='Chance (%)')
+    probability_axes.set_ylim(0, 100)
+    probability_axes.set_ylabel('Chance of precipitation (%)')
+    probability_axes.grid(False)
+    for day_center, precipitation_total in zip(day_centers, daily_forecast['precipitation_total']):
+        precipitation_axes.annotate(f'{precipitation_total:.1f} mm', (day_center, 1), xycoords=('data', 'axes fraction'),
+                                    ha='center', va='top', fontsize=9, fontweight='bold')
+    
+    figure.autofmt_xdate()
+    figure.tight_layout()
+    return figure
+
+
+def _comparison_figure_height(city_count: int) -> float:
+    """Grow the figure with the city count, up to COMPARISON_MAX_HEIGHT_INCHES"""
+    return min(COMPARISON_MAX_HEIGHT_INCHES, max(4.0, 1.5 + city_count * COMPARISON_INCHES_PER_CITY))
+
+
+def _label_city_axis(axes, city_labels: np.ndarray):
+    """Name the cities down the y axis, first city on top, thinned to COMPARISON_MAX_LABELLED_CITIES labels"""
+    label_step = max(1, -(-city_labels.size // COMPARISON_MAX_LABELLED_CITIES))
+    tick_positions = np.arange(0, city_labels.size, label_step)
+    axes.set_yticks(tick_positions)
+    axes.set_yticklabels(city_labels[tick_positions], fontsize=9 if city_labels.size <= 30 else 7)
+    axes.set_ylim(city_labels.size - 0.5, -0.5)
+
+
+def _draw_metric_bars(axes, bar_positions: np.ndarray, values: np.ndarray, bar_height: float,
+                      color: str, label: Optional[str] = None):
+    """
+    Draw one horizontal bar per city for a metric in a single call
+    
+    Up to COMPARISON_ANNOTATE_MAX_CITIES the bars are patches with value labels.
+    Beyond that they are one LineCollection, which draws hundreds of bars far
+    faster than as many Rectangle patches.
+    """
+    if bar_positions.size <= COMPARISON_ANNOTATE_MAX_CITIES:
+        metric_bars = axes.barh(bar_positions, values, height=bar_height, color=color, label=label)
+        axes.bar_label(metric_bars, fmt='%.1f', padding=2, fontsize=7)
+        # Room for the value labels on either side
+        axes.margins(x=0.18)
+        return
+    # Line width in points matching the bar height in data units on this figure
+    points_per_city = axes.figure.get_figheight() * 72 * 0.8 / max(bar_positions.size, 1)
+    axes.hlines(bar_positions, 0, values, colors=color, linewidth=max(0.5, points_per_city * bar_height),
+                label=label, capstyle='butt')
+    axes.set_xlim(min(0.0, np.nanmin(values) * 1.05), max(0.0, np.nanmax(values) * 1.05))
+
+
+def _draw_comparison_bars(figure: Figure, city_comparison: CityComparison):
+    """Grouped horizontal bars: one draw call per metric over every city"""
+    axes = figure.subplots()
+    city_positions = np.arange(len(city_comparison))
+    bar_height = 0.8 / len(city_comparison.metric_names)
+    for metric_index, (metric_name, metric_label) in enumerate(
+        zip(city_comparison.metric_names, city_comparison.metric_labels())
+    ):
+        bar_offset = (metric_index - (len(city_comparison.metric_names) - 1) / 2) * bar_height
+        _draw_metric_bars(axes, city_positions + bar_offset, city_comparison.values[:, metric_index],
+                          bar_height, COMPARISON_METRIC_COLORS[metric_name], metric_label)
+    if len(city_comparison) > COMPARISON_ANNOTATE_MAX_CITIES:
+        # Each series set its own limits; cover all of them
+        axes.set_xlim(min(0.0, np.nanmin(city_comparison.values) * 1.05),
+                      max(0.0, np.nanmax(city_comparison.values) * 1.05))
+    _label_city_axis(axes, city_comparison.city_labels)
+    axes.axvline(0, color='#333333', linewidth=0.8)
+    axes.legend(loc='best')
+
+
+def _draw_comparison_heatmap(figure: Figure, city_comparison: CityComparison):
+    """One image of every city and metric, colored relative to the other cities"""
+    axes = figure.subplots()
+    normalized_values = city_comparison.normalized()
+    heatmap_image = axes.imshow(normalized_values, aspect='auto', cmap='coolwarm',
+                                vmin=0, vmax=1, interpolation='nearest')
+    axes.set_xticks(np.arange(len(city_comparison.metric_names)))
+    axes.set_xticklabels(city_comparison.metric_labels(), rotation=30, ha='right')
+    axes.grid(False)
+    _label_city_axis(axes, city_comparison.city_labels)
+    if len(city_comparison) <= COMPARISON_ANNOTATE_MAX_CITIES:
+        # Light text on the saturated ends of the color map
+        text_colors = np.where(np.abs(normalized_values - 0.5) > 0.35, 'white', '#222222')
+        for (city_index, metric_index), value in np.ndenumerate(city_comparison.values):
+            axes.text(metric_index, city_index, f'{value:.1f}', ha='center', va='center', fontsize=8,
+                      color=text_colors[city_index, metric_index])
+    colorbar = figure.colorbar(heatmap_image, ax=axes, fraction=0.04, pad=0.02)
+    colorbar.set_label('Lowest to highest among these cities')
+    colorbar.set_ticks([0, 1])
+
+
+def _draw_comparison_small_multiples(figure: Figure, city_comparison: CityComparison):
+    """One panel per metric, each drawn with a single call over every city, sharing the city axis"""
+    metric_axes = np.atleast_1d(figure.subplots(1, len(city_comparison.metric_names), sharey=True))
+    city_positions = np.arange(len(city_comparison))
+    for metric_index, (axes, metric_name, metric_label) in enumerate(
+        zip(metric_axes, city_comparison.metric_names, city_comparison.metric_labels())
+    ):
+        _draw_metric_bars(axes, city_positions, city_comparison.values[:, metric_index], 0.8,
+                          COMPARISON_METRIC_COLORS[metric_name])
+        axes.set_title(metric_label, fontweight='bold', fontsize=10)
+        axes.tick_params(axis='x', labelsize=8)
+    _label_city_axis(metric_axes[0], city_comparison.city_labels)
+
+
+_COMPARISON_DRAWERS = {
+    "bars": _draw_comparison_bars,
+    "heatmap": _draw_comparison_heatmap,
+    "small_multiples": _draw_comparison_small_multiples,
+}
+
+
+def draw_comparison_figure(city_comparison: CityComparison, layout: str = COMPARISON_LAYOUT,
+                           title: Optional[str] = None) -> Figure:
+    """
+    Draw many cities side by side in one figure
+    
+    Each metric is drawn with one call over its whole column, so drawing cost
+    grows with the number of metrics, not cities.
+    
+    Args:
+        city_comparison (CityComparison): Cities in the order they are drawn, top to bottom
+        layout (str): "bars" (grouped), "heatmap" or "small_multiples"
+        title (str): Figure title, "City Comparison - N cities" when omitted
+        
+    Returns:
+        Figure: Agg-backed figure ready to be saved
+    """
+    if layout not in _COMPARISON_DRAWERS:
+        raise ValueError(f"Unknown comparison layout '{layout}', expected one of {COMPARISON_LAYOUTS}")
+    if len(city_comparison) == 0:
+        raise ValueError("A comparison chart needs at least one city")
+    
+    metric_count = len(city_comparison.metric_names)
+    figure_width = max(10.0, 3.0 + 1.8 * metric_count) if layout != "bars" else 12.0
+    # Constrained layout keeps the title clear of the panels at any figure height
+    figure = Figure(figsize=(figure_width, _comparison_figure_height(len(city_comparison))), layout='constrained')
+    FigureCanvasAgg(figure)
+    figure.suptitle(title or f'City Comparison - {len(city_comparison)} cities', fontsize=16, fontweight='bold')
+    _COMPARISON_DRAWERS[layout](figure, city_comparison)
+    return figure
+
+
+class PersistentOverviewFigure:
+    """Overview figure built once whose artists are updated in place for each city"""
+    
     def __init__(self):
-        self.charts_folder = CHARTS_DIRECTORY
-        self.chart_file_name = CHART_FILENAME
-        self._ensure_charts_directory_exists()
+        self.figure = Figure(figsize=(12, 10))
+        FigureCanvasAgg(self.figure)
+        chart_axes = self.figure.subplots(2, 2)
+        # Placeholder title so tight_layout reserves room for it
+        self.title_text = self.figure.suptitle('Weather Dashboard', fontsize=16, fontweight='bold')
         
-        # Set up matplotlib style
-        plt.style.use('seaborn-v0_8')
-        sns.set_palette("husl")
+        self.temperature_axes = chart_axes[0, 0]
+        self.temperature_bars = self.temperature_axes.bar(
+            TEMPERATURE_LABELS, [0, 0], color=TEMPERATURE_COLORS)
+        self.temperature_axes.set_title('Temperature (°C)', fontweight='bold')
+        self.temperature_axes.set_ylabel('Temperature (°C)')
+        self.temperature_value_labels = [
+            self.temperature_axes.text(i, 0, '', ha='center', fontweight='bold')
+            for i in range(len(TEMPERATURE_LABELS))
+        ]
+        
+        self.atmospheric_axes = chart_axes[0, 1]
+        self.atmospheric_bars = self.atmospheric_axes.bar(
+            ATMOSPHERIC_LABELS, [0, 0, 0], color=ATMOSPHERIC_COLORS)
+        self.atmospheric_axes.set_title('Atmospheric Conditions', fontweight='bold')
+        self.atmospheric_axes.tick_params(axis='x', rotation=45)
+        
+        self.wind_visibility_axes = chart_axes[1, 0]
+        self.wind_visibility_bars = self.wind_visibility_axes.bar(
+            WIND_VISIBILITY_LABELS, [0, 0], color=WIND_VISIBILITY_COLORS)
+        self.wind_visibility_axes.set_title('Wind & Visibility', fontweight='bold')
+        
+        summary_axes = chart_axes[1, 1]
+        summary_axes.axis('off')
+        self.summary_text = summary_axes.text(
+            0.1, 0.9, '', transform=summary_axes.transAxes,
+            fontsize=11, verticalalignment='top',
+            bbox=dict(boxstyle='round', facecolor='lightblue', alpha=0.8))
+        
+        # Layout only depends on the static labels, so compute it once
+        self.figure.tight_layout()
     
-    def _ensure_charts_directory_exists(self):
-        """Create charts directory if it doesn't exist"""
-        if not os.path.exists(self.charts_folder):
-            os.makedirs(self.charts_folder)
+    def update(self, weather_info: Mapping):
+        """Point every artist at a new reading and rescale the bar axes"""
+        temperature_data, atmospheric_metrics, wind_visibility_data = overview_chart_values(weather_info)
+        
+        self.title_text.set_text(
+            f"Weather Dashboard - {weather_info['city_name']}, {weather_info['country_code']}")
+        
+        for bar_container, axes, values in (
+            (self.temperature_bars, self.temperature_axes, temperature_data),
+            (self.atmospheric_bars, self.atmospheric_axes, atmospheric_metrics),
+            (self.wind_visibility_bars, self.wind_visibility_axes, wind_visibility_data),
+        ):
+            for bar, value in zip(bar_container, values):
+                bar.set_height(value)
+            axes.relim()
+            axes.autoscale_view()
+        
+        for i, (value_label, temp_value) in enumerate(zip(self.temperature_value_labels, temperature_data)):
+            value_label.set_position((i, temp_value + 0.5))
+            value_label.set_text(f'{temp_value}°C')
+        
+        self.summary_text.set_text(overview_summary_text(weather_info))
+    
+    def save(self, chart_target: Union[str, BinaryIO], dpi: int = CHART_DPI):
+        """Write the current state of the figure as PNG to a path or file object"""
+        self.figure.savefig(chart_target, dpi=dpi, bbox_inches='tight', format='png')
+
+
+# Each render thread (or process) keeps its own persistent figure, so no locking is needed
+_thread_local_figures = threading.local()
+
+
+def render_overview_chart_png(weather_info: Mapping, dpi: int = CHART_DPI,
+                              reuse_figure: bool = CHART_REUSE_FIGURE) -> bytes:
+    """
+    Render the overview chart to PNG bytes; safe to call from any worker thread or process
+    
+    Args:
+        weather_info (Mapping): Processed weather information (WeatherObservation or dict)
+        dpi (int): Output resolution
+        reuse_figure (bool): Update this worker's persistent figure instead of building a new one
+        
+    Returns:
+        bytes: Encoded PNG image
+    """
+    png_buffer = io.BytesIO()
+    if reuse_figure:
+        persistent_figure = getattr(_thread_local_figures, "overview", None)
+        with timed("chart_draw"):
+            if persistent_figure is None:
+                persistent_figure = PersistentOverviewFigure()
+                _thread_local_figures.overview = persistent_figure
+            persistent_figure.update(weather_info)
+        with timed("png_encode"):
+            persistent_figure.save(png_buffer, dpi=dpi)
+    else:
+        with timed("chart_draw"):
+            overview_figure = draw_weather_overview_figure(weather_info)
+        _save_png(overview_figure, png_buffer, dpi)
+    return png_buffer.getvalue()
+
+
+def _save_png(figure: Figure, png_buffer: BinaryIO, dpi: int):
+    """Encode a figure as PNG; Agg rasterizes lazily here, so this stage includes the pixel drawing"""
+    with timed("png_encode"):
+        figure.savefig(png_buffer, dpi=dpi, bbox_inches='tight', format='png')
+
+
+def render_history_chart_png(city_display_name: str, history_aggregates: Dict, dpi: int = CHART_DPI) -> bytes:
+    """Render a history trend chart to PNG bytes from any worker thread or process"""
+    png_buffer = io.BytesIO()
+    with timed("chart_draw"):
+        history_figure = draw_history_figure(city_display_name, history_aggregates)
+    _save_png(history_figure, png_buffer, dpi)
+    return png_buffer.getvalue()
+
+
+def render_forecast_chart_png(forecast_series, daily_forecast: Dict, dpi: int = CHART_DPI) -> bytes:
+    """Render a forecast chart to PNG bytes from any worker thread or process"""
+    png_buffer = io.BytesIO()
+    with timed("chart_draw"):
+        forecast_figure = draw_forecast_figure(forecast_series, daily_forecast)
+    _save_png(forecast_figure, png_buffer, dpi)
+    return png_buffer.getvalue()
+
+
+def render_comparison_chart_png(city_comparison: CityComparison, layout: str = COMPARISON_LAYOUT,
+                                dpi: int = CHART_DPI, title: Optional[str] = None) -> bytes:
+    """Render a multi-city comparison chart to PNG bytes from any worker thread or process"""
+    png_buffer = io.BytesIO()
+    with timed("chart_draw"):
+        comparison_figure = draw_comparison_figure(city_comparison, layout, title)
+    _save_png(comparison_figure, png_buffer, dpi)
+    return png_buffer.getvalue()
+
+
+def prepare_city_comparison(observations: Union[Iterable[Mapping], CityComparison], layout: str = COMPARISON_LAYOUT,
+                            metric_names: Optional[Sequence[str]] = None, sort_by: Optional[str] = None,
+                            descending: bool = True, top_n: Optional[int] = None) -> CityComparison:
+    """
+    Pack readings into a comparison, rank and trim it, and keep the metrics to draw
+    
+    Ranking happens on the arrays before anything is drawn, so a top 20 out of
+    thousands of cities only ever draws 20 rows.
     
-    def create_weather_overview_chart(self, weather_info: Dict) -> str:
+    Args:
+        observations (Iterable): Processed weather information, one per city, or an already packed
+                                 CityComparison (e.g. from CityComparisonBuilder.build)
+        layout (str): Layout the comparison is drawn with; picks the default metrics
+        metric_names (Sequence): Metrics to draw, COMPARISON_LAYOUT_METRICS[layout] when omitted
+        sort_by (str): Metric to rank cities by (any in COMPARISON_METRICS); input order when omitted
+        descending (bool): Highest values first
+        top_n (int): Keep only the first top_n cities after ranking
+        
+    Returns:
+        CityComparison: Cities and metrics ready for draw_comparison_figure
+    """
+    if layout not in COMPARISON_LAYOUT_METRICS:
+        raise ValueError(f"Unknown comparison layout '{layout}', expected one of {COMPARISON_LAYOUTS}")
+    drawn_metrics = tuple(metric_names or COMPARISON_LAYOUT_METRICS[layout])
+    if isinstance(observations, CityComparison):
+        city_comparison = observations
+    else:
+        city_comparison = build_city_comparison(observations)
+    if sort_by is not None:
+        city_comparison = city_comparison.ranked(sort_by, descending, top_n)
+    elif top_n is not None:
+        city_comparison = city_comparison.select(np.arange(min(max(top_n, 0), len(city_comparison))))
+    return city_comparison.with_metrics(drawn_metrics)
+
+
+def render_simple_temperature_chart_png(weather_info: Mapping, dpi: int = CHART_DPI) -> bytes:
+    """Render the simple temperature chart to PNG bytes from any worker thread or process"""
+    png_buffer = io.BytesIO()
+    with timed("chart_draw"):
+        temperature_figure = draw_simple_temperature_figure(weather_info)
+    _save_png(temperature_figure, png_buffer, dpi)
+    return png_buffer.getvalue()
+
+
+def chart_render_settings(chart_kind: str, dpi: int) -> Dict:
+    """Settings that change a chart's pixels, used in its content key"""
+    return {"chart": chart_kind, "dpi": dpi, "style": CHART_STYLE}
+
+
+def _write_png_file(chart_save_path: str, png_bytes: bytes) -> str:
+    """Write PNG bytes to an explicit output path"""
+    with open(chart_save_path, "wb") as chart_file:
+        chart_file.write(png_bytes)
+    return chart_save_path
+
+
+def _chain_future(source_future: Future, transform: Callable) -> Future:
+    """Return a future resolving to transform(result) of another future"""
+    chained_future = Future()
+    
+    def forward_result(finished_future: Future):
+        if not chained_future.set_running_or_notify_cancel():
+            return
+        try:
+            chained_future.set_result(transform(finished_future.result()))
+        except BaseException as transform_error:
+            chained_future.set_exception(transform_error)
+    
+    source_future.add_done_callback(forward_result)
+    return chained_future
+
+
+class ChartRenderingEngine:
+    """Renders charts on a worker pool and hands back futures"""
+    
+    def __init__(self, max_workers: int = CHART_RENDER_WORKERS,
+                 use_processes: bool = CHART_RENDER_USE_PROCESSES,
+                 reuse_figures: bool = CHART_REUSE_FIGURE, dpi: int = CHART_DPI,
+                 chart_cache: Optional[ChartImageCache] = None):
+        self.reuse_figures = reuse_figures
+        self.dpi = dpi
+        
+        # Rendered PNGs are keyed by content, so an unchanged reading is never re-rendered
+        self.chart_cache = chart_cache or ChartImageCache(CHART_CACHE_MAX_MEMORY_BYTES, CHART_CACHE_DIRECTORY)
+        # Identical charts requested while one is rendering wait on that render
+        self.render_coalescer = SingleFlightGroup()
+        
+        apply_chart_style()
+        if use_processes:
+            # Processes sidestep the GIL for CPU-bound rendering on all cores
+            # (their chart_draw/png_encode timings stay in the worker processes)
+            self._executor: Executor = ProcessPoolExecutor(max_workers=max_workers, initializer=apply_chart_style)
+        else:
+            self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="chart-render")
+    
+    def _submit_cached_png(self, chart_kind: str, weather_info: Mapping,
+                           render_function: Callable, *render_args) -> Tuple[str, Future]:
+        """Serve a chart from the cache or queue its render, returning (content key, future of PNG bytes)"""
+        chart_key = build_chart_content_key(weather_info, chart_render_settings(chart_kind, self.dpi))
+        
+        cached_png = self.chart_cache.get(chart_key)
+        if cached_png is not None:
+            increment("chart_cache_hits")
+            cached_future = Future()
+            cached_future.set_result(cached_png)
+            return chart_key, cached_future
+        
+        def store_rendered_png(finished_future: Future):
+            if not finished_future.cancelled() and finished_future.exception() is None:
+                self.chart_cache.put(chart_key, finished_future.result())
+        
+        def start_render() -> Future:
+            increment("chart_renders")
+            render_future = self._executor.submit(render_function, weather_info, *render_args)
+            render_future.add_done_callback(store_rendered_png)
+            return render_future
+        
+        return chart_key, self.render_coalescer.share_future(chart_key, start_render)
+    
+    def submit_overview_chart_png(self, weather_info: Mapping) -> Future:
         """
-        Create a comprehensive weather overview chart
+        Queue an overview chart render, or serve it from the cache
         
         Args:
-            weather_info (Dict): Processed weather information
+            weather_info (Mapping): Processed weather information (WeatherObservation or dict)
             
         Returns:
-            str: Path to the generated chart image
+            Future: Resolves to the PNG bytes of the chart
         """
-        city_display_name = f"{weather_info['city_name']}, {weather_info['country_code']}"
-        
-        # Create figure with subplots
-        figure, chart_axes = plt.subplots(2, 2, figsize=(12, 10))
-        figure.suptitle(f'Weather Dashboard - {city_display_name}', fontsize=16, fontweight='bold')
+        _, png_future = self._submit_cached_png(
+            "overview", weather_info, render_overview_chart_png, self.dpi, self.reuse_figures
+        )
+        return png_future
+    
+    def submit_simple_temperature_chart_png(self, weather_info: Mapping) -> Future:
+        """
+        Queue a simple temperature chart render, or serve it from the cache
         
-        # Temperature Chart
-        temperature_data = [
-            weather_info['current_temperature'], 
-            weather_info['feels_like_temperature']
-        ]
-        temperature_labels = ['Current Temp', 'Feels Like']
-        
-        chart_axes[0, 0].bar(temperature_labels, temperature_data, color=['#ff6b6b', '#feca57'])
-        chart_axes[0, 0].set_title('Temperature (°C)', fontweight='bold')
-        chart_axes[0, 0].set_ylabel('Temperature (°C)')
-        
-        # Add value labels on bars
-        for i, temp_value in enumerate(temperature_data):
-            chart_axes[0, 0].text(i, temp_value + 0.5, f'{temp_value}°C', 
-                                ha='center', fontweight='bold')
-        
-        # Atmospheric Conditions
-        atmospheric_metrics = [
-            weather_info['humidity_percentage'],
-            weather_info['atmospheric_pressure'] / 10,  # Scale down for better visualization
-            weather_info['cloudiness_percentage']
-        ]
-        atmospheric_labels = ['Humidity (%)', 'Pressure (kPa)', 'Cloudiness (%)']
+        Args:
+            weather_info (Mapping): Processed weather information (WeatherObservation or dict)
+            
+        Returns:
+            Future: Resolves to the PNG bytes of the chart
+        """
+        _, png_future = self._submit_cached_png(
+            "simple", weather_info, render_simple_temperature_chart_png, self.dpi
+        )
+        return png_future
+    
+    def submit_overview_chart(self, weather_info: Mapping, chart_save_path: Optional[str] = None) -> Future:
+        """
+        Queue an overview chart render that ends up on disk
         
-        chart_axes[0, 1].bar(atmospheric_labels, atmospheric_metrics, 
-                           color=['#48cae4', '#023e8a', '#6c757d'])
-        chart_axes[0, 1].set_title('Atmospheric Conditions', fontweight='bold')
-        chart_axes[0, 1].tick_params(axis='x', rotation=45)
+        Args:
+            weather_info (Mapping): Processed weather information (WeatherObservation or dict)
+            chart_save_path (str): Output path, defaults to the content-addressed cache file
+            
+        Returns:
+            Future: Resolves to the path of the generated chart image
+        """
+        chart_key, png_future = self._submit_cached_png(
+            "overview", weather_info, render_overview_chart_png, self.dpi, self.reuse_figures
+        )
+        return self._chain_to_file(chart_key, png_future, chart_save_path)
+    
+    def submit_simple_temperature_chart(self, weather_info: Mapping, chart_save_path: Optional[str] = None) -> Future:
+        """
+        Queue a simple temperature chart render that ends up on disk
         
-        # Wind and Visibility
-        wind_visibility_data = [
-            weather_info['wind_speed'],
-            weather_info['visibility_meters'] / 1000  # Convert to km
-        ]
-        wind_visibility_labels = ['Wind Speed (m/s)', 'Visibility (km)']
+        Args:
+            weather_info (Mapping): Processed weather information (WeatherObservation or dict)
+            chart_save_path (str): Output path, defaults to the content-addressed cache file
+            
+        Returns:
+            Future: Resolves to the path of the generated chart image
+        """
+        chart_key, png_future = self._submit_cached_png(
+            "simple", weather_info, render_simple_temperature_chart_png, self.dpi
+        )
+        return self._chain_to_file(chart_key, png_future, chart_save_path)
+    
+    def submit_comparison_chart_png(self, city_comparison: CityComparison, layout: str = COMPARISON_LAYOUT,
+                                    title: Optional[str] = None) -> Future:
+        """
+        Queue a multi-city comparison chart render (not cached: the city set rarely repeats)
         
-        chart_axes[1, 0].bar(wind_visibility_labels, wind_visibility_data,
-                           color=['#90e0ef', '#0077b6'])
-        chart_axes[1, 0].set_title('Wind & Visibility', fontweight='bold')
+        Args:
+            city_comparison (CityComparison): Cities to draw, e.g. from prepare_city_comparison
+            layout (str): "bars" (grouped), "heatmap" or "small_multiples"
+            title (str): Figure title, "City Comparison - N cities" when omitted
+            
+        Returns:
+            Future: Resolves to the PNG bytes of the chart
+        """
+        increment("chart_renders")
+        return self._executor.submit(render_comparison_chart_png, city_comparison, layout, self.dpi, title)
+    
+    def _chain_to_file(self, chart_key: str, png_future: Future, chart_save_path: Optional[str]) -> Future:
+        """Turn a future of PNG bytes into a future of the file path they were written to"""
+        if chart_save_path:
+            return _chain_future(png_future, lambda png_bytes: _write_png_file(chart_save_path, png_bytes))
+        return _chain_future(png_future, lambda png_bytes: self.chart_cache.ensure_file(chart_key, png_bytes))
+    
+    def get_stats(self) -> Dict:
+        """
+        Get chart cache and render coalescing counters
         
-        # Weather Summary (Text)
-        chart_axes[1, 1].axis('off')
-        summary_text = f"""
-Weather Summary
+        Returns:
+            Dict: Cache hits, misses and spills plus renders executed and callers coalesced onto them
+        """
+        return {
+            "cache": self.chart_cache.get_stats(),
+            "coalescing": self.render_coalescer.get_stats()
+        }
+    
+    def shutdown(self, wait: bool = True):
+        """Stop the worker pool"""
+        self._executor.shutdown(wait=wait)
 
-Condition: {weather_info['weather_main']}
-Description: {weather_info['weather_description'].title()}
 
-Temperature: {weather_info['current_temperature']}°C
-Feels Like: {weather_info['feels_like_temperature']}°C
-Humidity: {weather_info['humidity_percentage']}%
-Pressure: {weather_info['atmospheric_pressure']} hPa
-Wind Speed: {weather_info['wind_speed']} m/s
-        """
+class WeatherChartGenerator:
+    """Class to generate weather data visualizations"""
+    def __init__(self, reuse_overview_figure: bool = CHART_REUSE_FIGURE,
+                 chart_cache: Optional[ChartImageCache] = None):
+        self.charts_folder = CHARTS_DIRECTORY
+        self._ensure_charts_directory_exists()
         
-        chart_axes[1, 1].text(0.1, 0.9, summary_text, transform=chart_axes[1, 1].transAxes,
-                            fontsize=11, verticalalignment='top',
-                            bbox=dict(boxstyle='round', facecolor='lightblue', alpha=0.8))
+        # Overview figure kept between renders (per calling thread) when reuse is enabled
+        self.reuse_overview_figure = reuse_overview_figure
+        self.chart_cache = chart_cache or ChartImageCache(CHART_CACHE_MAX_MEMORY_BYTES, CHART_CACHE_DIRECTORY)
+        self.render_coalescer = SingleFlightGroup()
         
-        # Adjust layout and save
-        plt.tight_layout()
-        chart_save_path = os.path.join(self.charts_folder, self.chart_file_name)
-        plt.savefig(chart_save_path, dpi=150, bbox_inches='tight')
-        plt.close()
+        # Set up matplotlib style
+        apply_chart_style()
+    
+    def _ensure_charts_directory_exists(self):
+        """Create charts directory if it doesn't exist"""
+        if not os.path.exists(self.charts_folder):
+            os.makedirs(self.charts_folder)
+    
+    def create_weather_overview_chart_png(self, weather_info: Mapping) -> bytes:
+        """
+        Create a comprehensive weather overview chart in memory
         
-        return chart_save_path
+        Args:
+            weather_info (Mapping): Processed weather information (WeatherObservation or dict)
+            
+        Returns:
+            bytes: PNG image, served from the chart cache when unchanged
+        """
+        chart_key = build_chart_content_key(weather_info, chart_render_settings("overview", CHART_DPI))
+        png_bytes = self.chart_cache.get(chart_key)
+        if png_bytes is None:
+            png_bytes = self.render_coalescer.do(chart_key, self._render_and_cache_overview, chart_key, weather_info)
+        return png_bytes
+    
+    def _render_and_cache_overview(self, chart_key: str, weather_info: Mapping) -> bytes:
+        """Render an overview chart and store it in the chart cache"""
+        png_bytes = render_overview_chart_png(weather_info, reuse_figure=self.reuse_overview_figure)
+        self.chart_cache.put(chart_key, png_bytes)
+        return png_bytes
     
-    def create_simple_temperature_chart(self, weather_info: Dict) -> str:
+    def create_weather_overview_chart(self, weather_info: Mapping) -> str:
         """
-        Create a simple temperature comparison chart
+        Create a comprehensive weather overview chart
         
         Args:
-            weather_info (Dict): Processed weather information
+            weather_info (Mapping): Processed weather information (WeatherObservation or dict)
             
         Returns:
             str: Path to the generated chart image
         """
-        plt.figure(figsize=(8, 6))
-        
-        temperature_values = [
-            weather_info['current_temperature'],
-            weather_info['feels_like_temperature']
-        ]
-        temperature_types = ['Actual Temperature', 'Feels Like Temperature']
-        
-        bars = plt.bar(temperature_types, temperature_values, 
-                      color=['#ff6b6b', '#feca57'], alpha=0.8)
+        png_bytes = self.create_weather_overview_chart_png(weather_info)
+        chart_key = build_chart_content_key(weather_info, chart_render_settings("overview", CHART_DPI))
+        return self.chart_cache.ensure_file(chart_key, png_bytes)
+    
+    def create_simple_temperature_chart(self, weather_info: Mapping) -> str:
+        """
+        Create a simple temperature comparison chart
         
-        plt.title(f"Temperature in {weather_info['city_name']}", 
-                 fontsize=14, fontweight='bold')
-        plt.ylabel('Temperature (°C)')
-        plt.xticks(rotation=45)
+        Args:
+            weather_info (Mapping): Processed weather information (WeatherObservation or dict)
+            
+        Returns:
+            str: Path to the generated chart image
+        """
+        chart_key = build_chart_content_key(weather_info, chart_render_settings("simple", CHART_DPI))
+        png_bytes = self.chart_cache.get(chart_key)
+        if png_bytes is None:
+            png_bytes = render_simple_temperature_chart_png(weather_info)
+            self.chart_cache.put(chart_key, png_bytes)
+        return self.chart_cache.ensure_file(chart_key, png_bytes)
+    
+    def create_history_chart_png(self, history_store, city_name: str, country_code: str = "",
+                                 bucket_seconds: float = 3600) -> Optional[bytes]:
+        """
+        Create a trend chart from locally stored readings, without any network call
         
-        # Add value labels
-        for bar, temp_value in zip(bars, temperature_values):
-            plt.text(bar.get_x() + bar.get_width()/2, bar.get_height() + 0.5,
-                    f'{temp_value}°C', ha='center', fontweight='bold')
+        Args:
+            history_store (ObservationHistoryStore): Store the service records readings in
+            city_name (str): City name
+            country_code (str): Country code
+            bucket_seconds (float): Aggregation bucket width
+            
+        Returns:
+            bytes: PNG image or None if the city has no stored readings
+        """
+        history_aggregates = history_store.downsample(city_name, country_code, bucket_seconds)
+        if history_aggregates['bucket_start'].size == 0:
+            return None
+        return render_history_chart_png(f"{city_name}, {country_code}", history_aggregates)
+    
+    def create_forecast_chart_png(self, forecast_series, daily_forecast: Optional[Dict] = None) -> bytes:
+        """
+        Create a 5-day forecast chart from the forecast arrays
         
-        plt.tight_layout()
-        simple_chart_path = os.path.join(self.charts_folder, 'simple_' + self.chart_file_name)
-        plt.savefig(simple_chart_path, dpi=150, bbox_inches='tight')
-        plt.close()
+        Args:
+            forecast_series (ForecastSeries): Parsed 3-hour forecast
+            daily_forecast (Dict): This city's daily rollups; computed when omitted
+            
+        Returns:
+            bytes: PNG image
+        """
+        if daily_forecast is None:
+            from backend.forecast import aggregate_daily_forecasts
+            daily_forecast = aggregate_daily_forecasts([forecast_series])
+        return render_forecast_chart_png(forecast_series, daily_forecast)
+    
+    def create_comparison_chart_png(self, observations: Iterable[Mapping], layout: str = COMPARISON_LAYOUT,
+                                    metric_names: Optional[Sequence[str]] = None, sort_by: Optional[str] = None,
+                                    descending: bool = True, top_n: Optional[int] = None,
+                                    title: Optional[str] = None) -> bytes:
+        """
+        Create one chart comparing many cities instead of one figure per city
         
-        return simple_chart_path
+        Args:
+            observations (Iterable): Processed weather information (WeatherObservation or dict), one per city
+            layout (str): "bars" (grouped), "heatmap" or "small_multiples"
+            metric_names (Sequence): Metrics to draw, a sensible set for the layout when omitted
+            sort_by (str): Metric to rank cities by; input order when omitted
+            descending (bool): Highest values first
+            top_n (int): Keep only the first top_n cities after ranking
+            title (str): Figure title, "City Comparison - N cities" when omitted
+            
+        Returns:
+            bytes: PNG image
+        """
+        city_comparison = prepare_city_comparison(observations, layout, metric_names, sort_by, descending, top_n)
+        return render_comparison_chart_png(city_comparison, layout, title=title)
@@ -0,0 +1,226 @@
+import heapq
+import math
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Metrics a comparison can show: observation field -> (axis label, scale applied to the field)
+COMPARISON_METRICS: Dict[str, Tuple[str, float]] = {
+    "current_temperature": ("Temperature (°C)", 1.0),
+    "feels_like_temperature": ("Feels Like (°C)", 1.0),
+    "humidity_percentage": ("Humidity (%)", 1.0),
+    "atmospheric_pressure": ("Pressure (hPa)", 1.0),
+    "cloudiness_percentage": ("Cloudiness (%)", 1.0),
+    "wind_speed": ("Wind Speed (m/s)", 1.0),
+    "visibility_meters": ("Visibility (km)", 0.001),
+}
+DEFAULT_COMPARISON_METRICS = tuple(COMPARISON_METRICS)
+
+
+def comparison_label(weather_info: Mapping) -> str:
+    """City label used on comparison charts, e.g. "London, GB" """
+    return f"{weather_info['city_name']}, {weather_info['country_code']}"
+
+
+def _checked_metric_names(metric_names: Sequence[str]) -> Tuple[str, ...]:
+    metric_names = tuple(metric_names)
+    unknown_metrics = [metric_name for metric_name in metric_names if metric_name not in COMPARISON_METRICS]
+    if unknown_metrics:
+        raise ValueError(f"Unknown comparison metrics {unknown_metrics}, expected some of {DEFAULT_COMPARISON_METRICS}")
+    return metric_names
+
+
+class CityComparison:
+    """Many cities' readings as a label array plus a (cities x metrics) value array"""
+
+    __slots__ = ("city_labels", "metric_names", "values")
+
+    def __init__(self, city_labels: np.ndarray, metric_names: Tuple[str, ...], values: np.ndarray):
+        self.city_labels = city_labels
+        self.metric_names = metric_names
+        # Shape (cities, len(metric_names)), already scaled for display; use column() for a named metric
+        self.values = values
+
+    def column(self, metric_name: str) -> np.ndarray:
+        """Return one metric for every city as a view into the values array"""
+        return self.values[:, self.metric_names.index(metric_name)]
+
+    def metric_labels(self) -> Tuple[str, ...]:
+        """Axis labels of the metrics, in column order"""
+        return tuple(COMPARISON_METRICS[metric_name][0] for metric_name in self.metric_names)
+
+    def select(self, city_order: np.ndarray) -> "CityComparison":
+        """Return the cities at the given positions, in that order"""
+        return CityComparison(self.city_labels[city_order], self.metric_names, self.values[city_order])
+
+    def with_metrics(self, metric_names: Sequence[str]) -> "CityComparison":
+        """Return the same cities with only the given metrics, in that order"""
+        column_indices = [self.metric_names.index(metric_name) for metric_name in metric_names]
+        return CityComparison(self.city_labels, tuple(metric_names), self.values[:, column_indices])
+
+    def ranked(self, sort_by: str, descending: bool = True, top_n: Optional[int] = None) -> "CityComparison":
+        """
+        Sort the cities by one metric and keep the first top_n
+
+        Cities without a value for the metric go last, and ties keep input order.
+        With top_n, only the kept cities are fully sorted (a partition finds the
+        cutoff first), so picking the top 20 of thousands costs little more than one pass.
+
+        Args:
+            sort_by (str): Metric to rank by, one of metric_names
+            descending (bool): Highest values first
+            top_n (int): Number of cities kept, all if None
+
+        Returns:
+            CityComparison: Ranked (and trimmed) comparison
+        """
+        sort_values = self.column(sort_by)
+        # Negate for descending order; NaN stays NaN and argsort puts it last either way
+        sort_keys = -sort_values if descending else sort_values
+        if top_n is not None and top_n <= 0:
+            city_order = np.empty(0, dtype=np.intp)
+        elif top_n is not None and top_n < len(self):
+            # The top_n-th key splits the cities; of those tied with it, the earliest are kept (as a stable sort would)
+            cutoff_key = np.partition(sort_keys, top_n - 1)[top_n - 1]
+            if np.isnan(cutoff_key):
+                ahead_of_cutoff, tied_with_cutoff = ~np.isnan(sort_keys), np.isnan(sort_keys)
+            else:
+                ahead_of_cutoff, tied_with_cutoff = sort_keys < cutoff_key, sort_keys == cutoff_key
+            tied_indices = np.flatnonzero(tied_with_cutoff)[:top_n - np.count_nonzero(ahead_of_cutoff)]
+            candidate_indices = np.sort(np.concatenate([np.flatnonzero(ahead_of_cutoff), tied_indices]))
+            city_order = candidate_indices[np.argsort(sort_keys[candidate_indices], kind="stable")]
+        else:
+            city_order = np.argsort(sort_keys, kind="stable")
+        return self.select(city_order)
+
+    def normalized(self) -> np.ndarray:
+        """Scale every metric to 0..1 across the cities (0.5 where all cities are equal)"""
+        if len(self) == 0:
+            return self.values.copy()
+        column_min = np.nanmin(self.values, axis=0)
+        column_range = np.nanmax(self.values, axis=0) - column_min
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(column_range > 0, (self.values - column_min) / column_range, 0.5)
+
+    def __len__(self) -> int:
+        return self.city_labels.size
+
+
+def build_city_comparison(observations: Iterable[Mapping],
+                          metric_names: Sequence[str] = DEFAULT_COMPARISON_METRICS) -> CityComparison:
+    """
+    Pack many readings into arrays for a comparison chart
+
+    Args:
+        observations (Iterable): Processed weather information (WeatherObservation or dict), one per city
+        metric_names (Sequence): Fields from COMPARISON_METRICS, in column order
+
+    Returns:
+        CityComparison: "City, CC" labels plus a (cities x metrics) float array
+    """
+    metric_names = _checked_metric_names(metric_names)
+
+    observations = list(observations)
+    city_labels = np.array([comparison_label(weather_info) for weather_info in observations], dtype=object)
+    values = np.empty((len(observations), len(metric_names)), dtype=np.float64)
+    for city_index, weather_info in enumerate(observations):
+        # A missing value (None) becomes NaN
+        values[city_index] = [weather_info[metric_name] for metric_name in metric_names]
+    # Unit conversions for the whole array at once
+    values *= np.array([COMPARISON_METRICS[metric_name][1] for metric_name in metric_names])
+    return CityComparison(city_labels, metric_names, values)
+
+
+class CityComparisonBuilder:
+    """
+    Collects one packed row per city from a stream of readings, for exports of any length
+
+    Only the label and the metric values are kept, in an array that grows by
+    doubling. With top_n and sort_by it keeps just the top_n rows in a heap,
+    so memory stays bounded however many cities are added; with top_n alone it
+    keeps the first top_n. build() returns the kept rows in the order they were added.
+    """
+
+    def __init__(self, metric_names: Sequence[str] = DEFAULT_COMPARISON_METRICS, sort_by: Optional[str] = None,
+                 descending: bool = True, top_n: Optional[int] = None):
+        """
+        Args:
+            metric_names (Sequence): Fields from COMPARISON_METRICS, in column order
+            sort_by (str): Metric the comparison will be ranked by, added to metric_names if missing
+            descending (bool): Highest values rank first
+            top_n (int): Rows kept, all if None
+        """
+        if sort_by is not None and sort_by not in metric_names:
+            metric_names = tuple(metric_names) + (sort_by,)
+        self.metric_names = _checked_metric_names(metric_names)
+        self.sort_by = sort_by
+        self.descending = descending
+        self.top_n = None if top_n is None else max(top_n, 0)
+        self.cities_added = 0
+
+        self._metric_scales = np.array([COMPARISON_METRICS[metric_name][1] for metric_name in self.metric_names])
+        self._sort_column = self.metric_names.index(sort_by) if sort_by is not None else None
+        # Unbounded or first-top_n mode: labels plus a values array with spare rows
+        self._city_labels: List[str] = []
+        self._values = np.empty((16, len(self.metric_names)), dtype=np.float64)
+        # Top-N mode: min-heap of (rank key, -arrival, label, row); the root is the first row to drop
+        self._top_rows: List[tuple] = []
+
+    def _pack_row(self, weather_info: Mapping) -> np.ndarray:
+        # A missing value (None) becomes NaN
+        row_values = np.array([weather_info[metric_name] for metric_name in self.metric_names], dtype=np.float64)
+        return row_values * self._metric_scales
+
+    def add(self, weather_info: Mapping):
+        """
+        Add one city's reading
+
+        Args:
+            weather_info (Mapping): Processed weather information (WeatherObservation or dict)
+        """
+        arrival = self.cities_added
+        self.cities_added += 1
+        if self.top_n is not None and self._sort_column is not None:
+            self._add_ranked(arrival, weather_info)
+            return
+        if self.top_n is not None and len(self._city_labels) >= self.top_n:
+            return
+        row_count = len(self._city_labels)
+        if row_count == len(self._values):
+            self._values = np.resize(self._values, (2 * row_count, len(self.metric_names)))
+        self._values[row_count] = self._pack_row(weather_info)
+        self._city_labels.append(comparison_label(weather_info))
+
+    def _add_ranked(self, arrival: int, weather_info: Mapping):
+        """Keep the row if it ranks among the top_n so far"""
+        if self.top_n == 0:
+            return
+        row_values = self._pack_row(weather_info)
+        sort_value = row_values[self._sort_column]
+        # Larger keys rank higher; a missing value ranks last, and on ties the earlier city wins like ranked()
+        rank_key = -math.inf if math.isnan(sort_value) else (sort_value if self.descending else -sort_value)
+        heap_entry = (rank_key, -arrival, comparison_label(weather_info), row_values)
+        if len(self._top_rows) < self.top_n:
+            heapq.heappush(self._top_rows, heap_entry)
+        elif heap_entry[:2] > self._top_rows[0][:2]:
+            heapq.heapreplace(self._top_rows, heap_entry)
+
+    def build(self) -> CityComparison:
+        """
+        Return the kept rows as a CityComparison
+
+        Returns:
+            CityComparison: Kept cities in the order they were added, not yet ranked
+        """
+        if self._sort_column is not None and self.top_n is not None:
+            kept_rows = sorted(self._top_rows, key=lambda heap_entry: -heap_entry[1])
+            city_labels = np.array([heap_entry[2] for heap_entry in kept_rows], dtype=object)
+            values = np.array([heap_entry[3] for heap_entry in kept_rows], dtype=np.float64)
+            values = values.reshape(len(kept_rows), len(self.metric_names))
+        else:
+            city_labels = np.array(self._city_labels, dtype=object)
+            values = self._values[:len(self._city_labels)].copy()
+        return CityComparison(city_labels, self.metric_names, values)
+
+    def __len__(self) -> int:
+        return len(self._top_rows) if self._sort_column is not None and self.top_n is not None else len(self._city_labels)
@@ -0,0 +1,189 @@
+import bisect
+import gzip
+import json
+import unicodedata
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+# Sorts after every real character, closing the range of keys that share a prefix
+_PREFIX_RANGE_END = "\U0010ffff"
+
+
+def normalize_city_name(city_name: str) -> str:
+    """
+    Normalize a city name for matching: accents stripped, case folded, whitespace collapsed
+
+    Args:
+        city_name (str): City name as typed or as listed
+
+    Returns:
+        str: Key such that "São  Paulo" and "sao paulo" compare equal
+    """
+    decomposed_name = unicodedata.normalize("NFKD", city_name)
+    without_accents = "".join(character for character in decomposed_name if not unicodedata.combining(character))
+    return " ".join(without_accents.split()).casefold()
+
+
+class CityRecord(NamedTuple):
+    """One city from the OpenWeatherMap city list"""
+
+    city_id: int
+    name: str
+    state: str
+    country: str
+    latitude: float
+    longitude: float
+
+    @property
+    def display_name(self) -> str:
+        """Label such as "London, GB" or "Springfield, IL, US" """
+        return ", ".join(part for part in (self.name, self.state, self.country) if part)
+
+
+class CityIndex:
+    """
+    In-memory index of the OpenWeatherMap city list for typeahead and name-to-ID resolution
+
+    Names are kept as one sorted list of normalized keys, so a prefix lookup is two
+    bisections and a slice. Per-city fields live in parallel arrays indexed by row.
+    """
+
+    def __init__(self, cities: Iterable[Dict]):
+        """
+        Args:
+            cities (Iterable[Dict]): Entries shaped like city.list.json:
+                {"id", "name", "state", "country", "coord": {"lat", "lon"}}
+        """
+        city_ids, names, states, countries, latitudes, longitudes = [], [], [], [], [], []
+        for city in cities:
+            coordinates = city.get("coord") or {}
+            city_ids.append(city["id"])
+            names.append(city.get("name", ""))
+            states.append(city.get("state") or "")
+            countries.append(city.get("country") or "")
+            latitudes.append(coordinates.get("lat", 0.0))
+            longitudes.append(coordinates.get("lon", 0.0))
+
+        self._city_ids = np.asarray(city_ids, dtype=np.int64)
+        self._names = names
+        self._states = states
+        self._countries = countries
+        self._latitudes = np.asarray(latitudes, dtype=np.float32)
+        self._longitudes = np.asarray(longitudes, dtype=np.float32)
+
+        # Equal names are ordered by ID: stable, and the list has no population, but the
+        # well-known city usually carries the lowest GeoNames ID (London GB before London CA)
+        normalized_names = [normalize_city_name(name) for name in names]
+        sorted_rows = sorted(range(len(names)), key=lambda row: (normalized_names[row], city_ids[row]))
+        self._sorted_keys = [normalized_names[row] for row in sorted_rows]
+        self._sorted_rows = np.asarray(sorted_rows, dtype=np.int32)
+        self._rows_by_id = {city_id: row for row, city_id in enumerate(city_ids)}
+
+    @classmethod
+    def from_file(cls, city_list_path: str) -> "CityIndex":
+        """
+        Load OpenWeatherMap's city.list.json, plain or gzip-compressed
+
+        Args:
+            city_list_path (str): Path to city.list.json or city.list.json.gz
+
+        Returns:
+            CityIndex: Index over every city in the file
+        """
+        opener = gzip.open if city_list_path.endswith(".gz") else open
+        with opener(city_list_path, "rt", encoding="utf-8") as city_list_file:
+            return cls(json.load(city_list_file))
+
+    def __len__(self) -> int:
+        return len(self._sorted_keys)
+
+    def _record(self, row: int) -> CityRecord:
+        return CityRecord(int(self._city_ids[row]), self._names[row], self._states[row], self._countries[row],
+                          float(self._latitudes[row]), float(self._longitudes[row]))
+
+    def _key_range(self, low_key: str, high_key: str) -> Tuple[int, int]:
+        return bisect.bisect_left(self._sorted_keys, low_key), bisect.bisect_left(self._sorted_keys, high_key)
+
+    def get_by_id(self, city_id: int) -> Optional[CityRecord]:
+        """Look up a city by its OpenWeatherMap ID"""
+        row = self._rows_by_id.get(city_id)
+        return None if row is None else self._record(row)
+
+    def suggest(self, typed_text: str, limit: int = 8) -> List[CityRecord]:
+        """
+        Typeahead: cities whose name starts with the typed text
+
+        "Lon" suggests London, Londonderry, ...; "London, C" narrows to
+        countries or states starting with "C".
+
+        Args:
+            typed_text (str): Partial input from the search field
+            limit (int): Maximum number of suggestions
+
+        Returns:
+            List[CityRecord]: Matches in alphabetical order, so an exact name comes before longer ones
+        """
+        name_part, qualifiers = self._split_query(typed_text)
+        if not name_part:
+            return []
+        if qualifiers:
+            # Qualifiers follow a comma, so the name itself is complete
+            first_position, last_position = self._key_range(name_part, name_part + "\x00")
+        else:
+            first_position, last_position = self._key_range(name_part, name_part + _PREFIX_RANGE_END)
+
+        suggestions = []
+        for position in range(first_position, last_position):
+            row = int(self._sorted_rows[position])
+            if qualifiers and not self._matches_qualifiers(row, qualifiers, allow_prefix=True):
+                continue
+            suggestions.append(self._record(row))
+            if len(suggestions) >= limit:
+                break
+        return suggestions
+
+    def resolve(self, query: str) -> List[CityRecord]:
+        """
+        Resolve a typed city to exact matches, without any network call
+
+        Accepts "Name", "Name, Country" or "Name, State, Country".
+
+        Args:
+            query (str): City as typed by the user
+
+        Returns:
+            List[CityRecord]: Exact matches in a stable order (empty if the city is unknown)
+        """
+        name_part, qualifiers = self._split_query(query)
+        if not name_part:
+            return []
+        first_position, last_position = self._key_range(name_part, name_part + "\x00")
+        return [
+            self._record(int(self._sorted_rows[position]))
+            for position in range(first_position, last_position)
+            if not qualifiers or self._matches_qualifiers(int(self._sorted_rows[position]), qualifiers)
+        ]
+
+    def resolve_id(self, query: str) -> Optional[int]:
+        """Return the ID of the first exact match for a typed city, or None if it is unknown"""
+        matches = self.resolve(query)
+        return matches[0].city_id if matches else None
+
+    @staticmethod
+    def _split_query(query: str) -> Tuple[str, List[str]]:
+        """Split "Name, State, Country" into the normalized name and its qualifiers"""
+        query_parts = [normalize_city_name(part) for part in str(query).split(",")]
+        return query_parts[0], [part for part in query_parts[1:] if part]
+
+    def _matches_qualifiers(self, row: int, qualifiers: List[str], allow_prefix: bool = False) -> bool:
+        """Check ", country" or ", state, country" qualifiers against one city"""
+        # Normalized like the qualifiers, so "Sao Paulo, Sao Paulo" matches the listed "São Paulo" state
+        city_fields = (normalize_city_name(self._states[row]), normalize_city_name(self._countries[row]))
+        if len(qualifiers) == 1:
+            return any(field == qualifiers[0] or (allow_prefix and field.startswith(qualifiers[0]))
+                       for field in city_fields)
+        state_qualifier, country_qualifier = qualifiers[-2], qualifiers[-1]
+        return city_fields[0] == state_qualifier and (
+            city_fields[1] == country_qualifier or (allow_prefix and city_fields[1].startswith(country_qualifier))
+        )
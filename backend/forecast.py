@@ -0,0 +1,151 @@
+from typing import Dict, Sequence
+
+import numpy as np
+
+SECONDS_PER_DAY = 86400
+
+# Numeric columns parsed from each 3-hour forecast slot, in storage order
+FORECAST_COLUMNS = (
+    "temperature",
+    "temperature_min",
+    "temperature_max",
+    "feels_like",
+    "humidity",
+    "pressure",
+    "wind_speed",
+    "cloudiness",
+    "precipitation",
+    "precipitation_probability",
+)
+_COLUMN_INDEX = {column_name: index for index, column_name in enumerate(FORECAST_COLUMNS)}
+_EMPTY_SECTION: Dict = {}
+
+
+class ForecastSeries:
+    """One city's 5-day/3-hour forecast as a timestamp array plus a (slots x metrics) value array"""
+
+    __slots__ = ("city_name", "country_code", "timezone_offset", "timestamps", "values")
+
+    def __init__(self, city_name: str, country_code: str, timezone_offset: int,
+                 timestamps: np.ndarray, values: np.ndarray):
+        self.city_name = city_name
+        self.country_code = country_code
+        self.timezone_offset = timezone_offset
+        self.timestamps = timestamps
+        # Shape (slots, len(FORECAST_COLUMNS)); use column() for a named metric
+        self.values = values
+
+    def column(self, column_name: str) -> np.ndarray:
+        """Return one metric for every slot as a view into the values array"""
+        return self.values[:, _COLUMN_INDEX[column_name]]
+
+    def __len__(self) -> int:
+        return self.timestamps.size
+
+
+def parse_forecast_payload(raw_forecast_data: Dict) -> ForecastSeries:
+    """
+    Parse an OpenWeatherMap /forecast response straight into arrays
+
+    Args:
+        raw_forecast_data (Dict): Raw API response with up to 40 slots in "list"
+
+    Returns:
+        ForecastSeries: Timestamps plus a (slots x metrics) float array
+    """
+    forecast_slots = raw_forecast_data.get("list") or []
+    city_section = raw_forecast_data.get("city") or _EMPTY_SECTION
+
+    timestamps = np.empty(len(forecast_slots), dtype=np.int64)
+    values = np.empty((len(forecast_slots), len(FORECAST_COLUMNS)), dtype=np.float64)
+
+    for slot_index, forecast_slot in enumerate(forecast_slots):
+        main_section = forecast_slot.get("main") or _EMPTY_SECTION
+        timestamps[slot_index] = forecast_slot.get("dt", 0)
+        values[slot_index] = (
+            main_section.get("temp", np.nan),
+            main_section.get("temp_min", np.nan),
+            main_section.get("temp_max", np.nan),
+            main_section.get("feels_like", np.nan),
+            main_section.get("humidity", np.nan),
+            main_section.get("pressure", np.nan),
+            (forecast_slot.get("wind") or _EMPTY_SECTION).get("speed", 0.0),
+            (forecast_slot.get("clouds") or _EMPTY_SECTION).get("all", 0.0),
+            (forecast_slot.get("rain") or _EMPTY_SECTION).get("3h", 0.0)
+            + (forecast_slot.get("snow") or _EMPTY_SECTION).get("3h", 0.0),
+            forecast_slot.get("pop", 0.0),
+        )
+
+    return ForecastSeries(
+        city_section.get("name", "Unknown"),
+        city_section.get("country", ""),
+        city_section.get("timezone", 0),
+        timestamps,
+        values,
+    )
+
+
+def aggregate_daily_forecasts(forecast_series: Sequence[ForecastSeries]) -> Dict[str, np.ndarray]:
+    """
+    Roll many cities' 3-hour slots up into local calendar days in one vectorized pass
+
+    Args:
+        forecast_series (Sequence[ForecastSeries]): Forecasts for one or more cities
+
+    Returns:
+        Dict: Parallel arrays with one entry per (city, day): "city_index", "day",
+              "slot_count", "temperature_min/max/mean", "feels_like_mean",
+              "humidity_mean", "wind_speed_max", "precipitation_total",
+              "precipitation_probability_max"
+    """
+    non_empty_series = [(city_index, series) for city_index, series in enumerate(forecast_series) if len(series)]
+    if not non_empty_series:
+        empty_result = {"city_index": np.empty(0, dtype=np.int64), "day": np.empty(0, dtype="datetime64[D]"),
+                        "slot_count": np.empty(0, dtype=np.int64)}
+        for rollup_name in ("temperature_min", "temperature_max", "temperature_mean", "feels_like_mean",
+                            "humidity_mean", "wind_speed_max", "precipitation_total",
+                            "precipitation_probability_max"):
+            empty_result[rollup_name] = np.empty(0)
+        return empty_result
+
+    # Concatenate every city's slots; slots are time-ordered within each city
+    all_values = np.concatenate([series.values for _, series in non_empty_series])
+    city_indices = np.concatenate([
+        np.full(len(series), city_index, dtype=np.int64) for city_index, series in non_empty_series
+    ])
+    local_days = np.concatenate([
+        (series.timestamps + series.timezone_offset) // SECONDS_PER_DAY for _, series in non_empty_series
+    ])
+
+    # A (city, day) group is a contiguous run, so reduceat aggregates every group at once
+    group_starts = np.flatnonzero(np.r_[
+        True, (city_indices[1:] != city_indices[:-1]) | (local_days[1:] != local_days[:-1])
+    ])
+    slot_counts = np.diff(np.r_[group_starts, city_indices.size])
+
+    def column(column_name: str) -> np.ndarray:
+        return all_values[:, _COLUMN_INDEX[column_name]]
+
+    def group_mean(column_name: str) -> np.ndarray:
+        return np.add.reduceat(column(column_name), group_starts) / slot_counts
+
+    return {
+        "city_index": city_indices[group_starts],
+        "day": local_days[group_starts].astype("datetime64[D]"),
+        "slot_count": slot_counts,
+        "temperature_min": np.minimum.reduceat(column("temperature_min"), group_starts),
+        "temperature_max": np.maximum.reduceat(column("temperature_max"), group_starts),
+        "temperature_mean": group_mean("temperature"),
+        "feels_like_mean": group_mean("feels_like"),
+        "humidity_mean": group_mean("humidity"),
+        "wind_speed_max": np.maximum.reduceat(column("wind_speed"), group_starts),
+        "precipitation_total": np.add.reduceat(column("precipitation"), group_starts),
+        "precipitation_probability_max": np.maximum.reduceat(column("precipitation_probability"), group_starts),
+    }
+
+
+def daily_rows_for_city(daily_forecasts: Dict[str, np.ndarray], city_index: int) -> Dict[str, np.ndarray]:
+    """Select one city's days from the output of aggregate_daily_forecasts"""
+    city_rows = daily_forecasts["city_index"] == city_index
+    return {rollup_name: rollup_values[city_rows] for rollup_name, rollup_values in daily_forecasts.items()}
+
@@ -0,0 +1,124 @@
+import threading
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from backend.metrics import increment, timed
+
+# Transient upstream failures worth retrying
+RETRYABLE_STATUS_CODES = (429, 500, 502, 503, 504)
+
+
+class BoundedRetryAfterRetry(Retry):
+    """Retry policy that honors Retry-After but never sleeps longer than max_retry_after_seconds"""
+
+    def __init__(self, *args, max_retry_after_seconds: Optional[float] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.max_retry_after_seconds = max_retry_after_seconds
+
+    def new(self, **kwargs) -> "BoundedRetryAfterRetry":
+        # urllib3 copies the policy after every attempt; carry the cap over
+        kwargs.setdefault("max_retry_after_seconds", self.max_retry_after_seconds)
+        return super().new(**kwargs)
+
+    def get_retry_after(self, response) -> Optional[float]:
+        retry_after = super().get_retry_after(response)
+        if retry_after is None or self.max_retry_after_seconds is None:
+            return retry_after
+        return min(retry_after, self.max_retry_after_seconds)
+
+
+class PooledHttpTransport:
+    """Long-lived requests session with keep-alive connection pooling and retries"""
+
+    def __init__(self, pool_connections: int, pool_maxsize: int, max_retries: int,
+                 backoff_factor: float, timeout_seconds: float,
+                 max_retry_after_seconds: Optional[float] = None):
+        self.timeout_seconds = timeout_seconds
+
+        # A 429 with a long Retry-After would otherwise hold the caller for as long as the server asks
+        retry_policy = BoundedRetryAfterRetry(
+            total=max_retries,
+            connect=max_retries,
+            read=max_retries,
+            status=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=RETRYABLE_STATUS_CODES,
+            allowed_methods=frozenset(["GET"]),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+            max_retry_after_seconds=max_retry_after_seconds
+        )
+
+        # pool_connections is the number of hosts kept, pool_maxsize the connections per host
+        self._adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=retry_policy,
+            pool_block=True
+        )
+        self.session = requests.Session()
+        self.session.mount("http://", self._adapter)
+        self.session.mount("https://", self._adapter)
+
+        self._stats_lock = threading.Lock()
+        self.requests_sent = 0
+        self.retries_performed = 0
+
+    def get(self, url: str, params: Optional[Dict] = None) -> requests.Response:
+        """
+        Send a GET request over the pooled session
+
+        Args:
+            url (str): Request URL without query string
+            params (Dict): Query parameters
+
+        Returns:
+            requests.Response: Final response after any retries
+        """
+        # DNS, connect, retries and transfer; the body is decoded separately (json_decode)
+        with timed("http_request"):
+            response = self.session.get(url, params=params, timeout=self.timeout_seconds)
+
+        retry_state = getattr(response.raw, "retries", None)
+        retry_count = len(retry_state.history) if retry_state is not None else 0
+        with self._stats_lock:
+            self.requests_sent += 1
+            self.retries_performed += retry_count
+        increment("api_requests")
+        if retry_count:
+            increment("api_retries", retry_count)
+
+        return response
+
+    def _count_opened_connections(self) -> int:
+        """Sum the connections opened by every host pool the adapter keeps"""
+        host_pools = self._adapter.poolmanager.pools
+        opened_connections = 0
+        for pool_key in list(host_pools.keys()):
+            host_pool = host_pools.get(pool_key)
+            if host_pool is not None:
+                opened_connections += host_pool.num_connections
+        return opened_connections
+
+    def get_stats(self) -> Dict:
+        """Return request, retry and connection reuse counters"""
+        opened_connections = self._count_opened_connections()
+        with self._stats_lock:
+            requests_sent = self.requests_sent
+            retries_performed = self.retries_performed
+
+        # Every attempt (including retries) needs a connection; the rest were reused
+        total_attempts = requests_sent + retries_performed
+        return {
+            "requests_sent": requests_sent,
+            "retries_performed": retries_performed,
+            "connections_opened": opened_connections,
+            "connections_reused": max(total_attempts - opened_connections, 0),
+        }
+
+    def close(self):
+        """Close every pooled connection"""
+        self.session.close()
@@ -0,0 +1,377 @@
+import bisect
+import contextvars
+import cProfile
+import io
+import logging
+import pstats
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+
+# Setup project path for imports
+from utils.path_helper import setup_project_path
+setup_project_path()
+
+from config.settings import METRICS_ENABLED
+
+weather_logger = logging.getLogger(__name__)
+
+# Upper bounds in seconds, from sub-millisecond cache hits to slow API calls and renders
+LATENCY_BUCKETS = (0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram, cumulative on export like a Prometheus histogram"""
+
+    __slots__ = ("bucket_bounds", "bucket_counts", "total_seconds", "observation_count", "_lock")
+
+    def __init__(self, bucket_bounds: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.bucket_bounds = bucket_bounds
+        self.bucket_counts = [0] * (len(bucket_bounds) + 1)  # the last bucket is +Inf
+        self.total_seconds = 0.0
+        self.observation_count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float):
+        bucket_index = bisect.bisect_left(self.bucket_bounds, seconds)
+        with self._lock:
+            self.bucket_counts[bucket_index] += 1
+            self.total_seconds += seconds
+            self.observation_count += 1
+
+    def snapshot(self) -> Tuple[List[int], float, int]:
+        """Return (per-bucket counts, sum, count) taken under the lock"""
+        with self._lock:
+            return list(self.bucket_counts), self.total_seconds, self.observation_count
+
+    def quantile(self, fraction: float) -> Optional[float]:
+        """Estimate a quantile as the upper bound of the bucket that contains it"""
+        bucket_counts, _, observation_count = self.snapshot()
+        if not observation_count:
+            return None
+        target_rank = fraction * observation_count
+        running_count = 0
+        for bucket_index, bucket_count in enumerate(bucket_counts):
+            running_count += bucket_count
+            if running_count >= target_rank:
+                return self.bucket_bounds[bucket_index] if bucket_index < len(self.bucket_bounds) else float("inf")
+        return float("inf")
+
+
+class _NoOpTimer:
+    """Stand-in for _StageTimer while metrics are disabled"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+_NO_OP_TIMER = _NoOpTimer()
+
+
+class _StageTimer:
+    """Context manager timing one stage into the registry (and the profiler when it is on)"""
+
+    __slots__ = ("registry", "stage", "start_time", "profiled", "stage_profiler")
+
+    def __init__(self, registry: "MetricsRegistry", stage: str):
+        self.registry = registry
+        self.stage = stage
+
+    def __enter__(self):
+        # Remember whether this stage entered the profiler, so it always leaves it again
+        self.profiled = self.registry.profiler.active
+        self.stage_profiler = self.registry.profiler.enter_stage() if self.profiled else None
+        self.start_time = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        elapsed_seconds = time.perf_counter() - self.start_time
+        if self.profiled:
+            self.registry.profiler.exit_stage(self.stage_profiler)
+        self.registry.observe(self.stage, elapsed_seconds)
+        if exc_type is not None:
+            self.registry.increment(f"{self.stage}_errors")
+        return False
+
+
+# (thread ident, open stages) of the current asyncio task or thread; a task's stages nest across awaits
+_stage_depth: contextvars.ContextVar = contextvars.ContextVar("weather_stage_depth", default=(0, 0))
+
+
+class StageProfiler:
+    """
+    cProfile hook that can be switched on and off at runtime
+
+    cProfile only sees the thread that enabled it, so each thread gets its own
+    profiler, enabled while any task or call on that thread is inside an
+    outermost timed stage. Nesting is tracked per asyncio task (a context
+    variable), so searches interleaving on the event loop thread never end each
+    other's profiling; the thread's report then includes every task that ran
+    inside a stage. Stopping merges them into one report. While off, the cost
+    is one attribute check per stage.
+    """
+
+    def __init__(self):
+        self.active = False
+        self._thread_state = threading.local()
+        self._profilers: List[cProfile.Profile] = []
+        self._lock = threading.Lock()
+        self.started_at: Optional[float] = None
+
+    def start(self):
+        """Start collecting profiles of every timed stage"""
+        with self._lock:
+            self._profilers = []
+            self._thread_state = threading.local()
+            self.started_at = time.time()
+            self.active = True
+        weather_logger.info("Stage profiling started")
+
+    def stop(self, sort_by: str = "cumulative", line_limit: int = 40) -> str:
+        """
+        Stop profiling and return the merged report
+
+        Args:
+            sort_by (str): pstats sort key
+            line_limit (int): Number of functions listed
+
+        Returns:
+            str: pstats report of everything that ran inside timed stages
+        """
+        with self._lock:
+            self.active = False
+            profilers, self._profilers = self._profilers, []
+        report_buffer = io.StringIO()
+        collected_stats = None
+        for profiler in profilers:
+            profiler.create_stats()
+            if collected_stats is None:
+                collected_stats = pstats.Stats(profiler, stream=report_buffer)
+            else:
+                collected_stats.add(profiler)
+        if collected_stats is None:
+            return "No stages ran while profiling\n"
+        collected_stats.sort_stats(sort_by).print_stats(line_limit)
+        weather_logger.info("Stage profiling stopped")
+        return report_buffer.getvalue()
+
+    @staticmethod
+    def _change_stage_depth(change: int) -> int:
+        """Add change to the current task's stage depth on this thread and return the depth before"""
+        thread_ident = threading.get_ident()
+        depth_thread, stage_depth = _stage_depth.get()
+        # A context copied into a worker thread (asyncio.to_thread) starts that thread at depth 0
+        if depth_thread != thread_ident:
+            stage_depth = 0
+        _stage_depth.set((thread_ident, max(0, stage_depth + change)))
+        return stage_depth
+
+    def enter_stage(self) -> Optional[cProfile.Profile]:
+        """Enable this thread's profiler for a task's outermost stage and return it (None for nested stages)"""
+        if self._change_stage_depth(+1):
+            return None  # nested stage: the task's outer stage is already profiling
+        thread_state = self._thread_state
+        profiler = getattr(thread_state, "profiler", None)
+        if profiler is None:
+            profiler = cProfile.Profile()
+            thread_state.profiler = profiler
+            thread_state.open_stages = 0
+            with self._lock:
+                self._profilers.append(profiler)
+        if not thread_state.open_stages:
+            try:
+                profiler.enable()
+            except ValueError:
+                return None  # another profiling tool is already active
+        thread_state.open_stages += 1
+        return profiler
+
+    def exit_stage(self, stage_profiler: Optional[cProfile.Profile]):
+        """Leave a stage; the thread's profiler is disabled once no task on it is inside a stage"""
+        self._change_stage_depth(-1)
+        if stage_profiler is None:
+            return
+        thread_state = self._thread_state
+        if stage_profiler is not getattr(thread_state, "profiler", None):
+            stage_profiler.disable()  # entered before profiling was restarted
+            return
+        thread_state.open_stages -= 1
+        if not thread_state.open_stages:
+            stage_profiler.disable()
+
+
+class MetricsRegistry:
+    """Process-wide per-stage latency histograms and counters"""
+
+    def __init__(self, enabled: bool = METRICS_ENABLED, namespace: str = "weather"):
+        self.enabled = enabled
+        self.namespace = namespace
+        self.profiler = StageProfiler()
+        # Log every stage's duration; a lightweight trace for a single slow search
+        self.trace_stages = False
+        self._histograms: Dict[str, LatencyHistogram] = {}
+        self._counters: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def timed(self, stage: str):
+        """
+        Time a block of code as one stage
+
+        Args:
+            stage (str): Stage name, e.g. "http_request" or "png_encode"
+
+        Returns:
+            Context manager recording the block's duration
+        """
+        if not self.enabled:
+            return _NO_OP_TIMER
+        return _StageTimer(self, stage)
+
+    def observe(self, stage: str, seconds: float):
+        """Record one duration for a stage"""
+        histogram = self._histograms.get(stage)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(stage, LatencyHistogram())
+        histogram.observe(seconds)
+        if self.trace_stages:
+            weather_logger.info(f"[{threading.current_thread().name}] {stage}: {seconds * 1000:.2f} ms")
+
+    def increment(self, counter_name: str, amount: int = 1):
+        """Add to a counter"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[counter_name] = self._counters.get(counter_name, 0) + amount
+
+    def get_stats(self) -> Dict:
+        """
+        Summarize every stage and counter
+
+        Returns:
+            Dict: {"stages": {stage: count, mean/p50/p99 ms}, "counters": {name: value}}
+        """
+        with self._lock:
+            histograms = dict(self._histograms)
+            counters = dict(self._counters)
+        stage_stats = {}
+        for stage, histogram in sorted(histograms.items()):
+            _, total_seconds, observation_count = histogram.snapshot()
+            stage_stats[stage] = {
+                "count": observation_count,
+                "mean_ms": total_seconds / observation_count * 1000 if observation_count else None,
+                "p50_ms_upper_bound": _to_milliseconds(histogram.quantile(0.50)),
+                "p99_ms_upper_bound": _to_milliseconds(histogram.quantile(0.99)),
+            }
+        return {"stages": stage_stats, "counters": counters}
+
+    def render_prometheus(self) -> str:
+        """
+        Export every histogram and counter in the Prometheus text format
+
+        Returns:
+            str: Exposition text for a /metrics endpoint
+        """
+        with self._lock:
+            histograms = dict(self._histograms)
+            counters = dict(self._counters)
+
+        histogram_name = f"{self.namespace}_stage_duration_seconds"
+        exposition_lines = [
+            f"# HELP {histogram_name} Time spent in each stage of a lookup, render or UI update",
+            f"# TYPE {histogram_name} histogram",
+        ]
+        for stage, histogram in sorted(histograms.items()):
+            bucket_counts, total_seconds, observation_count = histogram.snapshot()
+            cumulative_count = 0
+            for bucket_bound, bucket_count in zip(histogram.bucket_bounds, bucket_counts):
+                cumulative_count += bucket_count
+                exposition_lines.append(f'{histogram_name}_bucket{{stage="{stage}",le="{bucket_bound}"}} {cumulative_count}')
+            exposition_lines.append(f'{histogram_name}_bucket{{stage="{stage}",le="+Inf"}} {observation_count}')
+            exposition_lines.append(f'{histogram_name}_sum{{stage="{stage}"}} {total_seconds}')
+            exposition_lines.append(f'{histogram_name}_count{{stage="{stage}"}} {observation_count}')
+
+        for counter_name, counter_value in sorted(counters.items()):
+            metric_name = f"{self.namespace}_{counter_name}_total"
+            exposition_lines.append(f"# TYPE {metric_name} counter")
+            exposition_lines.append(f"{metric_name} {counter_value}")
+        return "\n".join(exposition_lines) + "\n"
+
+    def reset(self):
+        """Drop every histogram and counter"""
+        with self._lock:
+            self._histograms = {}
+            self._counters = {}
+
+
+def _to_milliseconds(seconds: Optional[float]) -> Optional[float]:
+    return None if seconds is None else seconds * 1000
+
+
+# Shared by every module; import `timed` and `increment` for the hot paths
+weather_metrics = MetricsRegistry()
+timed = weather_metrics.timed
+increment = weather_metrics.increment
+
+
+class _MetricsRequestHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        registry: MetricsRegistry = self.server.registry
+        request_path = self.path.split("?", 1)[0].rstrip("/")
+
+        if request_path == "/metrics":
+            self._send_text(200, registry.render_prometheus(), "text/plain; version=0.0.4")
+        elif request_path == "/profile/start":
+            registry.profiler.start()
+            self._send_text(200, "profiling started\n")
+        elif request_path == "/profile/stop":
+            self._send_text(200, registry.profiler.stop())
+        elif request_path in ("/trace/on", "/trace/off"):
+            registry.trace_stages = request_path.endswith("on")
+            self._send_text(200, f"stage trace {'on' if registry.trace_stages else 'off'}\n")
+        else:
+            self._send_text(404, "endpoints: /metrics /profile/start /profile/stop /trace/on /trace/off\n")
+
+    def _send_text(self, status_code: int, response_text: str, content_type: str = "text/plain"):
+        response_body = response_text.encode("utf-8")
+        self.send_response(status_code)
+        self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+        self.send_header("Content-Length", str(len(response_body)))
+        self.end_headers()
+        self.wfile.write(response_body)
+
+    def log_message(self, format, *args):
+        pass  # scrapes every few seconds would flood the log
+
+
+class MetricsServer:
+    """Local HTTP endpoint: /metrics for Prometheus, plus runtime profiling and trace switches"""
+
+    def __init__(self, port: int, registry: MetricsRegistry = weather_metrics, host: str = "127.0.0.1"):
+        self._http_server = ThreadingHTTPServer((host, port), _MetricsRequestHandler)
+        self._http_server.daemon_threads = True
+        self._http_server.registry = registry
+        self._serve_thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._http_server.server_address[:2]
+        return f"http://{host}:{port}/metrics"
+
+    def start(self) -> "MetricsServer":
+        """Serve on a background thread"""
+        self._serve_thread = threading.Thread(target=self._http_server.serve_forever,
+                                              name="metrics-server", daemon=True)
+        self._serve_thread.start()
+        return self
+
+    def stop(self):
+        """Stop serving and close the socket"""
+        self._http_server.shutdown()
+        self._http_server.server_close()
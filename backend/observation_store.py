@@ -0,0 +1,230 @@
+import json
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Mapping, Optional
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# One append-only file per column; the timestamp column doubles as the time index
+HISTORY_COLUMNS = (
+    ("timestamp", np.dtype("<f8")),
+    ("current_temperature", np.dtype("<f4")),
+    ("feels_like_temperature", np.dtype("<f4")),
+    ("humidity_percentage", np.dtype("<f4")),
+    ("atmospheric_pressure", np.dtype("<f4")),
+    ("wind_speed", np.dtype("<f4")),
+    ("visibility_meters", np.dtype("<f4")),
+    ("cloudiness_percentage", np.dtype("<f4")),
+)
+VALUE_COLUMNS = tuple(column_name for column_name, _ in HISTORY_COLUMNS[1:])
+# Held while appending, so stores in other processes (e.g. a batch export next to the dashboard) wait their turn
+APPEND_LOCK_FILENAME = ".append.lock"
+
+
+@contextmanager
+def _exclusive_file_lock(lock_path: str):
+    """Hold an exclusive OS-level lock on lock_path, blocking until it is free"""
+    with open(lock_path, "a+b") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        else:
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class ObservationHistoryStore:
+    """Append-only local store of readings as memory-mapped numeric columns per city"""
+
+    def __init__(self, history_directory: str):
+        self.history_directory = history_directory
+        os.makedirs(self.history_directory, exist_ok=True)
+
+        # The thread lock orders appends within this process, the file lock across processes
+        self._append_lock = threading.Lock()
+        self._append_lock_path = os.path.join(self.history_directory, APPEND_LOCK_FILENAME)
+        # city key -> (row count, {column: memmap}), refreshed when the files grow
+        self._mapped_columns: Dict[str, tuple] = {}
+
+    @staticmethod
+    def city_key(city_name: str, country_code: str = "") -> str:
+        """Build a filesystem-safe key for a city"""
+        normalized_city = f"{city_name} {country_code}".casefold()
+        return re.sub(r"[^a-z0-9]+", "_", normalized_city).strip("_") or "unknown"
+
+    def _city_directory(self, city_key: str) -> str:
+        return os.path.join(self.history_directory, city_key)
+
+    def _column_path(self, city_key: str, column_name: str) -> str:
+        return os.path.join(self._city_directory(city_key), f"{column_name}.bin")
+
+    def _row_count(self, city_key: str) -> int:
+        """Rows fully written to every column (readers ignore a torn append, the next append truncates it)"""
+        row_counts = []
+        for column_name, column_dtype in HISTORY_COLUMNS:
+            try:
+                row_counts.append(os.path.getsize(self._column_path(city_key, column_name)) // column_dtype.itemsize)
+            except OSError:
+                return 0
+        return min(row_counts)
+
+    def _last_timestamp(self, city_key: str) -> Optional[float]:
+        row_count = self._row_count(city_key)
+        if row_count == 0:
+            return None
+        with open(self._column_path(city_key, "timestamp"), "rb") as timestamp_file:
+            timestamp_file.seek((row_count - 1) * 8)
+            return float(np.frombuffer(timestamp_file.read(8), dtype="<f8")[0])
+
+    def _truncate_torn_append(self, city_key: str, row_count: int):
+        """Cut every column back to row_count rows, dropping the partial row an interrupted append left"""
+        for column_name, column_dtype in HISTORY_COLUMNS:
+            column_path = self._column_path(city_key, column_name)
+            try:
+                column_size = os.path.getsize(column_path)
+            except OSError:
+                continue
+            if column_size != row_count * column_dtype.itemsize:
+                os.truncate(column_path, row_count * column_dtype.itemsize)
+
+    def append(self, observation: Mapping, timestamp: Optional[float] = None) -> bool:
+        """
+        Append one reading to its city's columns
+
+        Args:
+            observation (Mapping): Processed weather information (WeatherObservation or dict)
+            timestamp (float): Reading time in epoch seconds, defaults to the payload's time or now
+
+        Returns:
+            bool: False when the reading is not newer than the last stored one (e.g. a cached repeat)
+        """
+        city_key = self.city_key(observation["city_name"], observation.get("country_code", ""))
+        if timestamp is None:
+            timestamp = observation.get("observation_timestamp") or time.time()
+
+        with self._append_lock, _exclusive_file_lock(self._append_lock_path):
+            last_timestamp = self._last_timestamp(city_key)
+            if last_timestamp is not None and timestamp <= last_timestamp:
+                return False
+
+            city_directory = self._city_directory(city_key)
+            os.makedirs(city_directory, exist_ok=True)
+            metadata_path = os.path.join(city_directory, "city.json")
+            if not os.path.isfile(metadata_path):
+                with open(metadata_path, "w", encoding="utf-8") as metadata_file:
+                    json.dump({"city_name": observation["city_name"],
+                               "country_code": observation.get("country_code", "")}, metadata_file)
+            # Without this, the rows after a torn append would pair values with the wrong timestamps
+            self._truncate_torn_append(city_key, self._row_count(city_key))
+
+            row_values = {"timestamp": timestamp}
+            row_values.update({column_name: observation.get(column_name, 0) for column_name in VALUE_COLUMNS})
+            for column_name, column_dtype in HISTORY_COLUMNS:
+                with open(self._column_path(city_key, column_name), "ab") as column_file:
+                    column_file.write(np.asarray([row_values[column_name]], dtype=column_dtype).tobytes())
+        return True
+
+    def _load_columns(self, city_key: str) -> Dict[str, np.ndarray]:
+        """Memory-map a city's columns, remapping only when rows were appended"""
+        row_count = self._row_count(city_key)
+        cached_mapping = self._mapped_columns.get(city_key)
+        if cached_mapping is not None and cached_mapping[0] == row_count:
+            return cached_mapping[1]
+
+        if row_count == 0:
+            columns = {column_name: np.empty(0, dtype=column_dtype) for column_name, column_dtype in HISTORY_COLUMNS}
+        else:
+            columns = {
+                column_name: np.memmap(self._column_path(city_key, column_name), dtype=column_dtype,
+                                       mode="r", shape=(row_count,))
+                for column_name, column_dtype in HISTORY_COLUMNS
+            }
+        self._mapped_columns[city_key] = (row_count, columns)
+        return columns
+
+    def query_range(self, city_name: str, country_code: str = "",
+                    start_time: float = float("-inf"), end_time: float = float("inf")) -> Dict[str, np.ndarray]:
+        """
+        Get every reading of a city in [start_time, end_time)
+
+        Args:
+            city_name (str): City name
+            country_code (str): Country code the city was stored with
+            start_time (float): Inclusive start in epoch seconds
+            end_time (float): Exclusive end in epoch seconds
+
+        Returns:
+            Dict: Column name -> read-only array view of the matching rows
+        """
+        columns = self._load_columns(self.city_key(city_name, country_code))
+        timestamps = columns["timestamp"]
+        first_row, last_row = np.searchsorted(timestamps, [start_time, end_time], side="left")
+        return {column_name: column_values[first_row:last_row] for column_name, column_values in columns.items()}
+
+    def downsample(self, city_name: str, country_code: str = "", bucket_seconds: float = 3600,
+                   start_time: float = float("-inf"), end_time: float = float("inf")) -> Dict[str, np.ndarray]:
+        """
+        Aggregate a city's readings into fixed-width time buckets
+
+        Args:
+            city_name (str): City name
+            country_code (str): Country code the city was stored with
+            bucket_seconds (float): Bucket width, e.g. 3600 for hourly
+            start_time (float): Inclusive start in epoch seconds
+            end_time (float): Exclusive end in epoch seconds
+
+        Returns:
+            Dict: "bucket_start" and "count" arrays plus "<column>_mean/_min/_max" for every value column
+        """
+        readings = self.query_range(city_name, country_code, start_time, end_time)
+        timestamps = readings["timestamp"]
+        if timestamps.size == 0:
+            empty_result = {"bucket_start": np.empty(0), "count": np.empty(0, dtype=np.int64)}
+            for column_name in VALUE_COLUMNS:
+                for aggregate_name in ("mean", "min", "max"):
+                    empty_result[f"{column_name}_{aggregate_name}"] = np.empty(0, dtype=np.float32)
+            return empty_result
+
+        # Rows are time-sorted, so each bucket is one contiguous run
+        bucket_ids = np.floor_divide(timestamps, bucket_seconds).astype(np.int64)
+        run_starts = np.flatnonzero(np.r_[True, bucket_ids[1:] != bucket_ids[:-1]])
+        row_counts = np.diff(np.r_[run_starts, timestamps.size])
+
+        aggregates = {"bucket_start": bucket_ids[run_starts] * float(bucket_seconds), "count": row_counts}
+        for column_name in VALUE_COLUMNS:
+            column_values = readings[column_name]
+            aggregates[f"{column_name}_mean"] = (
+                np.add.reduceat(column_values, run_starts, dtype=np.float64) / row_counts
+            ).astype(np.float32)
+            aggregates[f"{column_name}_min"] = np.minimum.reduceat(column_values, run_starts)
+            aggregates[f"{column_name}_max"] = np.maximum.reduceat(column_values, run_starts)
+        return aggregates
+
+    def list_cities(self) -> List[Dict]:
+        """List stored cities with their reading counts"""
+        stored_cities = []
+        for city_key in sorted(os.listdir(self.history_directory)):
+            metadata_path = os.path.join(self._city_directory(city_key), "city.json")
+            if not os.path.isfile(metadata_path):
+                continue
+            with open(metadata_path, encoding="utf-8") as metadata_file:
+                city_metadata = json.load(metadata_file)
+            city_metadata["readings"] = self._row_count(city_key)
+            stored_cities.append(city_metadata)
+        return stored_cities
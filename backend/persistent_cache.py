@@ -0,0 +1,191 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+weather_logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS weather_responses (
+    cache_key TEXT PRIMARY KEY,
+    payload TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    payload_bytes INTEGER NOT NULL
+)
+"""
+
+# Keep the newest rows whose running size fits the budget
+_EVICT_OVER_SIZE = """
+DELETE FROM weather_responses WHERE cache_key IN (
+    SELECT cache_key FROM (
+        SELECT cache_key, SUM(payload_bytes) OVER (ORDER BY fetched_at DESC, cache_key) AS running_bytes
+        FROM weather_responses
+    ) WHERE running_bytes > ?
+)
+"""
+
+
+class PersistentResponseCache:
+    """
+    On-disk store of raw API payloads with their fetch times, kept across restarts
+
+    Backs the in-memory WeatherResponseCache: a restart starts warm, and while
+    the API is unreachable the last good payload for a city can still be served.
+    The database runs in WAL mode, so readers on other threads never wait for
+    a writer. Each thread uses its own connection.
+    """
+
+    def __init__(self, database_path: str, max_age_seconds: float, max_bytes: int,
+                 evict_every_writes: int = 100):
+        """
+        Args:
+            database_path (str): SQLite file, created with its directory if missing
+            max_age_seconds (float): Payloads fetched longer ago than this are dropped
+            max_bytes (int): Total payload size kept; the oldest payloads go first
+            evict_every_writes (int): Writes between eviction passes
+        """
+        self.database_path = database_path
+        self.max_age_seconds = max_age_seconds
+        self.max_bytes = max_bytes
+        self.evict_every_writes = evict_every_writes
+
+        database_directory = os.path.dirname(database_path)
+        if database_directory:
+            os.makedirs(database_directory, exist_ok=True)
+
+        self._thread_connections = threading.local()
+        self._all_connections: List[sqlite3.Connection] = []
+        self._counters_lock = threading.Lock()
+        self._writes_since_eviction = 0
+
+        # Counters exposed through get_stats()
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+
+        with self._connection() as connection:
+            connection.execute(_SCHEMA)
+        self.evict()
+
+    def _connection(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening it on first use"""
+        connection = getattr(self._thread_connections, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.database_path, timeout=5.0, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            # With WAL, NORMAL only syncs at checkpoints; a crash can lose the last few payloads, never corrupt
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._thread_connections.connection = connection
+            with self._counters_lock:
+                self._all_connections.append(connection)
+        return connection
+
+    def load(self, cache_key: str) -> Tuple[Optional[Dict], Optional[float]]:
+        """
+        Load the last stored payload for a key
+
+        Args:
+            cache_key (str): Key built with build_weather_cache_key
+
+        Returns:
+            Tuple: (raw payload, seconds since it was fetched) - both None on a miss
+        """
+        try:
+            stored_row = self._connection().execute(
+                "SELECT payload, fetched_at FROM weather_responses WHERE cache_key = ?", (cache_key,)
+            ).fetchone()
+        except sqlite3.Error as database_error:
+            weather_logger.error(f"Error reading persistent cache: {database_error}")
+            stored_row = None
+
+        with self._counters_lock:
+            if stored_row is None:
+                self.misses += 1
+                return None, None
+            self.hits += 1
+        payload_text, fetched_at = stored_row
+        return json.loads(payload_text), max(0.0, time.time() - fetched_at)
+
+    def store(self, cache_key: str, raw_payload: Dict, fetched_at: Optional[float] = None):
+        """
+        Store a raw payload, replacing the previous one for the key
+
+        Args:
+            cache_key (str): Key built with build_weather_cache_key
+            raw_payload (Dict): API response exactly as received
+            fetched_at (float): Unix time of the fetch, now if omitted
+        """
+        payload_text = json.dumps(raw_payload, separators=(",", ":"))
+        try:
+            with self._connection() as connection:
+                connection.execute(
+                    "INSERT OR REPLACE INTO weather_responses (cache_key, payload, fetched_at, payload_bytes) "
+                    "VALUES (?, ?, ?, ?)",
+                    (cache_key, payload_text, fetched_at if fetched_at is not None else time.time(),
+                     len(payload_text))
+                )
+        except sqlite3.Error as database_error:
+            weather_logger.error(f"Error writing persistent cache: {database_error}")
+            return
+
+        with self._counters_lock:
+            self.writes += 1
+            self._writes_since_eviction += 1
+            run_eviction = self._writes_since_eviction >= self.evict_every_writes
+            if run_eviction:
+                self._writes_since_eviction = 0
+        if run_eviction:
+            self.evict()
+
+    def evict(self) -> int:
+        """
+        Drop payloads older than max_age_seconds, then the oldest until under max_bytes
+
+        Returns:
+            int: Number of payloads removed
+        """
+        try:
+            with self._connection() as connection:
+                removed_rows = connection.execute(
+                    "DELETE FROM weather_responses WHERE fetched_at < ?", (time.time() - self.max_age_seconds,)
+                ).rowcount
+                removed_rows += connection.execute(_EVICT_OVER_SIZE, (self.max_bytes,)).rowcount
+        except sqlite3.Error as database_error:
+            weather_logger.error(f"Error evicting persistent cache: {database_error}")
+            return 0
+
+        with self._counters_lock:
+            self.evictions += removed_rows
+        return removed_rows
+
+    def get_stats(self) -> Dict:
+        """Return entry count, stored bytes and hit/miss/write/eviction counters"""
+        try:
+            entry_count, stored_bytes = self._connection().execute(
+                "SELECT COUNT(*), COALESCE(SUM(payload_bytes), 0) FROM weather_responses"
+            ).fetchone()
+        except sqlite3.Error:
+            entry_count, stored_bytes = None, None
+        with self._counters_lock:
+            return {
+                "entries": entry_count,
+                "stored_bytes": stored_bytes,
+                "max_bytes": self.max_bytes,
+                "max_age_seconds": self.max_age_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "writes": self.writes,
+                "evictions": self.evictions,
+            }
+
+    def close(self):
+        """Close every thread's connection"""
+        with self._counters_lock:
+            connections, self._all_connections = self._all_connections, []
+        for connection in connections:
+            connection.close()
+        self._thread_connections = threading.local()
@@ -0,0 +1,361 @@
+import heapq
+import itertools
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Dict, Iterable, List, Optional
+
+from config.settings import (
+    REFRESH_CALLS_PER_MINUTE, REFRESH_BURST_CAPACITY, REFRESH_USER_RESERVED_TOKENS,
+    REFRESH_INTERVAL_SECONDS, REFRESH_WORKERS, HTTP_MAX_RETRIES, HTTP_BACKOFF_FACTOR
+)
+
+weather_logger = logging.getLogger(__name__)
+
+USER_PRIORITY = 0
+BACKGROUND_PRIORITY = 1
+
+
+class TokenBucket:
+    """Thread-safe token bucket enforcing an API call budget"""
+
+    def __init__(self, calls_per_minute: float = REFRESH_CALLS_PER_MINUTE,
+                 burst_capacity: int = REFRESH_BURST_CAPACITY):
+        self.calls_per_minute = calls_per_minute
+        self.burst_capacity = burst_capacity
+        self._refill_per_second = calls_per_minute / 60.0
+        self._tokens = float(burst_capacity)
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+        self.calls_granted = 0
+        self._recent_grants = deque()  # monotonic times of grants in the last minute
+
+    def _refill(self, now: float):
+        self._tokens = min(self.burst_capacity, self._tokens + (now - self._last_refill) * self._refill_per_second)
+        self._last_refill = now
+
+    def try_acquire(self, reserve: int = 0) -> bool:
+        """
+        Take one token if more than `reserve` tokens would remain available
+
+        Args:
+            reserve (int): Tokens to leave for higher-priority callers
+
+        Returns:
+            bool: True if the call may be made now
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            if self._tokens < reserve + 1:
+                return False
+            self._tokens -= 1
+            self.calls_granted += 1
+            self._recent_grants.append(now)
+            return True
+
+    def seconds_until_available(self, reserve: int = 0) -> float:
+        """Time until try_acquire(reserve) can succeed"""
+        with self._lock:
+            self._refill(time.monotonic())
+            missing_tokens = reserve + 1 - self._tokens
+            return max(0.0, missing_tokens / self._refill_per_second)
+
+    def acquire(self, reserve: int = 0):
+        """Block until a token is available and take it"""
+        while not self.try_acquire(reserve):
+            time.sleep(self.seconds_until_available(reserve))
+
+    def get_stats(self) -> Dict:
+        """Return tokens left and how much of the per-minute budget was used"""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            while self._recent_grants and now - self._recent_grants[0] >= 60:
+                self._recent_grants.popleft()
+            return {
+                "calls_per_minute": self.calls_per_minute,
+                "burst_capacity": self.burst_capacity,
+                "tokens_available": round(self._tokens, 2),
+                "calls_granted": self.calls_granted,
+                "calls_last_minute": len(self._recent_grants),
+                "budget_used_fraction": len(self._recent_grants) / self.calls_per_minute,
+            }
+
+
+class _ScheduledLookup:
+    """One queued API lookup; ordered by priority, then due time, then arrival"""
+
+    __slots__ = ("sort_key", "city_name", "result_future", "attempt")
+
+    def __init__(self, priority: int, due_time: float, sequence: int, city_name: str,
+                 result_future: Optional[Future], attempt: int = 0):
+        self.sort_key = (priority, due_time, sequence)
+        self.city_name = city_name
+        self.result_future = result_future
+        self.attempt = attempt
+
+    def __lt__(self, other: "_ScheduledLookup") -> bool:
+        return self.sort_key < other.sort_key
+
+
+class RefreshScheduler:
+    """
+    Keeps watched cities warm in a WeatherDataService's cache within an API call budget
+
+    Watched cities are refreshed every refresh interval, staggered so their calls
+    spread out instead of arriving together. User lookups submitted through
+    submit_user_lookup jump ahead of every background refresh, and background
+    refreshes never spend the last `user_reserved_tokens` tokens of the budget.
+
+    Failed lookups are retried through the queue with exponential backoff, so
+    every attempt spends a token. Give the scheduler a service created with
+    max_retries=0: retries inside its HTTP transport would not be charged.
+    """
+
+    def __init__(self, weather_service, call_budget: Optional[TokenBucket] = None,
+                 refresh_interval_seconds: float = REFRESH_INTERVAL_SECONDS,
+                 worker_count: int = REFRESH_WORKERS,
+                 user_reserved_tokens: int = REFRESH_USER_RESERVED_TOKENS,
+                 max_retries: int = HTTP_MAX_RETRIES,
+                 backoff_factor: float = HTTP_BACKOFF_FACTOR):
+        self.weather_service = weather_service
+        # Share one bucket with every other caller of the same API key
+        self.call_budget = call_budget or TokenBucket()
+        self.refresh_interval_seconds = refresh_interval_seconds
+        self.worker_count = worker_count
+        # A reserve as large as the bucket would starve background refreshes forever
+        self.user_reserved_tokens = min(user_reserved_tokens, max(0, self.call_budget.burst_capacity - 1))
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+
+        self._queue: List[_ScheduledLookup] = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._watched_cities: Dict[str, str] = {}  # cache key -> city name
+        self._worker_threads: List[threading.Thread] = []
+        self._running = False
+
+        self.lookups_in_flight = 0
+        self.refreshes_completed = 0
+        self.refreshes_skipped = 0
+        self.refreshes_failed = 0
+        self.lookups_retried = 0
+        self.user_lookups = 0
+
+    def _cache_key(self, city_name: str) -> str:
+        # Same key the service stores under (by city ID when it has a city index)
+        return self.weather_service.weather_cache_key(city_name)
+
+    def _enqueue(self, priority: int, due_time: float, city_name: str,
+                 result_future: Optional[Future] = None, attempt: int = 0):
+        """Queue a lookup; the caller holds the condition"""
+        heapq.heappush(self._queue, _ScheduledLookup(priority, due_time, next(self._sequence),
+                                                     city_name, result_future, attempt))
+        self._condition.notify()
+
+    def watch_cities(self, city_names: Iterable[str]):
+        """
+        Start keeping cities warm, staggering their refreshes so calls never bunch up
+
+        Args:
+            city_names (Iterable[str]): Cities to refresh in the background
+        """
+        with self._condition:
+            new_cities = []
+            for city_name in city_names:
+                cache_key = self._cache_key(city_name)
+                if cache_key not in self._watched_cities:
+                    self._watched_cities[cache_key] = city_name
+                    new_cities.append(city_name)
+            if not new_cities:
+                return
+
+            # One call per budget period keeps warm-up fast without bursting; each city then keeps its offset
+            stagger_seconds = min(self.refresh_interval_seconds / len(new_cities),
+                                  60.0 / self.call_budget.calls_per_minute)
+            now = time.monotonic()
+            for city_index, city_name in enumerate(new_cities):
+                self._enqueue(BACKGROUND_PRIORITY, now + city_index * stagger_seconds, city_name)
+
+    def watch_city(self, city_name: str):
+        """Start keeping one city warm"""
+        self.watch_cities([city_name])
+
+    def unwatch_city(self, city_name: str):
+        """Stop refreshing a city; an already queued refresh is dropped when it comes up"""
+        with self._condition:
+            self._watched_cities.pop(self._cache_key(city_name), None)
+
+    def submit_user_lookup(self, city_name: str) -> Future:
+        """
+        Look up a city on behalf of a user, ahead of every background refresh
+
+        Args:
+            city_name (str): Name of the city
+
+        Returns:
+            Future: Resolves to the WeatherObservation or None
+        """
+        cached_info, is_fresh = self.weather_service.response_cache.lookup(self._cache_key(city_name))
+        result_future = Future()
+        if cached_info is not None and is_fresh:
+            result_future.set_result(cached_info)
+            return result_future
+
+        with self._condition:
+            self.user_lookups += 1
+            self._enqueue(USER_PRIORITY, time.monotonic(), city_name, result_future)
+        return result_future
+
+    def start(self) -> "RefreshScheduler":
+        """Start the worker threads"""
+        with self._condition:
+            if self._running:
+                return self
+            self._running = True
+        for worker_number in range(self.worker_count):
+            worker_thread = threading.Thread(target=self._run_worker, name=f"weather-refresh-{worker_number}",
+                                             daemon=True)
+            worker_thread.start()
+            self._worker_threads.append(worker_thread)
+        return self
+
+    def stop(self, timeout: Optional[float] = None):
+        """Stop the workers after their current lookup; queued user lookups are cancelled"""
+        with self._condition:
+            self._running = False
+            for scheduled_lookup in self._queue:
+                # A lookup waiting for a retry is already running and can no longer be cancelled
+                if scheduled_lookup.result_future is not None and not scheduled_lookup.result_future.cancel():
+                    scheduled_lookup.result_future.set_result(None)
+            self._queue.clear()
+            self._condition.notify_all()
+        for worker_thread in self._worker_threads:
+            worker_thread.join(timeout)
+        self._worker_threads.clear()
+
+    def _next_lookup(self) -> Optional[_ScheduledLookup]:
+        """Wait until the head of the queue is due and within budget, then pop it"""
+        with self._condition:
+            while self._running:
+                if not self._queue:
+                    self._condition.wait()
+                    continue
+
+                next_lookup = self._queue[0]
+                priority, due_time, _ = next_lookup.sort_key
+                wait_seconds = due_time - time.monotonic()
+                if wait_seconds > 0:
+                    self._condition.wait(wait_seconds)
+                    continue
+
+                if priority == BACKGROUND_PRIORITY:
+                    cache_key = self._cache_key(next_lookup.city_name)
+                    if cache_key not in self._watched_cities:
+                        heapq.heappop(self._queue)
+                        continue
+                    # Someone else (e.g. a user search) refreshed it recently: push the refresh back
+                    entry_age = self.weather_service.response_cache.entry_age(cache_key)
+                    if entry_age is not None and entry_age < self.refresh_interval_seconds:
+                        heapq.heapreplace(self._queue, _ScheduledLookup(
+                            BACKGROUND_PRIORITY, time.monotonic() + self.refresh_interval_seconds - entry_age,
+                            next(self._sequence), next_lookup.city_name, None
+                        ))
+                        self.refreshes_skipped += 1
+                        continue
+
+                reserve = 0 if priority == USER_PRIORITY else self.user_reserved_tokens
+                if not self.call_budget.try_acquire(reserve):
+                    # Also woken early when a user lookup arrives
+                    self._condition.wait(max(0.01, self.call_budget.seconds_until_available(reserve)))
+                    continue
+
+                heapq.heappop(self._queue)
+                self.lookups_in_flight += 1
+                return next_lookup
+        return None
+
+    def _run_worker(self):
+        while True:
+            scheduled_lookup = self._next_lookup()
+            if scheduled_lookup is None:
+                return
+            try:
+                self._run_lookup(scheduled_lookup)
+            finally:
+                with self._condition:
+                    self.lookups_in_flight -= 1
+
+    def _run_lookup(self, scheduled_lookup: _ScheduledLookup):
+        """Fetch a city into the service cache and reschedule it if it is watched"""
+        result_future = scheduled_lookup.result_future
+        if (result_future is not None and scheduled_lookup.attempt == 0
+                and not result_future.set_running_or_notify_cancel()):
+            return
+
+        weather_info = None
+        try:
+            weather_info = self.weather_service.refresh_weather_info(scheduled_lookup.city_name)
+        except Exception as lookup_error:
+            weather_logger.error(f"Lookup of {scheduled_lookup.city_name} failed: {lookup_error}")
+            if result_future is not None:
+                result_future.set_exception(lookup_error)
+        else:
+            if weather_info is None and self._retry_later(scheduled_lookup):
+                return
+            if result_future is not None:
+                result_future.set_result(weather_info)
+
+        if result_future is not None:
+            return
+        with self._condition:
+            if weather_info is None:
+                self.refreshes_failed += 1
+            else:
+                self.refreshes_completed += 1
+            if self._cache_key(scheduled_lookup.city_name) in self._watched_cities:
+                self._enqueue(BACKGROUND_PRIORITY, time.monotonic() + self.refresh_interval_seconds,
+                              scheduled_lookup.city_name)
+
+    def _retry_later(self, scheduled_lookup: _ScheduledLookup) -> bool:
+        """Requeue a failed lookup after a backoff, like the transport would; False once retries run out"""
+        if scheduled_lookup.attempt >= self.max_retries:
+            return False
+        priority = scheduled_lookup.sort_key[0]
+        retry_delay = self.backoff_factor * (2 ** scheduled_lookup.attempt)
+        with self._condition:
+            if not self._running:
+                return False
+            self._enqueue(priority, time.monotonic() + retry_delay, scheduled_lookup.city_name,
+                          scheduled_lookup.result_future, scheduled_lookup.attempt + 1)
+            self.lookups_retried += 1
+        return True
+
+    def get_stats(self) -> Dict:
+        """
+        Get queue depth, refresh counters and budget usage
+
+        Returns:
+            Dict: Queued user lookups and background refreshes, watched cities,
+                  refresh outcomes and the call budget's stats
+        """
+        with self._condition:
+            queued_user_lookups = sum(1 for lookup in self._queue if lookup.sort_key[0] == USER_PRIORITY)
+            scheduler_stats = {
+                "queue_depth": len(self._queue),
+                "queued_user_lookups": queued_user_lookups,
+                "queued_refreshes": len(self._queue) - queued_user_lookups,
+                "lookups_in_flight": self.lookups_in_flight,
+                "watched_cities": len(self._watched_cities),
+                "refreshes_completed": self.refreshes_completed,
+                "refreshes_skipped": self.refreshes_skipped,
+                "refreshes_failed": self.refreshes_failed,
+                "lookups_retried": self.lookups_retried,
+                "user_lookups": self.user_lookups,
+            }
+        scheduler_stats["budget"] = self.call_budget.get_stats()
+        return scheduler_stats
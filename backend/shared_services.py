@@ -0,0 +1,168 @@
+import os
+import threading
+from typing import Dict
+
+# Setup project path for imports
+from utils.path_helper import setup_project_path
+setup_project_path()
+
+# Process-wide instances shared by every UI session; heavy modules are imported on first use
+_shared_services_lock = threading.RLock()
+_shared_weather_service = None
+_shared_chart_engine = None
+_shared_refresh_scheduler = None
+_shared_backing_stores = None
+_shared_city_index = None
+_shared_city_index_loaded = False
+
+
+def _get_shared_backing_stores() -> Dict:
+    """Response caches, API call budget and history store used by every shared service"""
+    global _shared_backing_stores
+    with _shared_services_lock:
+        if _shared_backing_stores is None:
+            from config.settings import (
+                WEATHER_CACHE_TTL_SECONDS, WEATHER_CACHE_MAX_ENTRIES, HISTORY_ENABLED, HISTORY_DIRECTORY,
+                PERSISTENT_CACHE_ENABLED, PERSISTENT_CACHE_PATH, PERSISTENT_CACHE_MAX_AGE_SECONDS,
+                PERSISTENT_CACHE_MAX_BYTES
+            )
+            from backend.refresh_scheduler import TokenBucket
+            from backend.weather_cache import WeatherResponseCache
+            history_store = None
+            if HISTORY_ENABLED:
+                from backend.observation_store import ObservationHistoryStore
+                history_store = ObservationHistoryStore(HISTORY_DIRECTORY)
+            persistent_cache = None
+            if PERSISTENT_CACHE_ENABLED:
+                from backend.persistent_cache import PersistentResponseCache
+                persistent_cache = PersistentResponseCache(
+                    PERSISTENT_CACHE_PATH, PERSISTENT_CACHE_MAX_AGE_SECONDS, PERSISTENT_CACHE_MAX_BYTES
+                )
+            _shared_backing_stores = {
+                "response_cache": WeatherResponseCache(WEATHER_CACHE_TTL_SECONDS, WEATHER_CACHE_MAX_ENTRIES),
+                "call_budget": TokenBucket(),
+                "history_store": history_store,
+                "persistent_cache": persistent_cache,
+            }
+        return _shared_backing_stores
+
+
+def get_shared_weather_service():
+    """
+    Get the process-wide async weather service
+
+    All sessions share its response cache, connection pool, request
+    coalescing and API call budget. It is bound to the event loop that first uses it, which is the
+    single loop Flet runs every session's handlers on.
+
+    Returns:
+        AsyncWeatherDataService: Service shared by every session
+    """
+    global _shared_weather_service
+    if _shared_weather_service is None:
+        with _shared_services_lock:
+            if _shared_weather_service is None:
+                from backend.async_weather_service import AsyncWeatherDataService
+                backing_stores = _get_shared_backing_stores()
+                _shared_weather_service = AsyncWeatherDataService(
+                    response_cache=backing_stores["response_cache"],
+                    history_store=backing_stores["history_store"],
+                    call_budget=backing_stores["call_budget"],
+                    persistent_cache=backing_stores["persistent_cache"]
+                )
+    return _shared_weather_service
+
+
+def peek_shared_weather_service():
+    """Return the weather service if it has been created, without creating it"""
+    return _shared_weather_service
+
+
+def get_shared_chart_engine():
+    """
+    Get the process-wide chart rendering pool
+
+    Returns:
+        ChartRenderingEngine: Engine (and chart cache) shared by every session
+    """
+    global _shared_chart_engine
+    if _shared_chart_engine is None:
+        with _shared_services_lock:
+            if _shared_chart_engine is None:
+                from backend.chart_generator import ChartRenderingEngine
+                _shared_chart_engine = ChartRenderingEngine()
+    return _shared_chart_engine
+
+
+def peek_shared_chart_engine():
+    """Return the chart engine if it has been created, without creating it"""
+    return _shared_chart_engine
+
+
+def get_shared_city_index():
+    """
+    Get the process-wide city index, loading CITY_LIST_PATH on first use
+
+    Returns:
+        CityIndex: Index of the city list, or None when the file is not installed
+    """
+    global _shared_city_index, _shared_city_index_loaded
+    if not _shared_city_index_loaded:
+        with _shared_services_lock:
+            if not _shared_city_index_loaded:
+                from config.settings import CITY_LIST_PATH
+                if os.path.exists(CITY_LIST_PATH):
+                    from backend.city_index import CityIndex
+                    _shared_city_index = CityIndex.from_file(CITY_LIST_PATH)
+                _shared_city_index_loaded = True
+    return _shared_city_index
+
+
+def peek_shared_city_index():
+    """Return the city index if it has finished loading, without waiting for it"""
+    return _shared_city_index
+
+
+def get_shared_refresh_scheduler():
+    """
+    Get the process-wide background refresh scheduler, started on first use
+
+    It refreshes into the same response cache the shared weather service reads
+    from and spends the same API call budget, so searches keep priority.
+
+    Returns:
+        RefreshScheduler: Scheduler watching the cities listed in WATCHED_CITIES
+    """
+    global _shared_refresh_scheduler
+    if _shared_refresh_scheduler is None:
+        with _shared_services_lock:
+            if _shared_refresh_scheduler is None:
+                from config.settings import WATCHED_CITIES
+                from backend.refresh_scheduler import RefreshScheduler
+                from backend.weather_service import WeatherDataService
+                backing_stores = _get_shared_backing_stores()
+                # The scheduler retries failed refreshes itself, spending a token per attempt
+                refresh_service = WeatherDataService(
+                    max_retries=0,
+                    response_cache=backing_stores["response_cache"],
+                    history_store=backing_stores["history_store"],
+                    city_index=get_shared_city_index(),
+                    persistent_cache=backing_stores["persistent_cache"]
+                )
+                _shared_refresh_scheduler = RefreshScheduler(refresh_service, backing_stores["call_budget"]).start()
+                _shared_refresh_scheduler.watch_cities(WATCHED_CITIES)
+    return _shared_refresh_scheduler
+
+
+def get_shared_service_stats() -> Dict:
+    """
+    Get counters of the shared services created so far
+
+    Returns:
+        Dict: "weather", "charts" and "refresh" stats, None for a service not created yet
+    """
+    return {
+        "weather": _shared_weather_service.get_service_stats() if _shared_weather_service is not None else None,
+        "charts": _shared_chart_engine.get_stats() if _shared_chart_engine is not None else None,
+        "refresh": _shared_refresh_scheduler.get_stats() if _shared_refresh_scheduler is not None else None,
+    }
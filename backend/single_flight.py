@@ -0,0 +1,172 @@
+import asyncio
+import threading
+from concurrent.futures import CancelledError, Future
+from typing import Any, Awaitable, Callable, Dict
+
+
+class _InFlightCall:
+    """State shared by the caller running a call and the callers waiting on it"""
+
+    __slots__ = ("finished", "result", "error")
+
+    def __init__(self):
+        self.finished = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlightGroup:
+    """
+    Coalesces concurrent calls with the same key into one execution
+
+    The first caller for a key runs the work; callers arriving while it is in
+    flight wait and receive the same result (or exception).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._in_flight: Dict[str, Any] = {}
+
+        self.executions = 0
+        self.coalesced_waiters = 0
+
+    def do(self, key: str, work: Callable, *args) -> Any:
+        """
+        Run work(*args) once for all concurrent callers with the same key
+
+        Args:
+            key (str): Identifies identical requests
+            work (Callable): Function doing the actual fetch or render
+
+        Returns:
+            Any: The shared result
+        """
+        with self._lock:
+            in_flight_call = self._in_flight.get(key)
+            if in_flight_call is not None:
+                self.coalesced_waiters += 1
+                is_leader = False
+            else:
+                in_flight_call = _InFlightCall()
+                self._in_flight[key] = in_flight_call
+                self.executions += 1
+                is_leader = True
+
+        if not is_leader:
+            in_flight_call.finished.wait()
+            if in_flight_call.error is not None:
+                raise in_flight_call.error
+            return in_flight_call.result
+
+        try:
+            in_flight_call.result = work(*args)
+            return in_flight_call.result
+        except BaseException as work_error:
+            in_flight_call.error = work_error
+            raise
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+            in_flight_call.finished.set()
+
+    def share_future(self, key: str, start_work: Callable[[], Future]) -> Future:
+        """
+        Attach to the in-flight future for a key, or start one with start_work()
+
+        Each caller gets its own future mirroring the shared one, so a caller
+        cancelling its future does not cancel the work for everyone else.
+
+        Args:
+            key (str): Identifies identical requests
+            start_work (Callable): Submits the work and returns its future
+
+        Returns:
+            Future: Resolves with the shared work's result
+        """
+        with self._lock:
+            shared_future = self._in_flight.get(key)
+            if shared_future is not None:
+                self.coalesced_waiters += 1
+                return _mirror_future(shared_future)
+            shared_future = start_work()
+            self._in_flight[key] = shared_future
+            self.executions += 1
+
+        # Registered outside the lock: an already finished future runs the callback immediately
+        shared_future.add_done_callback(lambda _: self._forget_future(key, shared_future))
+        return _mirror_future(shared_future)
+
+    def _forget_future(self, key: str, shared_future: Future):
+        with self._lock:
+            if self._in_flight.get(key) is shared_future:
+                del self._in_flight[key]
+
+    def get_stats(self) -> Dict:
+        """Return execution and coalesced-waiter counts"""
+        with self._lock:
+            return {
+                "in_flight": len(self._in_flight),
+                "executions": self.executions,
+                "coalesced_waiters": self.coalesced_waiters,
+            }
+
+
+def _mirror_future(shared_future: Future) -> Future:
+    """Return a new future that completes the same way as shared_future"""
+    caller_future = Future()
+
+    def copy_outcome(finished_future: Future):
+        if not caller_future.set_running_or_notify_cancel():
+            return
+        if finished_future.cancelled():
+            caller_future.set_exception(CancelledError())
+        elif finished_future.exception() is not None:
+            caller_future.set_exception(finished_future.exception())
+        else:
+            caller_future.set_result(finished_future.result())
+
+    shared_future.add_done_callback(copy_outcome)
+    return caller_future
+
+
+class AsyncSingleFlightGroup:
+    """asyncio counterpart of SingleFlightGroup for coroutine work on one event loop"""
+
+    def __init__(self):
+        self._in_flight: Dict[str, asyncio.Task] = {}
+
+        self.executions = 0
+        self.coalesced_waiters = 0
+
+    async def do(self, key: str, start_work: Callable[[], Awaitable]) -> Any:
+        """
+        Await start_work() once for all concurrent callers with the same key
+
+        The shared work runs as its own task, so cancelling one caller (e.g. a
+        superseded search) does not cancel it for the others.
+
+        Args:
+            key (str): Identifies identical requests
+            start_work (Callable): Returns the coroutine doing the actual work
+
+        Returns:
+            Any: The shared result
+        """
+        shared_task = self._in_flight.get(key)
+        if shared_task is not None:
+            self.coalesced_waiters += 1
+        else:
+            shared_task = asyncio.ensure_future(start_work())
+            self._in_flight[key] = shared_task
+            self.executions += 1
+            shared_task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+
+        return await asyncio.shield(shared_task)
+
+    def get_stats(self) -> Dict:
+        """Return execution and coalesced-waiter counts"""
+        return {
+            "in_flight": len(self._in_flight),
+            "executions": self.executions,
+            "coalesced_waiters": self.coalesced_waiters,
+        }
@@ -0,0 +1,105 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+
+def build_weather_cache_key(city_name: str, units: str) -> str:
+    """
+    Build a normalized cache key for a city lookup
+
+    Args:
+        city_name (str): City name as typed by the user
+        units (str): Units the reading is requested in
+
+    Returns:
+        str: Key that ignores case and surrounding/duplicate whitespace
+    """
+    normalized_city = " ".join(str(city_name).split()).casefold()
+    return f"{normalized_city}|{units}"
+
+
+class WeatherResponseCache:
+    """Thread-safe in-process TTL cache with LRU eviction"""
+
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Counters exposed through get_stats()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def lookup(self, cache_key: str) -> Tuple[Optional[Any], bool]:
+        """
+        Look up a cached value
+
+        Args:
+            cache_key (str): Key built with build_weather_cache_key
+
+        Returns:
+            Tuple: (value, is_fresh) - value is None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is None:
+                self.misses += 1
+                return None, False
+
+            stored_at, value = entry
+            self._entries.move_to_end(cache_key)
+            if time.monotonic() - stored_at < self.ttl_seconds:
+                self.hits += 1
+                return value, True
+
+            self.stale_hits += 1
+            return value, False
+
+    def store(self, cache_key: str, value: Any, age_seconds: float = 0.0):
+        """
+        Store a value, evicting the least recently used entries if full
+
+        Args:
+            cache_key (str): Key built with build_weather_cache_key
+            value (Any): Value to cache
+            age_seconds (float): How long ago the value was fetched (e.g. when restored from disk)
+        """
+        with self._lock:
+            self._entries[cache_key] = (time.monotonic() - age_seconds, value)
+            self._entries.move_to_end(cache_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def entry_age(self, cache_key: str) -> Optional[float]:
+        """Seconds since a key was stored, or None if absent (does not touch counters or LRU order)"""
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            return None if entry is None else time.monotonic() - entry[0]
+
+    def invalidate(self, cache_key: str):
+        """Drop a single entry from the cache"""
+        with self._lock:
+            self._entries.pop(cache_key, None)
+
+    def clear(self):
+        """Drop every cached entry"""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict:
+        """Return a snapshot of the cache counters"""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
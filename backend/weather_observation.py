@@ -0,0 +1,156 @@
+from collections.abc import Mapping
+from types import MappingProxyType
+from typing import Any, Dict, Iterator, Optional
+
+# Shared stand-in for missing payload sections, so parsing allocates no throwaway dicts
+_EMPTY_SECTION = MappingProxyType({})
+
+
+FIELD_NAMES = (
+    "city_name",
+    "country_code",
+    "current_temperature",
+    "feels_like_temperature",
+    "humidity_percentage",
+    "atmospheric_pressure",
+    "wind_speed",
+    "weather_description",
+    "weather_main",
+    "visibility_meters",
+    "cloudiness_percentage",
+    "city_id",
+    "observation_timestamp",
+)
+_FIELD_INDEX = {field_name: index for index, field_name in enumerate(FIELD_NAMES)}
+
+
+def _field_property(field_index: int) -> property:
+    """Read-only attribute backed by one position of the values tuple"""
+    return property(lambda observation: observation._field_values[field_index])
+
+
+class WeatherObservation(Mapping):
+    """
+    Immutable, slotted record of one processed weather reading
+
+    Behaves as a read-only mapping with the same keys as the dict the service
+    used to return, so ``observation['city_name']`` keeps working everywhere.
+    All values live in a single tuple slot, which keeps construction to one
+    attribute store and the per-object footprint to one small tuple.
+    """
+
+    __slots__ = ("_field_values",)
+
+    # Fields that identify a reading but are not drawn on charts
+    NON_VISUAL_FIELDS = ("city_id", "observation_timestamp")
+
+    city_name = _field_property(0)
+    country_code = _field_property(1)
+    current_temperature = _field_property(2)
+    feels_like_temperature = _field_property(3)
+    humidity_percentage = _field_property(4)
+    atmospheric_pressure = _field_property(5)
+    wind_speed = _field_property(6)
+    weather_description = _field_property(7)
+    weather_main = _field_property(8)
+    visibility_meters = _field_property(9)
+    cloudiness_percentage = _field_property(10)
+    city_id = _field_property(11)
+    observation_timestamp = _field_property(12)
+
+    def __init__(self, city_name: str, country_code: str, current_temperature: float,
+                 feels_like_temperature: float, humidity_percentage: int, atmospheric_pressure: int,
+                 wind_speed: float, weather_description: str, weather_main: str,
+                 visibility_meters: int, cloudiness_percentage: int,
+                 city_id: Optional[int] = None, observation_timestamp: Optional[int] = None):
+        _set_field_values(self, (
+            city_name, country_code, current_temperature, feels_like_temperature,
+            humidity_percentage, atmospheric_pressure, wind_speed, weather_description,
+            weather_main, visibility_meters, cloudiness_percentage, city_id, observation_timestamp
+        ))
+
+    @classmethod
+    def _from_values(cls, field_values: tuple) -> "WeatherObservation":
+        """Build an observation from values in FIELD_NAMES order, skipping argument parsing"""
+        observation = _new_object(cls)
+        _set_field_values(observation, field_values)
+        return observation
+
+    @classmethod
+    def from_raw(cls, raw_weather_data: Dict) -> "WeatherObservation":
+        """
+        Extract an observation from an OpenWeatherMap current-weather payload in one pass
+
+        Args:
+            raw_weather_data (Dict): Raw API response data
+
+        Returns:
+            WeatherObservation: Processed weather reading
+        """
+        main_section = raw_weather_data.get("main") or _EMPTY_SECTION
+        conditions = raw_weather_data.get("weather")
+        first_condition = conditions[0] if conditions else _EMPTY_SECTION
+
+        return cls._from_values((
+            raw_weather_data.get("name", "Unknown"),
+            (raw_weather_data.get("sys") or _EMPTY_SECTION).get("country", ""),
+            round(main_section.get("temp", 0), 1),
+            round(main_section.get("feels_like", 0), 1),
+            main_section.get("humidity", 0),
+            main_section.get("pressure", 0),
+            (raw_weather_data.get("wind") or _EMPTY_SECTION).get("speed", 0),
+            first_condition.get("description", ""),
+            first_condition.get("main", ""),
+            raw_weather_data.get("visibility", 0),
+            (raw_weather_data.get("clouds") or _EMPTY_SECTION).get("all", 0),
+            raw_weather_data.get("id"),
+            raw_weather_data.get("dt"),
+        ))
+
+    def __setattr__(self, name: str, value: Any):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name: str):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __getitem__(self, field_name: str) -> Any:
+        return self._field_values[_FIELD_INDEX[field_name]]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(FIELD_NAMES)
+
+    def __len__(self) -> int:
+        return len(FIELD_NAMES)
+
+    def __contains__(self, field_name: Any) -> bool:
+        return field_name in _FIELD_INDEX
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, WeatherObservation):
+            return self._field_values == other._field_values
+        return Mapping.__eq__(self, other)
+
+    def __hash__(self) -> int:
+        return hash(self._field_values)
+
+    def __reduce__(self):
+        # The blocked __setattr__ needs an explicit recipe for pickling
+        return (type(self), self._field_values)
+
+    def __repr__(self) -> str:
+        return f"WeatherObservation(city_name={self.city_name!r}, country_code={self.country_code!r}, " \
+               f"current_temperature={self.current_temperature!r})"
+
+    def replace(self, **changed_fields) -> "WeatherObservation":
+        """Return a copy with some fields changed"""
+        field_values = self.to_dict()
+        field_values.update(changed_fields)
+        return type(self)(**field_values)
+
+    def to_dict(self) -> Dict:
+        """Return the observation as a plain dict (e.g. for JSON)"""
+        return dict(zip(FIELD_NAMES, self._field_values))
+
+
+_new_object = object.__new__
+_set_field_values = WeatherObservation._field_values.__set__
@@ -1,58 +1,206 @@
 import requests
 import logging
-from typing import Dict, Optional
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
 
 # Setup project path for imports
 from utils.path_helper import setup_project_path
 setup_project_path()
 
-from config.settings import OPENWEATHER_API_KEY, OPENWEATHER_BASE_URL, TEMPERATURE_UNIT
+from config.settings import (
+    OPENWEATHER_API_KEY, OPENWEATHER_BASE_URL, OPENWEATHER_GROUP_URL, OPENWEATHER_FORECAST_URL, TEMPERATURE_UNIT,
+    WEATHER_CACHE_TTL_SECONDS, WEATHER_CACHE_MAX_ENTRIES, WEATHER_CACHE_STALE_WHILE_REVALIDATE,
+    HTTP_POOL_CONNECTIONS, HTTP_POOL_MAXSIZE, HTTP_MAX_RETRIES, HTTP_BACKOFF_FACTOR, HTTP_TIMEOUT_SECONDS,
+    HTTP_MAX_RETRY_AFTER_SECONDS, BULK_FETCH_MAX_CONCURRENCY, GROUP_REQUEST_MAX_IDS, HISTORY_ENABLED, HISTORY_DIRECTORY,
+    PERSISTENT_CACHE_ENABLED, PERSISTENT_CACHE_PATH, PERSISTENT_CACHE_MAX_AGE_SECONDS, PERSISTENT_CACHE_MAX_BYTES
+)
+from backend.http_transport import PooledHttpTransport
+from backend.metrics import increment, timed
+from backend.single_flight import SingleFlightGroup
+from backend.weather_cache import WeatherResponseCache, build_weather_cache_key
+from backend.weather_observation import WeatherObservation
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 weather_logger = logging.getLogger(__name__)
 
+class WeatherLookup(NamedTuple):
+    """A looked-up reading and where it came from"""
+    
+    weather_info: Optional[WeatherObservation]
+    # True when the live fetch failed and the last stored reading was served instead
+    is_last_known: bool = False
+    # Seconds since the reading was fetched from the API (restored readings keep their original fetch time)
+    age_seconds: Optional[float] = None
+
+def last_known_age(cached_age: Optional[float], fetch_started: float) -> Optional[float]:
+    """Age of a cached reading at lookup time plus the time spent on the failed fetch"""
+    if cached_age is None:
+        return None
+    return cached_age + (time.monotonic() - fetch_started)
+
 class WeatherDataService:
     """Service class to handle weather data operations"""
     
-    def __init__(self):
+    def __init__(self, cache_ttl_seconds: float = WEATHER_CACHE_TTL_SECONDS,
+                 cache_max_entries: int = WEATHER_CACHE_MAX_ENTRIES,
+                 stale_while_revalidate: bool = WEATHER_CACHE_STALE_WHILE_REVALIDATE,
+                 pool_maxsize: int = HTTP_POOL_MAXSIZE,
+                 max_retries: int = HTTP_MAX_RETRIES,
+                 backoff_factor: float = HTTP_BACKOFF_FACTOR,
+                 history_store=None,
+                 response_cache: Optional[WeatherResponseCache] = None,
+                 city_index=None,
+                 persistent_cache=None):
         self.api_key = OPENWEATHER_API_KEY
         self.base_url = OPENWEATHER_BASE_URL
+        self.group_url = OPENWEATHER_GROUP_URL
+        self.forecast_url = OPENWEATHER_FORECAST_URL
         self.units = TEMPERATURE_UNIT
         
+        # Processed responses are cached per normalized city and units; pass a cache to share it
+        self.response_cache = response_cache or WeatherResponseCache(cache_ttl_seconds, cache_max_entries)
+        self.stale_while_revalidate = stale_while_revalidate
+        self._pending_refreshes = set()
+        self._pending_refreshes_lock = threading.Lock()
+        
+        # Concurrent misses for the same city share one upstream call
+        self.request_coalescer = SingleFlightGroup()
+        
+        # One pooled keep-alive session reused for every API call
+        self.http_transport = PooledHttpTransport(
+            pool_connections=HTTP_POOL_CONNECTIONS,
+            pool_maxsize=pool_maxsize,
+            max_retries=max_retries,
+            backoff_factor=backoff_factor,
+            timeout_seconds=HTTP_TIMEOUT_SECONDS,
+            max_retry_after_seconds=HTTP_MAX_RETRY_AFTER_SECONDS
+        )
+        
+        # Optional CityIndex: names are resolved to city IDs locally before any API call
+        self.city_index = city_index
+        
+        # Every fresh reading is appended to the local history store
+        self.history_store = history_store
+        if self.history_store is None and HISTORY_ENABLED:
+            from backend.observation_store import ObservationHistoryStore
+            self.history_store = ObservationHistoryStore(HISTORY_DIRECTORY)
+        
+        # Raw payloads are also kept on disk: restarts start warm and outages fall back to the last good reading
+        self.persistent_cache = persistent_cache
+        if self.persistent_cache is None and PERSISTENT_CACHE_ENABLED:
+            from backend.persistent_cache import PersistentResponseCache
+            self.persistent_cache = PersistentResponseCache(
+                PERSISTENT_CACHE_PATH, PERSISTENT_CACHE_MAX_AGE_SECONDS, PERSISTENT_CACHE_MAX_BYTES
+            )
+        
         # Validate API key is available
         if not self.api_key:
             raise ValueError("OpenWeatherMap API key is not configured. Please check your .env file.")
         
         weather_logger.info("Weather service initialized successfully")
     
-    def fetch_weather_data(self, city_name: str) -> Optional[Dict]:
+    def fetch_weather_data(self, city_name: str, city_id: Optional[int] = None) -> Optional[Dict]:
         """
         Fetch weather data from OpenWeatherMap API
         
         Args:
             city_name (str): Name of the city to get weather for
+            city_id (int): OpenWeatherMap city ID, queried instead of the name when given
             
         Returns:
             Dict: Weather data or None if request fails
         """
         try:
-            request_url = f"{self.base_url}?q={city_name}&appid={self.api_key}&units={self.units}"
+            request_params = {"appid": self.api_key, "units": self.units}
+            if city_id is not None:
+                request_params["id"] = city_id
+            else:
+                request_params["q"] = city_name
             
             weather_logger.info(f"Fetching weather data for: {city_name}")
-            api_response = requests.get(request_url, timeout=10)
+            api_response = self.http_transport.get(self.base_url, params=request_params)
             api_response.raise_for_status()
             
-            return api_response.json()
+            with timed("json_decode"):
+                return api_response.json()
             
         except requests.exceptions.RequestException as request_error:
             weather_logger.error(f"Error fetching weather data: {request_error}")
+            increment("api_failures")
             return None
         except Exception as general_error:
             weather_logger.error(f"Unexpected error: {general_error}")
             return None
     
-    def process_weather_information(self, raw_weather_data: Dict) -> Dict:
+    def fetch_weather_group_data(self, city_ids: List[int]) -> Optional[Dict]:
+        """
+        Fetch weather data for several cities in one group request
+        
+        Args:
+            city_ids (List[int]): OpenWeatherMap city IDs (at most GROUP_REQUEST_MAX_IDS)
+            
+        Returns:
+            Dict: Group response with a "list" of per-city payloads or None if request fails
+        """
+        try:
+            request_params = {
+                "id": ",".join(str(city_id) for city_id in city_ids),
+                "appid": self.api_key,
+                "units": self.units
+            }
+            
+            weather_logger.info(f"Fetching weather data for {len(city_ids)} city IDs")
+            api_response = self.http_transport.get(self.group_url, params=request_params)
+            api_response.raise_for_status()
+            
+            with timed("json_decode"):
+                return api_response.json()
+            
+        except requests.exceptions.RequestException as request_error:
+            weather_logger.error(f"Error fetching group weather data: {request_error}")
+            increment("api_failures")
+            return None
+        except Exception as general_error:
+            weather_logger.error(f"Unexpected error: {general_error}")
+            return None
+    
+    def fetch_forecast_data(self, city_name: str, city_id: Optional[int] = None) -> Optional[Dict]:
+        """
+        Fetch the 5-day/3-hour forecast from OpenWeatherMap API
+        
+        Args:
+            city_name (str): Name of the city to get the forecast for
+            city_id (int): OpenWeatherMap city ID, queried instead of the name when given
+            
+        Returns:
+            Dict: Forecast data with up to 40 slots in "list" or None if request fails
+        """
+        try:
+            request_params = {"appid": self.api_key, "units": self.units}
+            if city_id is not None:
+                request_params["id"] = city_id
+            else:
+                request_params["q"] = city_name
+            
+            weather_logger.info(f"Fetching forecast data for: {city_name}")
+            api_response = self.http_transport.get(self.forecast_url, params=request_params)
+            api_response.raise_for_status()
+            
+            with timed("json_decode"):
+                return api_response.json()
+            
+        except requests.exceptions.RequestException as request_error:
+            weather_logger.error(f"Error fetching forecast data: {request_error}")
+            increment("api_failures")
+            return None
+        except Exception as general_error:
+            weather_logger.error(f"Unexpected error: {general_error}")
+            return None
+    
+    def process_weather_information(self, raw_weather_data: Dict) -> Optional[WeatherObservation]:
         """
         Process raw weather data into a clean format
         
@@ -60,41 +208,419 @@ class WeatherDataService:
             raw_weather_data (Dict): Raw API response data
             
         Returns:
-            Dict: Processed weather information
+            WeatherObservation: Processed weather information or None if the payload is malformed
         """
         try:
-            processed_data = {
-                "city_name": raw_weather_data.get("name", "Unknown"),
-                "country_code": raw_weather_data.get("sys", {}).get("country", ""),
-                "current_temperature": round(raw_weather_data.get("main", {}).get("temp", 0), 1),
-                "feels_like_temperature": round(raw_weather_data.get("main", {}).get("feels_like", 0), 1),
-                "humidity_percentage": raw_weather_data.get("main", {}).get("humidity", 0),
-                "atmospheric_pressure": raw_weather_data.get("main", {}).get("pressure", 0),
-                "wind_speed": raw_weather_data.get("wind", {}).get("speed", 0),
-                "weather_description": raw_weather_data.get("weather", [{}])[0].get("description", ""),
-                "weather_main": raw_weather_data.get("weather", [{}])[0].get("main", ""),
-                "visibility_meters": raw_weather_data.get("visibility", 0),
-                "cloudiness_percentage": raw_weather_data.get("clouds", {}).get("all", 0)
-            }
+            with timed("process"):
+                processed_data = WeatherObservation.from_raw(raw_weather_data)
             
-            weather_logger.info(f"Successfully processed weather data for {processed_data['city_name']}")
+            weather_logger.info(f"Successfully processed weather data for {processed_data.city_name}")
             return processed_data
             
         except Exception as processing_error:
             weather_logger.error(f"Error processing weather data: {processing_error}")
-            return {}
+            return None
+    
+    def _resolve_city_id(self, city_name: str, city_id: Optional[int]) -> Optional[int]:
+        """Use the given ID, else look the name up in the city index (None if unknown or no index)"""
+        if city_id is None and self.city_index is not None:
+            return self.city_index.resolve_id(city_name)
+        return city_id
+    
+    def weather_cache_key(self, city_name: str, city_id: Optional[int] = None) -> str:
+        """
+        Build the response cache key for a lookup
+        
+        Args:
+            city_name (str): Name of the city
+            city_id (int): OpenWeatherMap city ID, if already known
+            
+        Returns:
+            str: Key by city ID when it is known or resolvable, else by normalized name
+        """
+        city_id = self._resolve_city_id(city_name, city_id)
+        return build_weather_cache_key(f"id:{city_id}" if city_id is not None else city_name, self.units)
     
-    def get_complete_weather_info(self, city_name: str) -> Optional[Dict]:
+    def get_complete_weather_info(self, city_name: str, city_id: Optional[int] = None) -> Optional[WeatherObservation]:
         """
         Get complete weather information for a city
         
+        Served from the response cache when possible, then from the persistent
+        cache on disk. With stale-while-revalidate enabled, an expired entry is
+        returned immediately and refreshed in the background. Concurrent misses
+        for the same city and units wait on a single fetch. If the fetch fails,
+        the last known reading is returned instead of None; use lookup_weather_info
+        to tell the two apart.
+        With a city index, names are resolved to IDs first and unknown names fail
+        without a network call.
+        
+        Args:
+            city_name (str): Name of the city
+            city_id (int): OpenWeatherMap city ID, if already known (e.g. from a suggestion)
+            
+        Returns:
+            WeatherObservation: Complete processed weather information or None
+        """
+        return self.lookup_weather_info(city_name, city_id).weather_info
+    
+    def lookup_weather_info(self, city_name: str, city_id: Optional[int] = None) -> WeatherLookup:
+        """
+        Get a city's weather like get_complete_weather_info, reporting whether it fell back
+        
+        Args:
+            city_name (str): Name of the city
+            city_id (int): OpenWeatherMap city ID, if already known (e.g. from a suggestion)
+            
+        Returns:
+            WeatherLookup: The reading (None if unavailable), whether it is the last known
+                           reading served after a failed fetch, and its age
+        """
+        city_id = self._resolve_city_id(city_name, city_id)
+        if city_id is None and self.city_index is not None:
+            weather_logger.info(f"'{city_name}' is not in the city index")
+            return WeatherLookup(None)
+        
+        cache_key = self.weather_cache_key(city_name, city_id)
+        cached_info, is_fresh = self._lookup_cached_info(cache_key)
+        
+        if cached_info is not None:
+            cached_age = self.response_cache.entry_age(cache_key)
+            if is_fresh:
+                increment("lookups_fresh")
+                return WeatherLookup(cached_info, age_seconds=cached_age)
+            if self.stale_while_revalidate:
+                increment("lookups_stale")
+                self._schedule_background_refresh(cache_key, city_name, city_id)
+                return WeatherLookup(cached_info, age_seconds=cached_age)
+        
+        increment("lookups_fetched")
+        fetch_started = time.monotonic()
+        fresh_info = self.refresh_weather_info(city_name, city_id)
+        if fresh_info is None and cached_info is not None:
+            weather_logger.warning(f"Live weather for {city_name} unavailable, serving the last known reading")
+            increment("lookups_last_known_good")
+            return WeatherLookup(cached_info, is_last_known=True,
+                                 age_seconds=last_known_age(cached_age, fetch_started))
+        return WeatherLookup(fresh_info, age_seconds=0.0 if fresh_info is not None else None)
+    
+    def refresh_weather_info(self, city_name: str, city_id: Optional[int] = None) -> Optional[WeatherObservation]:
+        """
+        Fetch a city's weather from the API now, bypassing the cache, and cache the result
+        
         Args:
             city_name (str): Name of the city
+            city_id (int): OpenWeatherMap city ID, if already known
             
         Returns:
-            Dict: Complete processed weather information or None
+            WeatherObservation: Fresh weather information or None
         """
-        raw_data = self.fetch_weather_data(city_name)
+        city_id = self._resolve_city_id(city_name, city_id)
+        if city_id is None and self.city_index is not None:
+            return None
+        cache_key = self.weather_cache_key(city_name, city_id)
+        return self.request_coalescer.do(cache_key, self._fetch_and_cache, cache_key, city_name, city_id)
+    
+    def _fetch_and_cache(self, cache_key: str, city_name: str,
+                         city_id: Optional[int] = None) -> Optional[WeatherObservation]:
+        """Fetch and process a city's weather, storing successful results in the cache"""
+        raw_data = self.fetch_weather_data(city_name, city_id)
         if raw_data:
-            return self.process_weather_information(raw_data)
+            processed_data = self.process_weather_information(raw_data)
+            if processed_data:
+                self.response_cache.store(cache_key, processed_data)
+                self.persist_payload(cache_key, raw_data)
+                self.record_history(processed_data)
+            return processed_data
         return None
+    
+    def _lookup_cached_info(self, cache_key: str) -> Tuple[Optional[WeatherObservation], bool]:
+        """
+        Look a reading up in the memory cache, then in the persistent cache
+        
+        A reading found on disk is put back into the memory cache with its real age.
+        
+        Args:
+            cache_key (str): Key built with weather_cache_key
+            
+        Returns:
+            Tuple: (reading, is_fresh) - reading is None if neither cache has it
+        """
+        cached_info, is_fresh = self.response_cache.lookup(cache_key)
+        if cached_info is not None or self.persistent_cache is None:
+            return cached_info, is_fresh
+        return self._restore_persisted_info(cache_key)
+    
+    def _restore_persisted_info(self, cache_key: str) -> Tuple[Optional[WeatherObservation], bool]:
+        """Load a reading from the persistent cache into the memory cache, returning (reading, is_fresh)"""
+        raw_data, age_seconds = self.persistent_cache.load(cache_key)
+        if raw_data is None:
+            return None, False
+        restored_info = self.process_weather_information(raw_data)
+        if restored_info is None:
+            return None, False
+        self.response_cache.store(cache_key, restored_info, age_seconds=age_seconds)
+        return restored_info, age_seconds < self.response_cache.ttl_seconds
+    
+    def persist_payload(self, cache_key: str, raw_data: Dict):
+        """Keep a raw payload in the persistent cache, if one is configured"""
+        if self.persistent_cache is not None:
+            self.persistent_cache.store(cache_key, raw_data)
+    
+    def record_history(self, weather_info: WeatherObservation):
+        """Append a fresh reading to the history store, if one is configured"""
+        if self.history_store is None:
+            return
+        try:
+            self.history_store.append(weather_info)
+        except OSError as storage_error:
+            weather_logger.error(f"Error recording weather history: {storage_error}")
+    
+    def _schedule_background_refresh(self, cache_key: str, city_name: str, city_id: Optional[int] = None):
+        """Refresh a stale cache entry on a daemon thread, at most once per key"""
+        with self._pending_refreshes_lock:
+            if cache_key in self._pending_refreshes:
+                return
+            self._pending_refreshes.add(cache_key)
+        
+        def refresh_entry():
+            try:
+                self.refresh_weather_info(city_name, city_id)
+            finally:
+                with self._pending_refreshes_lock:
+                    self._pending_refreshes.discard(cache_key)
+        
+        weather_logger.info(f"Serving stale weather data for {city_name}, refreshing in background")
+        threading.Thread(target=refresh_entry, name=f"weather-refresh-{cache_key}", daemon=True).start()
+    
+    def get_complete_weather_info_many(self, cities: Iterable[Union[str, int]],
+                                       max_concurrency: int = BULK_FETCH_MAX_CONCURRENCY) -> Iterator[Dict]:
+        """
+        Get complete weather information for many cities in parallel
+        
+        City IDs (ints or digit strings) are folded into group requests of up to
+        GROUP_REQUEST_MAX_IDS. With a city index, names are resolved to IDs and
+        batched the same way, and unknown names fail without a request; otherwise
+        names are fetched individually. Each city ID is requested once: repeats
+        share the pending or in-flight group's result. The input is consumed
+        lazily and only a bounded number of requests are in flight.
+        
+        Args:
+            cities (Iterable): City names and/or OpenWeatherMap city IDs
+            max_concurrency (int): Maximum number of parallel API calls
+            
+        Yields:
+            Dict: {"city": requested city, "weather": processed info or None,
+                   "error": error message or None, "is_last_known": True when the fetch failed
+                   and the last stored reading was used, "age_seconds": seconds since the
+                   reading was fetched (None if unknown)}, in completion order
+        """
+        max_in_flight = max_concurrency * 2
+        # City ID -> every requested city asking for it, for the next group and for submitted groups
+        pending_requesters: Dict[int, List] = {}
+        in_flight_requesters: Dict[int, List] = {}
+        group_requesters: Dict[Future, Dict[int, List]] = {}
+        
+        with ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="weather-bulk") as executor:
+            in_flight = set()
+            
+            def submit_group():
+                nonlocal pending_requesters
+                group_future = executor.submit(self._fetch_group_for_batch, list(pending_requesters))
+                group_requesters[group_future] = pending_requesters
+                in_flight_requesters.update(pending_requesters)
+                in_flight.add(group_future)
+                pending_requesters = {}
+            
+            def drain(until_size: int) -> Iterator[Dict]:
+                nonlocal in_flight
+                while len(in_flight) > until_size:
+                    done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for finished_task in done:
+                        if finished_task not in group_requesters:
+                            yield from finished_task.result()
+                            continue
+                        # Fan each city's result out to every input that asked for it
+                        results_by_id = finished_task.result()
+                        for city_id, requested_cities in group_requesters.pop(finished_task).items():
+                            del in_flight_requesters[city_id]
+                            for requested_city in requested_cities:
+                                yield dict(results_by_id[city_id], city=requested_city)
+            
+            for requested_city in cities:
+                city_id = self._parse_city_id(requested_city)
+                if city_id is None and self.city_index is not None:
+                    city_id = self.city_index.resolve_id(requested_city)
+                    if city_id is None:
+                        yield self._batch_result(requested_city, None, f"Unknown city '{requested_city}'")
+                        continue
+                
+                if city_id is None:
+                    in_flight.add(executor.submit(self._fetch_single_for_batch, requested_city))
+                elif city_id in pending_requesters or city_id in in_flight_requesters:
+                    increment("bulk_duplicate_ids")
+                    (pending_requesters.get(city_id) or in_flight_requesters[city_id]).append(requested_city)
+                    continue
+                else:
+                    cache_key = build_weather_cache_key(f"id:{city_id}", self.units)
+                    cached_info, is_fresh = self._lookup_cached_info(cache_key)
+                    if cached_info is not None and is_fresh:
+                        yield self._batch_result(requested_city, cached_info,
+                                                 age_seconds=self.response_cache.entry_age(cache_key))
+                        continue
+                    
+                    pending_requesters[city_id] = [requested_city]
+                    if len(pending_requesters) < GROUP_REQUEST_MAX_IDS:
+                        continue
+                    submit_group()
+                
+                yield from drain(max_in_flight - 1)
+            
+            if pending_requesters:
+                submit_group()
+            yield from drain(0)
+    
+    @staticmethod
+    def _parse_city_id(requested_city: Union[str, int]) -> Optional[int]:
+        """Return the city ID if the request is an int or digit string, else None"""
+        if isinstance(requested_city, int):
+            return requested_city
+        stripped_city = str(requested_city).strip()
+        return int(stripped_city) if stripped_city.isdigit() else None
+    
+    @staticmethod
+    def _batch_result(requested_city: Union[str, int], weather_info: Optional[Dict],
+                      error_message: Optional[str] = None, is_last_known: bool = False,
+                      age_seconds: Optional[float] = None) -> Dict:
+        """Build one entry of a bulk lookup result"""
+        return {"city": requested_city, "weather": weather_info, "error": error_message,
+                "is_last_known": is_last_known, "age_seconds": age_seconds}
+    
+    def _fetch_single_for_batch(self, city_name: str) -> List[Dict]:
+        """Bulk worker for a single city name"""
+        try:
+            weather_lookup = self.lookup_weather_info(city_name)
+        except Exception as lookup_error:
+            return [self._batch_result(city_name, None, str(lookup_error))]
+        
+        if not weather_lookup.weather_info:
+            return [self._batch_result(city_name, None, f"Could not find weather data for '{city_name}'")]
+        return [self._batch_result(city_name, weather_lookup.weather_info,
+                                   is_last_known=weather_lookup.is_last_known, age_seconds=weather_lookup.age_seconds)]
+    
+    def _fetch_group_for_batch(self, city_ids: List[int]) -> Dict[int, Dict]:
+        """Bulk worker for one group request of distinct city IDs; results are keyed (and labelled) by city ID"""
+        group_data = self.fetch_weather_group_data(city_ids)
+        if not group_data:
+            # Fall back to each city's last known reading, flagged as such like lookup_weather_info does
+            batch_results = {}
+            for city_id in city_ids:
+                cache_key = build_weather_cache_key(f"id:{city_id}", self.units)
+                last_known_info, _ = self._lookup_cached_info(cache_key)
+                if last_known_info is not None:
+                    increment("lookups_last_known_good")
+                    # Measured after the failed request, so the age already includes its duration
+                    batch_results[city_id] = self._batch_result(city_id, last_known_info, is_last_known=True,
+                                                                age_seconds=self.response_cache.entry_age(cache_key))
+                else:
+                    batch_results[city_id] = self._batch_result(city_id, None, "Group weather request failed")
+            return batch_results
+        
+        payloads_by_id = {payload.get("id"): payload for payload in group_data.get("list", [])}
+        batch_results = {}
+        for city_id in city_ids:
+            raw_payload = payloads_by_id.get(city_id)
+            if raw_payload is None:
+                batch_results[city_id] = self._batch_result(city_id, None, f"No weather data for city ID {city_id}")
+                continue
+            
+            weather_info = self.process_weather_information(raw_payload)
+            if weather_info:
+                cache_key = build_weather_cache_key(f"id:{city_id}", self.units)
+                self.response_cache.store(cache_key, weather_info)
+                self.persist_payload(cache_key, raw_payload)
+                self.record_history(weather_info)
+                batch_results[city_id] = self._batch_result(city_id, weather_info, age_seconds=0.0)
+            else:
+                batch_results[city_id] = self._batch_result(city_id, None, f"Could not process weather data for city ID {city_id}")
+        return batch_results
+    
+    def get_forecast(self, city_name: str, city_id: Optional[int] = None):
+        """
+        Get the 5-day/3-hour forecast for a city as NumPy arrays
+        
+        Like current weather, names are resolved through the city index and the
+        forecast is fetched and cached by city ID, so it is for the same city the
+        current-weather panel shows.
+        
+        Args:
+            city_name (str): Name of the city
+            city_id (int): OpenWeatherMap city ID, if already known (e.g. from a suggestion)
+            
+        Returns:
+            ForecastSeries: Parsed forecast or None if it could not be fetched
+        """
+        from backend.forecast import parse_forecast_payload
+        
+        city_id = self._resolve_city_id(city_name, city_id)
+        if city_id is None and self.city_index is not None:
+            weather_logger.info(f"'{city_name}' is not in the city index")
+            return None
+        
+        cache_key = build_weather_cache_key(
+            f"forecast:id:{city_id}" if city_id is not None else f"forecast:{city_name}", self.units
+        )
+        cached_forecast, is_fresh = self.response_cache.lookup(cache_key)
+        if cached_forecast is not None and is_fresh:
+            return cached_forecast
+        
+        raw_forecast = self.fetch_forecast_data(city_name, city_id)
+        if not raw_forecast:
+            return cached_forecast
+        
+        with timed("forecast_parse"):
+            forecast_series = parse_forecast_payload(raw_forecast)
+        self.response_cache.store(cache_key, forecast_series)
+        return forecast_series
+    
+    def get_forecasts_many(self, cities: Iterable[str],
+                           max_concurrency: int = BULK_FETCH_MAX_CONCURRENCY) -> List:
+        """
+        Get forecasts for many cities in parallel, ready for aggregate_daily_forecasts
+        
+        Args:
+            cities (Iterable[str]): City names
+            max_concurrency (int): Maximum number of parallel API calls
+            
+        Returns:
+            List: ForecastSeries (or None on failure) per city, in input order
+        """
+        with ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="forecast-bulk") as executor:
+            return list(executor.map(self.get_forecast, cities))
+    
+    def get_cache_stats(self) -> Dict:
+        """
+        Get response cache counters
+        
+        Returns:
+            Dict: Hit, stale hit, miss and eviction counts plus current size
+        """
+        return self.response_cache.get_stats()
+    
+    def get_service_stats(self) -> Dict:
+        """
+        Get cache, HTTP transport and request coalescing counters
+        
+        Returns:
+            Dict: Memory and persistent cache counters, requests sent, retries and
+                  connection reuse, plus fetches executed and callers coalesced onto them
+        """
+        return {
+            "cache": self.get_cache_stats(),
+            "persistent_cache": self.persistent_cache.get_stats() if self.persistent_cache is not None else None,
+            "transport": self.http_transport.get_stats(),
+            "coalescing": self.request_coalescer.get_stats()
+        }
+    
+    def close(self):
+        """Release pooled HTTP connections"""
+        self.http_transport.close()
@@ -0,0 +1,85 @@
+"""
+Benchmark the two overview chart renderers: matplotlib PNG image vs native Flet charts
+
+For each reading, the matplotlib backend renders and encodes a PNG and base64s it
+for the page; the Flet backend writes the reading into its existing controls.
+The payload column is what a page update would carry: the base64 image, or
+(approximately) the JSON of the changed control properties.
+
+Usage:
+    python benchmarks/bench_chart_renderers.py [--renders 30]
+"""
+import argparse
+import base64
+import json
+import os
+import statistics
+import sys
+import time
+
+# Add the project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from benchmarks.bench_overview_chart import SAMPLE_WEATHER_INFO
+
+
+def time_matplotlib_renders(render_count: int):
+    """Render, encode and base64 the overview for distinct readings; return times (ms) and payload sizes"""
+    from backend.chart_generator import render_overview_chart_png
+
+    render_times, payload_sizes = [], []
+    for render_index in range(render_count):
+        # Nudge the temperature so every render is a new reading, as the chart cache would otherwise answer
+        weather_info = dict(SAMPLE_WEATHER_INFO[render_index % len(SAMPLE_WEATHER_INFO)])
+        weather_info["current_temperature"] += render_index / 100
+        start_time = time.perf_counter()
+        chart_base64 = base64.b64encode(render_overview_chart_png(weather_info)).decode("ascii")
+        render_times.append((time.perf_counter() - start_time) * 1000)
+        payload_sizes.append(len(chart_base64))
+    return render_times, payload_sizes
+
+
+def changed_property_payload(flet_renderer) -> int:
+    """Approximate bytes of the properties an in-place update changes"""
+    changed_properties = [flet_renderer.title_text.value, flet_renderer.summary_text.value]
+    for overview_bar_chart in (flet_renderer.temperature_chart, flet_renderer.atmospheric_chart,
+                               flet_renderer.wind_visibility_chart):
+        changed_properties.append([overview_bar_chart.bar_chart.min_y, overview_bar_chart.bar_chart.max_y])
+        changed_properties.extend([bar_rod.to_y, bar_rod.tooltip] for bar_rod in overview_bar_chart.bar_rods)
+        changed_properties.extend(value_text.value for value_text in overview_bar_chart.value_texts)
+    return len(json.dumps(changed_properties))
+
+
+def time_flet_updates(render_count: int):
+    """Apply distinct readings to one set of native chart controls; return times (ms) and payload sizes"""
+    from frontend.chart_renderers import FletOverviewRenderer
+
+    flet_renderer = FletOverviewRenderer()
+    flet_renderer.build_control()
+    update_times, payload_sizes = [], []
+    for render_index in range(render_count):
+        weather_info = dict(SAMPLE_WEATHER_INFO[render_index % len(SAMPLE_WEATHER_INFO)])
+        weather_info["current_temperature"] += render_index / 100
+        start_time = time.perf_counter()
+        flet_renderer.apply_weather(weather_info)
+        update_times.append((time.perf_counter() - start_time) * 1000)
+        payload_sizes.append(changed_property_payload(flet_renderer))
+    return update_times, payload_sizes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--renders", type=int, default=30, help="Readings drawn per backend")
+    args = parser.parse_args()
+
+    for backend_name, time_backend in (("matplotlib", time_matplotlib_renders), ("flet", time_flet_updates)):
+        draw_times, payload_sizes = time_backend(args.renders)
+        print(f"{backend_name:>10}: mean {statistics.mean(draw_times):8.2f} ms   "
+              f"median {statistics.median(draw_times):8.2f} ms   "
+              f"first {draw_times[0]:8.2f} ms   "
+              f"payload {statistics.mean(payload_sizes) / 1024:8.1f} KiB")
+
+
+if __name__ == "__main__":
+    main()
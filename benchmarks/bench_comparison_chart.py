@@ -0,0 +1,64 @@
+"""
+Benchmark the multi-city comparison chart against one overview figure per city
+
+For each city count, every comparison layout is rendered once from all cities.
+The per-city baseline renders a sample of overview charts and scales the mean
+up to the city count, since rendering hundreds of them would take minutes.
+
+Usage:
+    python benchmarks/bench_comparison_chart.py [--cities 2 50 500] [--per-city-sample 5]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+# Add the project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from benchmarks.stub_openweather_server import build_current_weather_payload
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--cities", type=int, nargs="+", default=[2, 50, 500], help="City counts compared")
+    parser.add_argument("--per-city-sample", type=int, default=5, help="Overview charts timed for the baseline")
+    args = parser.parse_args()
+
+    from backend.chart_generator import (
+        COMPARISON_LAYOUTS, apply_chart_style, prepare_city_comparison, render_comparison_chart_png,
+        render_overview_chart_png
+    )
+    from backend.weather_observation import WeatherObservation
+
+    apply_chart_style()
+    readings = [WeatherObservation.from_raw(build_current_weather_payload(f"Benchtown {city_number:04d}"))
+                for city_number in range(max(args.cities))]
+
+    # Untimed first renders load fonts and build the reusable overview figure
+    render_overview_chart_png(readings[0])
+    render_comparison_chart_png(prepare_city_comparison(readings[:2], "bars"), "bars")
+
+    overview_times = []
+    for weather_info in readings[:args.per_city_sample]:
+        start_time = time.perf_counter()
+        render_overview_chart_png(weather_info)
+        overview_times.append(time.perf_counter() - start_time)
+    overview_mean = statistics.mean(overview_times)
+
+    for city_count in args.cities:
+        print(f"{city_count} cities: one overview per city ~{overview_mean * city_count:8.2f} s (projected)")
+        for layout in COMPARISON_LAYOUTS:
+            start_time = time.perf_counter()
+            city_comparison = prepare_city_comparison(readings[:city_count], layout, sort_by="current_temperature")
+            prepare_seconds = time.perf_counter() - start_time
+            png_bytes = render_comparison_chart_png(city_comparison, layout)
+            total_seconds = time.perf_counter() - start_time
+            print(f"  {layout:>16}: {total_seconds:6.2f} s   (pack + rank {prepare_seconds * 1000:6.2f} ms)   "
+                  f"{len(png_bytes) / 1024:6.0f} KiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Benchmark parse speed and per-object memory of WeatherObservation against the old dict
+
+Usage:
+    python benchmarks/bench_observation.py [--count 200000]
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+# Add the project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from backend.weather_observation import WeatherObservation
+
+SAMPLE_PAYLOAD = {
+    "coord": {"lon": -0.1257, "lat": 51.5085},
+    "weather": [{"id": 500, "main": "Rain", "description": "light rain", "icon": "10d"}],
+    "main": {"temp": 14.23, "feels_like": 13.61, "temp_min": 12.9, "temp_max": 15.4,
+             "pressure": 1012, "humidity": 72},
+    "visibility": 9000,
+    "wind": {"speed": 4.63, "deg": 240},
+    "clouds": {"all": 75},
+    "dt": 1760000000,
+    "sys": {"country": "GB", "sunrise": 1759990000, "sunset": 1760030000},
+    "id": 2643743,
+    "name": "London",
+}
+
+
+def parse_as_dict(raw_weather_data: dict) -> dict:
+    """The per-request dict built before WeatherObservation existed"""
+    return {
+        "city_name": raw_weather_data.get("name", "Unknown"),
+        "country_code": raw_weather_data.get("sys", {}).get("country", ""),
+        "current_temperature": round(raw_weather_data.get("main", {}).get("temp", 0), 1),
+        "feels_like_temperature": round(raw_weather_data.get("main", {}).get("feels_like", 0), 1),
+        "humidity_percentage": raw_weather_data.get("main", {}).get("humidity", 0),
+        "atmospheric_pressure": raw_weather_data.get("main", {}).get("pressure", 0),
+        "wind_speed": raw_weather_data.get("wind", {}).get("speed", 0),
+        "weather_description": raw_weather_data.get("weather", [{}])[0].get("description", ""),
+        "weather_main": raw_weather_data.get("weather", [{}])[0].get("main", ""),
+        "visibility_meters": raw_weather_data.get("visibility", 0),
+        "cloudiness_percentage": raw_weather_data.get("clouds", {}).get("all", 0)
+    }
+
+
+def measure(label: str, parse_function, payloads: list):
+    """Report parse time per reading and retained memory per object"""
+    start_time = time.perf_counter()
+    for raw_payload in payloads:
+        parse_function(raw_payload)
+    parse_microseconds = (time.perf_counter() - start_time) / len(payloads) * 1e6
+
+    tracemalloc.start()
+    retained_objects = [parse_function(raw_payload) for raw_payload in payloads]
+    retained_bytes, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"{label:>20}: {parse_microseconds:6.2f} us/parse   "
+          f"{retained_bytes / len(retained_objects):7.1f} bytes/object")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--count", type=int, default=200_000, help="Readings to parse")
+    args = parser.parse_args()
+
+    # Distinct payload dicts with distinct values, as a real history would have
+    payloads = [
+        dict(SAMPLE_PAYLOAD, dt=SAMPLE_PAYLOAD["dt"] + index,
+             main=dict(SAMPLE_PAYLOAD["main"], temp=10 + (index % 2000) / 100))
+        for index in range(args.count)
+    ]
+
+    measure("dict", parse_as_dict, payloads)
+    measure("WeatherObservation", WeatherObservation.from_raw, payloads)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Benchmark per-render time of the overview chart with and without figure reuse
+
+Usage:
+    python benchmarks/bench_overview_chart.py [--renders 20]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+# Add the project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from backend.chart_generator import apply_chart_style, render_overview_chart_png
+
+SAMPLE_WEATHER_INFO = [
+    {
+        "city_name": "London", "country_code": "GB", "current_temperature": 14.2,
+        "feels_like_temperature": 13.1, "humidity_percentage": 72, "atmospheric_pressure": 1012,
+        "wind_speed": 4.6, "weather_description": "light rain", "weather_main": "Rain",
+        "visibility_meters": 9000, "cloudiness_percentage": 75
+    },
+    {
+        "city_name": "Oymyakon", "country_code": "RU", "current_temperature": -41.5,
+        "feels_like_temperature": -48.0, "humidity_percentage": 64, "atmospheric_pressure": 1041,
+        "wind_speed": 1.2, "weather_description": "clear sky", "weather_main": "Clear",
+        "visibility_meters": 10000, "cloudiness_percentage": 0
+    },
+    {
+        "city_name": "Singapore", "country_code": "SG", "current_temperature": 31.4,
+        "feels_like_temperature": 38.2, "humidity_percentage": 81, "atmospheric_pressure": 1008,
+        "wind_speed": 3.1, "weather_description": "scattered clouds", "weather_main": "Clouds",
+        "visibility_meters": 8000, "cloudiness_percentage": 40
+    },
+]
+
+
+def time_renders(reuse_figure: bool, render_count: int) -> list:
+    """Render the overview chart repeatedly and return per-render times in milliseconds"""
+    render_times = []
+    for render_index in range(render_count):
+        weather_info = SAMPLE_WEATHER_INFO[render_index % len(SAMPLE_WEATHER_INFO)]
+        start_time = time.perf_counter()
+        # Rendered directly: the chart cache would answer repeated readings, in either mode
+        render_overview_chart_png(weather_info, reuse_figure=reuse_figure)
+        render_times.append((time.perf_counter() - start_time) * 1000)
+    return render_times
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--renders", type=int, default=20, help="Renders per mode")
+    args = parser.parse_args()
+
+    apply_chart_style()
+    for mode_name, reuse_figure in (("rebuild per render", False), ("persistent figure", True)):
+        render_times = time_renders(reuse_figure, args.renders)
+        print(f"{mode_name:>20}: mean {statistics.mean(render_times):7.1f} ms   "
+              f"median {statistics.median(render_times):7.1f} ms   "
+              f"first {render_times[0]:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Benchmark cold start: import time of the app modules and time-to-first-frame of main.py
+
+Usage:
+    python benchmarks/bench_startup.py [--runs 5] [--skip-window]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that should stay off the startup path
+HEAVY_MODULES = ("matplotlib", "seaborn", "pandas", "requests", "httpx")
+
+IMPORT_PROBE = """
+import json, sys, time
+start_time = time.perf_counter()
+import {module}
+elapsed_ms = (time.perf_counter() - start_time) * 1000
+print(json.dumps({{"import_ms": elapsed_ms, "heavy": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def measure_import(module_name: str) -> dict:
+    """Import a module in a fresh interpreter and report its import time and heavy dependencies"""
+    probe_code = IMPORT_PROBE.format(module=module_name, heavy=HEAVY_MODULES)
+    probe_output = subprocess.run(
+        [sys.executable, "-c", probe_code], cwd=project_root,
+        capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(probe_output.strip().splitlines()[-1])
+
+
+# Starts the dashboard the way main.py does, but through a target that reports the first frame and closes
+FIRST_FRAME_PROBE = """
+import sys, time
+launch_time = {launch_time!r}
+sys.path.insert(0, {project_root!r})
+import flet as ft
+import main
+from frontend.weather_ui import create_weather_app
+
+def probe_first_frame(page):
+    create_weather_app(page)
+    print(f"startup_probe first_frame_ms={{(time.time() - launch_time) * 1000:.1f}}", flush=True)
+    page.window_destroy()
+
+ft.app(target=probe_first_frame)
+"""
+
+
+def measure_first_frame(timeout_seconds: float) -> float:
+    """Launch the dashboard through a probe target and return time-to-first-frame in ms"""
+    probe_code = FIRST_FRAME_PROBE.format(launch_time=time.time(), project_root=project_root)
+    app_process = subprocess.run(
+        [sys.executable, "-c", probe_code], cwd=project_root,
+        capture_output=True, text=True, timeout=timeout_seconds
+    )
+    for output_line in app_process.stdout.splitlines():
+        if output_line.startswith("startup_probe first_frame_ms="):
+            return float(output_line.split("=", 1)[1])
+    app_output = (app_process.stdout + app_process.stderr)[-2000:]
+    raise RuntimeError(f"The dashboard exited without reporting a first frame:\n{app_output}")
+
+
+def summarize(label: str, samples: list):
+    """Print median / min / max for a list of millisecond samples"""
+    print(f"{label:>32}: median {statistics.median(samples):7.1f} ms   "
+          f"min {min(samples):7.1f} ms   max {max(samples):7.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per measurement")
+    parser.add_argument("--skip-window", action="store_true", help="Only measure imports (no display needed)")
+    parser.add_argument("--timeout", type=float, default=60, help="Seconds to wait for the first frame")
+    args = parser.parse_args()
+
+    for module_name in ("frontend.weather_ui", "main"):
+        import_results = [measure_import(module_name) for _ in range(args.runs)]
+        summarize(f"import {module_name}", [result["import_ms"] for result in import_results])
+        print(f"{'heavy modules loaded':>32}: {', '.join(import_results[-1]['heavy']) or 'none'}")
+
+    if not args.skip_window:
+        try:
+            summarize("time-to-first-frame (dashboard)",
+                      [measure_first_frame(args.timeout) for _ in range(args.runs)])
+        except (RuntimeError, subprocess.TimeoutExpired) as window_error:
+            print(f"time-to-first-frame unavailable: {window_error}")
+
+
+if __name__ == "__main__":
+    main()
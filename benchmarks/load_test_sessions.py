@@ -0,0 +1,181 @@
+"""
+Load test: N concurrent dashboard sessions searching against a local stub API
+
+Every simulated session keeps its own state and runs the same search path as
+WeatherDashboardUI (shared async weather service, then a chart from the shared
+rendering engine, encoded for the page) on one event loop, like Flet's web mode.
+History, the on-disk response cache and spilled charts go to a scratch
+directory that is removed afterwards.
+
+Usage:
+    python benchmarks/load_test_sessions.py [--sessions 50] [--searches 5] [--cities 20]
+                                            [--latency-ms 80] [--think-ms 200] [--cache-ttl 600]
+"""
+import argparse
+import asyncio
+import base64
+import json
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from typing import List
+
+# Add the project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from benchmarks.stub_openweather_server import StubOpenWeatherServer
+
+
+class SimulatedSession:
+    """Per-session state of one browser tab, mirroring WeatherDashboardUI"""
+
+    def __init__(self, session_number: int, weather_service, chart_engine):
+        self.session_number = session_number
+        self.weather_service = weather_service
+        self.chart_engine = chart_engine
+        self.current_weather_data = None
+        self.chart_base64 = None
+        self.search_latencies_ms: List[float] = []
+        self.failed_searches = 0
+
+    async def search(self, city_name: str):
+        """Fetch, then chart, a city exactly as run_weather_search does"""
+        search_start = time.perf_counter()
+        weather_data = await self.weather_service.get_complete_weather_info(city_name)
+        if weather_data is None:
+            self.failed_searches += 1
+            return
+
+        self.current_weather_data = weather_data
+        chart_png_bytes = await asyncio.wrap_future(self.chart_engine.submit_overview_chart_png(weather_data))
+        self.chart_base64 = base64.b64encode(chart_png_bytes).decode("ascii")
+        self.search_latencies_ms.append((time.perf_counter() - search_start) * 1000)
+
+
+def percentile(sorted_samples: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of already sorted samples"""
+    if not sorted_samples:
+        return float("nan")
+    rank = min(len(sorted_samples) - 1, max(0, round(fraction * len(sorted_samples) + 0.5) - 1))
+    return sorted_samples[rank]
+
+
+async def run_sessions(arguments, scratch_directory: str) -> dict:
+    """Drive every session concurrently and collect latencies and shared-service counters"""
+    from backend.async_weather_service import AsyncWeatherDataService
+    from backend.chart_cache import ChartImageCache
+    from backend.chart_generator import ChartRenderingEngine
+    from backend.observation_store import ObservationHistoryStore
+    from backend.persistent_cache import PersistentResponseCache
+    from backend.refresh_scheduler import TokenBucket
+    from backend.weather_cache import WeatherResponseCache
+    from config.settings import (
+        CHART_CACHE_MAX_MEMORY_BYTES, PERSISTENT_CACHE_MAX_AGE_SECONDS, PERSISTENT_CACHE_MAX_BYTES,
+        WEATHER_CACHE_MAX_ENTRIES
+    )
+
+    # Built like backend.shared_services builds them, but storing in the scratch directory
+    weather_service = AsyncWeatherDataService(
+        response_cache=WeatherResponseCache(arguments.cache_ttl, WEATHER_CACHE_MAX_ENTRIES),
+        history_store=ObservationHistoryStore(os.path.join(scratch_directory, "history")),
+        call_budget=TokenBucket(),
+        persistent_cache=PersistentResponseCache(
+            os.path.join(scratch_directory, "responses.sqlite3"),
+            PERSISTENT_CACHE_MAX_AGE_SECONDS, PERSISTENT_CACHE_MAX_BYTES
+        )
+    )
+    chart_engine = ChartRenderingEngine(
+        chart_cache=ChartImageCache(CHART_CACHE_MAX_MEMORY_BYTES, os.path.join(scratch_directory, "charts"))
+    )
+
+    # Popular cities are requested far more often (Zipf-like), as in real traffic
+    city_names = [f"Stubville {city_number:03d}" for city_number in range(arguments.cities)]
+    city_weights = [1 / (rank + 1) for rank in range(arguments.cities)]
+    sessions = [SimulatedSession(session_number, weather_service, chart_engine)
+                for session_number in range(arguments.sessions)]
+
+    async def run_session(session: SimulatedSession):
+        session_random = random.Random(arguments.seed + session.session_number)
+        for _ in range(arguments.searches):
+            await session.search(session_random.choices(city_names, city_weights)[0])
+            await asyncio.sleep(session_random.uniform(0, 2 * arguments.think_ms) / 1000)
+
+    run_start = time.perf_counter()
+    await asyncio.gather(*(run_session(session) for session in sessions))
+    wall_seconds = time.perf_counter() - run_start
+
+    all_latencies = sorted(latency for session in sessions for latency in session.search_latencies_ms)
+    service_stats = {"weather": weather_service.get_service_stats(), "charts": chart_engine.get_stats()}
+    await weather_service.close()
+    chart_engine.shutdown()
+
+    return {
+        "sessions": arguments.sessions,
+        "searches": len(all_latencies),
+        "failed_searches": sum(session.failed_searches for session in sessions),
+        "wall_seconds": wall_seconds,
+        "searches_per_second": len(all_latencies) / wall_seconds if wall_seconds else 0.0,
+        "latency_ms": {
+            "p50": percentile(all_latencies, 0.50),
+            "p90": percentile(all_latencies, 0.90),
+            "p99": percentile(all_latencies, 0.99),
+            "max": all_latencies[-1] if all_latencies else float("nan"),
+            "mean": statistics.fmean(all_latencies) if all_latencies else float("nan"),
+        },
+        "weather_coalescing": service_stats["weather"]["coalescing"],
+        "weather_cache": service_stats["weather"]["cache"],
+        "chart_coalescing": service_stats["charts"]["coalescing"],
+        "chart_cache": service_stats["charts"]["cache"],
+    }
+
+
+def main():
+    argument_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    argument_parser.add_argument("--sessions", type=int, default=50, help="Concurrent simulated sessions")
+    argument_parser.add_argument("--searches", type=int, default=5, help="Searches per session")
+    argument_parser.add_argument("--cities", type=int, default=20, help="Distinct cities searched")
+    argument_parser.add_argument("--latency-ms", type=float, default=80.0, help="Stub API response delay")
+    argument_parser.add_argument("--think-ms", type=float, default=200.0, help="Mean pause between searches")
+    argument_parser.add_argument("--cache-ttl", type=float, default=600.0, help="Response cache TTL (0 = always refetch)")
+    argument_parser.add_argument("--seed", type=int, default=7)
+    argument_parser.add_argument("--json", action="store_true", help="Print the full result as JSON")
+    arguments = argument_parser.parse_args()
+
+    stub_server = StubOpenWeatherServer(latency_seconds=arguments.latency_ms / 1000).start()
+    # Settings are read at import, so the stub must be configured before the services load
+    os.environ["OPENWEATHER_API_ROOT"] = stub_server.api_root
+    os.environ.setdefault("OPENWEATHER_API_KEY", "load-test")
+    scratch_directory = tempfile.mkdtemp(prefix="weather_load_test_")
+
+    try:
+        load_test_result = asyncio.run(run_sessions(arguments, scratch_directory))
+    finally:
+        stub_server.stop()
+        shutil.rmtree(scratch_directory, ignore_errors=True)
+    load_test_result["upstream_requests"] = dict(stub_server.request_counts)
+
+    if arguments.json:
+        print(json.dumps(load_test_result, indent=2))
+        return
+
+    latency = load_test_result["latency_ms"]
+    print(f"{load_test_result['sessions']} sessions, {load_test_result['searches']} searches "
+          f"({load_test_result['failed_searches']} failed) in {load_test_result['wall_seconds']:.1f} s "
+          f"= {load_test_result['searches_per_second']:.1f} searches/s")
+    print(f"search latency: p50 {latency['p50']:.1f} ms   p90 {latency['p90']:.1f} ms   "
+          f"p99 {latency['p99']:.1f} ms   max {latency['max']:.1f} ms")
+    print(f"upstream API calls: {sum(load_test_result['upstream_requests'].values())}   "
+          f"coalesced lookups: {load_test_result['weather_coalescing']['coalesced_waiters']}   "
+          f"cache hits: {load_test_result['weather_cache']['hits']}")
+    print(f"chart renders: {load_test_result['chart_coalescing']['executions']}   "
+          f"coalesced renders: {load_test_result['chart_coalescing']['coalesced_waiters']}   "
+          f"chart cache hits: {load_test_result['chart_cache']['memory_hits'] + load_test_result['chart_cache']['disk_hits']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Record real OpenWeatherMap responses for the stub server to replay
+
+Fetches /weather (and optionally /forecast) for each city with the configured
+API key and writes them to the file StubOpenWeatherServer replays, so
+benchmarks run on real payload shapes without touching the network.
+
+Usage:
+    python benchmarks/record_openweather_payloads.py London Tokyo "New York" [--forecast-cities London Tokyo]
+                                                     [--output benchmarks/fixtures/recorded_payloads.json]
+"""
+import argparse
+import json
+import os
+import sys
+
+import requests
+
+# Add the project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from benchmarks.stub_openweather_server import RECORDED_PAYLOADS_PATH
+from config.settings import (
+    OPENWEATHER_API_KEY, OPENWEATHER_BASE_URL, OPENWEATHER_FORECAST_URL, TEMPERATURE_UNIT, HTTP_TIMEOUT_SECONDS
+)
+
+
+def record_payload(session: requests.Session, endpoint_url: str, city_name: str) -> dict:
+    """Fetch one response exactly as the app requests it"""
+    api_response = session.get(
+        endpoint_url,
+        params={"q": city_name, "appid": OPENWEATHER_API_KEY, "units": TEMPERATURE_UNIT},
+        timeout=HTTP_TIMEOUT_SECONDS
+    )
+    api_response.raise_for_status()
+    return api_response.json()
+
+
+def main():
+    argument_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    argument_parser.add_argument("cities", nargs="+", help="Cities whose current weather is recorded")
+    argument_parser.add_argument("--forecast-cities", nargs="*", default=[], help="Cities whose forecast is recorded")
+    argument_parser.add_argument("--output", default=RECORDED_PAYLOADS_PATH, help="Recorded payload file")
+    arguments = argument_parser.parse_args()
+
+    if not OPENWEATHER_API_KEY:
+        argument_parser.error("OPENWEATHER_API_KEY is not configured; recording needs the real API")
+
+    recorded_responses = {"weather": {}, "forecast": {}}
+    with requests.Session() as session:
+        for city_name in arguments.cities:
+            recorded_responses["weather"][city_name] = record_payload(session, OPENWEATHER_BASE_URL, city_name)
+            print(f"recorded weather for {city_name}")
+        for city_name in arguments.forecast_cities:
+            recorded_responses["forecast"][city_name] = record_payload(session, OPENWEATHER_FORECAST_URL, city_name)
+            print(f"recorded forecast for {city_name}")
+
+    os.makedirs(os.path.dirname(os.path.abspath(arguments.output)), exist_ok=True)
+    with open(arguments.output, "w", encoding="utf-8") as output_file:
+        json.dump(recorded_responses, output_file, indent=1)
+    print(f"Wrote {arguments.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,361 @@
+"""
+Offline benchmark suite: API fetch latency, processing throughput, chart render time, end-to-end search
+
+Everything runs against a local StubOpenWeatherServer replaying the recorded
+payloads in benchmarks/fixtures/ (synthetic payloads for other cities), so no
+API key or network access is needed. Caches and history go to a scratch
+directory and are removed afterwards.
+
+Results are written as JSON (benchmarks/results/ by default). Pass --compare
+with an earlier result file to print the change of every measurement and flag
+the ones that got worse by more than --regression-threshold.
+
+Usage:
+    python benchmarks/run_benchmark_suite.py [--quick] [--latency-ms 20] [--jitter-ms 10]
+                                             [--error-rate 0.0] [--error-status 503]
+                                             [--output results.json] [--compare previous.json]
+                                             [--regression-threshold 0.10] [--fail-on-regression]
+"""
+import argparse
+import asyncio
+import base64
+import json
+import logging
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+# Add the project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from benchmarks.load_test_sessions import percentile
+from benchmarks.stub_openweather_server import (
+    RECORDED_PAYLOADS_PATH, StubOpenWeatherServer, build_current_weather_payload, load_recorded_payloads
+)
+
+RESULTS_DIRECTORY = os.path.join(project_root, "benchmarks", "results")
+RESULT_FORMAT_VERSION = 1
+# Statistics compared between runs, whichever a measurement has
+COMPARED_STATISTICS = ("value", "p50", "p90")
+
+
+def summarize_samples(samples: List[float], unit: str = "ms") -> Dict:
+    """Count, mean, percentiles and extremes of a list of timings"""
+    sorted_samples = sorted(samples)
+    return {
+        "unit": unit,
+        "better": "lower",
+        "count": len(sorted_samples),
+        "mean": statistics.fmean(sorted_samples) if sorted_samples else None,
+        "p50": percentile(sorted_samples, 0.50) if sorted_samples else None,
+        "p90": percentile(sorted_samples, 0.90) if sorted_samples else None,
+        "p99": percentile(sorted_samples, 0.99) if sorted_samples else None,
+        "min": sorted_samples[0] if sorted_samples else None,
+        "max": sorted_samples[-1] if sorted_samples else None,
+    }
+
+
+def benchmark_city_names(recorded_payloads: Dict, city_count: int, prefix: str) -> List[str]:
+    """Recorded cities first, then synthetic ones up to city_count distinct names"""
+    city_names = [payload["name"] for payload in recorded_payloads["weather"].values()][:city_count]
+    city_names += [f"{prefix} {city_number:04d}" for city_number in range(city_count - len(city_names))]
+    return city_names
+
+
+def benchmark_fetch_latency(weather_service, city_names: List[str]) -> Dict:
+    """Time WeatherDataService.fetch_weather_data (HTTP round trip and JSON decode) per call"""
+    fetch_times, failed_fetches = [], 0
+    for city_name in city_names:
+        start_time = time.perf_counter()
+        raw_weather_data = weather_service.fetch_weather_data(city_name)
+        fetch_times.append((time.perf_counter() - start_time) * 1000)
+        if raw_weather_data is None:
+            failed_fetches += 1
+    fetch_summary = summarize_samples(fetch_times)
+    fetch_summary["failures"] = failed_fetches
+    return fetch_summary
+
+
+def benchmark_processing_throughput(weather_service, raw_payloads: List[Dict], rounds: int,
+                                    payloads_per_round: int) -> Dict:
+    """Time process_weather_information over raw payloads; reports payloads/s of the median round"""
+    round_rates = []
+    for _ in range(rounds):
+        start_time = time.perf_counter()
+        for payload_index in range(payloads_per_round):
+            weather_service.process_weather_information(raw_payloads[payload_index % len(raw_payloads)])
+        round_rates.append(payloads_per_round / (time.perf_counter() - start_time))
+    return {
+        "unit": "payloads/s",
+        "better": "higher",
+        "value": statistics.median(round_rates),
+        "min": min(round_rates),
+        "max": max(round_rates),
+        "rounds": rounds,
+        "payloads_per_round": payloads_per_round,
+    }
+
+
+def benchmark_chart_renders(render_chart, readings: List, render_count: int) -> Dict:
+    """Time a WeatherChartGenerator method over distinct readings, so every call renders"""
+    render_times = []
+    for render_index in range(render_count):
+        # Nudge the temperature so the content-keyed chart cache never answers
+        weather_info = dict(readings[render_index % len(readings)])
+        weather_info["current_temperature"] += render_index / 100
+        start_time = time.perf_counter()
+        render_chart(weather_info)
+        render_times.append((time.perf_counter() - start_time) * 1000)
+    return summarize_samples(render_times)
+
+
+async def benchmark_search(weather_service, chart_engine, city_names: List[str]) -> Dict:
+    """Time the dashboard's search path: async lookup, overview PNG from the engine, base64 for the page"""
+    search_times, failed_searches = [], 0
+    for city_name in city_names:
+        start_time = time.perf_counter()
+        weather_data = await weather_service.get_complete_weather_info(city_name)
+        if weather_data is None:
+            failed_searches += 1
+            continue
+        chart_png_bytes = await asyncio.wrap_future(chart_engine.submit_overview_chart_png(weather_data))
+        base64.b64encode(chart_png_bytes).decode("ascii")
+        search_times.append((time.perf_counter() - start_time) * 1000)
+    search_summary = summarize_samples(search_times)
+    search_summary["failures"] = failed_searches
+    return search_summary
+
+
+def run_suite(arguments, stub_server: StubOpenWeatherServer, scratch_directory: str) -> Dict:
+    """Run every benchmark and return the measurements"""
+    from backend.async_weather_service import AsyncWeatherDataService
+    from backend.chart_cache import ChartImageCache
+    from backend.chart_generator import ChartRenderingEngine, WeatherChartGenerator
+    from backend.metrics import weather_metrics
+    from backend.observation_store import ObservationHistoryStore
+    from backend.persistent_cache import PersistentResponseCache
+    from backend.weather_cache import WeatherResponseCache
+    from backend.weather_service import WeatherDataService
+    from config.settings import (
+        CHART_CACHE_MAX_MEMORY_BYTES, PERSISTENT_CACHE_MAX_AGE_SECONDS, PERSISTENT_CACHE_MAX_BYTES
+    )
+
+    weather_metrics.reset()
+    # Per-call INFO records would be timed along with the code under test
+    logging.disable(logging.INFO)
+
+    def scratch_stores(store_name: str) -> Dict:
+        """History store and on-disk response cache in the scratch directory, as the app would use them"""
+        return {
+            "history_store": ObservationHistoryStore(os.path.join(scratch_directory, store_name, "history")),
+            "persistent_cache": PersistentResponseCache(
+                os.path.join(scratch_directory, store_name, "responses.sqlite3"),
+                PERSISTENT_CACHE_MAX_AGE_SECONDS, PERSISTENT_CACHE_MAX_BYTES
+            ),
+        }
+
+    def scratch_chart_cache(cache_name: str) -> ChartImageCache:
+        return ChartImageCache(CHART_CACHE_MAX_MEMORY_BYTES, os.path.join(scratch_directory, cache_name))
+
+    measurements = {}
+    recorded_payloads = stub_server.recorded_payloads
+    weather_service = WeatherDataService(**scratch_stores("sync"))
+    try:
+        fetch_cities = benchmark_city_names(recorded_payloads, arguments.fetches, "Fetchville")
+        print(f"fetch latency ({len(fetch_cities)} requests)...", file=sys.stderr, flush=True)
+        measurements["fetch_latency"] = benchmark_fetch_latency(weather_service, fetch_cities)
+
+        raw_payloads = list(recorded_payloads["weather"].values()) or [build_current_weather_payload("Processville")]
+        print("processing throughput...", file=sys.stderr, flush=True)
+        measurements["processing_throughput"] = benchmark_processing_throughput(
+            weather_service, raw_payloads, arguments.processing_rounds, arguments.processing_payloads
+        )
+        readings = [weather_service.process_weather_information(raw_payload) for raw_payload in raw_payloads]
+    finally:
+        weather_service.close()
+
+    chart_generator = WeatherChartGenerator(chart_cache=scratch_chart_cache("generator_charts"))
+    for measurement_name, render_chart in (
+        ("overview_chart_render", chart_generator.create_weather_overview_chart),
+        ("simple_temperature_chart_render", chart_generator.create_simple_temperature_chart),
+    ):
+        print(f"{measurement_name} ({arguments.renders} renders)...", file=sys.stderr, flush=True)
+        # One untimed render loads fonts and builds the figure, which only the first chart of a run pays
+        render_chart(dict(readings[0], current_temperature=-273.0))
+        measurements[measurement_name] = benchmark_chart_renders(render_chart, readings, arguments.renders)
+
+    search_cities = benchmark_city_names(recorded_payloads, arguments.searches, "Searchville")
+    async_weather_service = AsyncWeatherDataService(
+        response_cache=WeatherResponseCache(3600, len(search_cities) + 1),
+        stale_while_revalidate=False,
+        **scratch_stores("async")
+    )
+    chart_engine = ChartRenderingEngine(chart_cache=scratch_chart_cache("engine_charts"))
+
+    async def run_searches():
+        try:
+            # First pass: every city is fetched and drawn; second pass: both caches answer
+            print(f"end-to-end search ({len(search_cities)} cities, cold then cached)...", file=sys.stderr, flush=True)
+            measurements["search_cold"] = await benchmark_search(async_weather_service, chart_engine, search_cities)
+            measurements["search_cached"] = await benchmark_search(async_weather_service, chart_engine, search_cities)
+        finally:
+            await async_weather_service.close()
+
+    try:
+        asyncio.run(run_searches())
+    finally:
+        chart_engine.shutdown()
+
+    return {"measurements": measurements, "stages": weather_metrics.get_stats()}
+
+
+def git_revision() -> Optional[Dict]:
+    """Commit and dirty flag of the working tree, when it is a git checkout"""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], cwd=project_root, capture_output=True,
+                                text=True, check=True).stdout.strip()
+        changed_files = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=project_root,
+                                       capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return {"commit": commit, "dirty": bool(changed_files)}
+
+
+def compare_results(current_result: Dict, previous_result: Dict, regression_threshold: float) -> List[str]:
+    """
+    Print every compared statistic next to the previous run's value
+
+    Args:
+        current_result (Dict): Result of this run
+        previous_result (Dict): Result loaded from an earlier run's file
+        regression_threshold (float): Relative change counted as a regression, e.g. 0.10 for 10 %
+
+    Returns:
+        List[str]: "<measurement>.<statistic>" for every regression found
+    """
+    regressions = []
+    previous_measurements = previous_result.get("measurements", {})
+    previous_revision = (previous_result.get("metadata", {}).get("git") or {}).get("commit", "unknown")
+    print(f"\nCompared with {previous_revision[:12]} ({previous_result.get('metadata', {}).get('timestamp')}):")
+    for measurement_name, measurement in current_result["measurements"].items():
+        previous_measurement = previous_measurements.get(measurement_name)
+        if previous_measurement is None:
+            print(f"  {measurement_name:<34} new measurement")
+            continue
+        for statistic in COMPARED_STATISTICS:
+            current_value, previous_value = measurement.get(statistic), previous_measurement.get(statistic)
+            if current_value is None or not previous_value:
+                continue
+            relative_change = (current_value - previous_value) / previous_value
+            got_worse = relative_change > regression_threshold if measurement["better"] == "lower" \
+                else relative_change < -regression_threshold
+            if got_worse:
+                regressions.append(f"{measurement_name}.{statistic}")
+            print(f"  {measurement_name + '.' + statistic:<34} {previous_value:12.2f} -> {current_value:12.2f} "
+                  f"{measurement['unit']:<11} {relative_change:+7.1%}{'  REGRESSION' if got_worse else ''}")
+    return regressions
+
+
+def print_measurements(measurements: Dict):
+    for measurement_name, measurement in measurements.items():
+        if "value" in measurement:
+            print(f"{measurement_name:<32} {measurement['value']:12.1f} {measurement['unit']}")
+            continue
+        failures = f"   failures {measurement['failures']}" if measurement.get("failures") else ""
+        print(f"{measurement_name:<32} p50 {measurement['p50']:9.2f}   p90 {measurement['p90']:9.2f}   "
+              f"mean {measurement['mean']:9.2f} {measurement['unit']}   (n={measurement['count']}){failures}")
+
+
+def main():
+    argument_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    argument_parser.add_argument("--quick", action="store_true", help="Fewer iterations, for a smoke run")
+    argument_parser.add_argument("--fetches", type=int, help="API fetches timed (default 100, quick 20)")
+    argument_parser.add_argument("--renders", type=int, help="Renders timed per chart type (default 20, quick 3)")
+    argument_parser.add_argument("--searches", type=int, help="Cities searched end to end (default 20, quick 4)")
+    argument_parser.add_argument("--processing-rounds", type=int, default=5)
+    argument_parser.add_argument("--processing-payloads", type=int, help="Payloads per processing round "
+                                                                         "(default 20000, quick 2000)")
+    argument_parser.add_argument("--latency-ms", type=float, default=20.0, help="Stub API response delay")
+    argument_parser.add_argument("--jitter-ms", type=float, default=0.0, help="Random extra stub delay, up to this much")
+    argument_parser.add_argument("--error-rate", type=float, default=0.0, help="Share of stub responses that are errors")
+    argument_parser.add_argument("--error-status", type=int, default=503, help="Status of injected errors")
+    argument_parser.add_argument("--recorded", default=RECORDED_PAYLOADS_PATH, help="Recorded payloads to replay")
+    argument_parser.add_argument("--seed", type=int, default=7)
+    argument_parser.add_argument("--output", help="Result file (default benchmarks/results/<timestamp>.json)")
+    argument_parser.add_argument("--compare", metavar="PREVIOUS_JSON", help="Earlier result file to compare against")
+    argument_parser.add_argument("--regression-threshold", type=float, default=0.10,
+                                 help="Relative change flagged as a regression")
+    argument_parser.add_argument("--fail-on-regression", action="store_true",
+                                 help="Exit with status 1 when --compare finds a regression")
+    arguments = argument_parser.parse_args()
+
+    for option_name, default_count, quick_count in (("fetches", 100, 20), ("renders", 20, 3),
+                                                    ("searches", 20, 4), ("processing_payloads", 20000, 2000)):
+        if getattr(arguments, option_name) is None:
+            setattr(arguments, option_name, quick_count if arguments.quick else default_count)
+
+    stub_server = StubOpenWeatherServer(
+        latency_seconds=arguments.latency_ms / 1000, jitter_seconds=arguments.jitter_ms / 1000,
+        error_rate=arguments.error_rate, error_status=arguments.error_status,
+        recorded_payloads=load_recorded_payloads(arguments.recorded) if arguments.recorded else None,
+        seed=arguments.seed
+    ).start()
+    # Settings are read at import, so the stub must be configured before the services load
+    os.environ["OPENWEATHER_API_ROOT"] = stub_server.api_root
+    os.environ["OPENWEATHER_API_KEY"] = "offline-benchmark"
+
+    scratch_directory = tempfile.mkdtemp(prefix="weather-bench-")
+    run_start = time.perf_counter()
+    try:
+        suite_result = run_suite(arguments, stub_server, scratch_directory)
+    finally:
+        stub_server.stop()
+        shutil.rmtree(scratch_directory, ignore_errors=True)
+
+    benchmark_result = {
+        "format_version": RESULT_FORMAT_VERSION,
+        "metadata": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "git": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "duration_seconds": time.perf_counter() - run_start,
+            "stub": stub_server.describe(),
+            "upstream_requests": dict(stub_server.request_counts),
+            "arguments": vars(arguments),
+        },
+        **suite_result,
+    }
+
+    print_measurements(benchmark_result["measurements"])
+    output_path = arguments.output or os.path.join(
+        RESULTS_DIRECTORY, f"benchmark_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    with open(output_path, "w", encoding="utf-8") as output_file:
+        json.dump(benchmark_result, output_file, indent=2)
+    print(f"\nResults written to {output_path}")
+
+    if arguments.compare:
+        with open(arguments.compare, encoding="utf-8") as previous_file:
+            regressions = compare_results(benchmark_result, json.load(previous_file), arguments.regression_threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) above {arguments.regression_threshold:.0%}: "
+                  f"{', '.join(regressions)}")
+            if arguments.fail_on_regression:
+                sys.exit(1)
+        else:
+            print(f"\nNo regressions above {arguments.regression_threshold:.0%}")
+
+
+if __name__ == "__main__":
+    main()
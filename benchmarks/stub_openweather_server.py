@@ -0,0 +1,263 @@
+"""
+Local stand-in for the OpenWeatherMap API, for load tests and benchmarks
+
+Serves /weather, /group and /forecast. Cities found in a recorded payload file
+(see record_openweather_payloads.py) are answered with their recorded payloads,
+every other city with deterministic synthetic ones. Responses wait a fixed
+latency plus optional random jitter, and a share of them can be replaced by
+error responses (429 with Retry-After, or 5xx) to exercise retries.
+Point the app at it with OPENWEATHER_API_ROOT.
+
+Usage:
+    python benchmarks/stub_openweather_server.py [--port 8099] [--latency-ms 80] [--jitter-ms 0]
+                                                 [--error-rate 0.0] [--error-status 503]
+                                                 [--recorded benchmarks/fixtures/recorded_payloads.json]
+"""
+import argparse
+import json
+import os
+import random
+import threading
+import time
+import zlib
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+from urllib.parse import parse_qs, urlparse
+
+STUB_START_TIME = 1760000000
+RECORDED_PAYLOADS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "recorded_payloads.json")
+CONDITIONS = (("Clear", "clear sky"), ("Clouds", "broken clouds"), ("Rain", "light rain"), ("Snow", "light snow"))
+
+
+def city_seed(city_name: str) -> int:
+    """Stable per-city number so every city gets its own, repeatable weather"""
+    return zlib.crc32(city_name.casefold().encode("utf-8"))
+
+
+def build_current_weather_payload(city_name: str, city_id: Optional[int] = None) -> Dict:
+    """Build a /weather payload shaped like OpenWeatherMap's"""
+    seed = city_seed(city_name)
+    condition_main, condition_description = CONDITIONS[seed % len(CONDITIONS)]
+    return {
+        "coord": {"lon": (seed % 360) - 180.0, "lat": (seed % 180) - 90.0},
+        "weather": [{"id": 800, "main": condition_main, "description": condition_description, "icon": "01d"}],
+        "main": {"temp": round((seed % 450) / 10 - 10, 2), "feels_like": round((seed % 430) / 10 - 11, 2),
+                 "pressure": 980 + seed % 60, "humidity": 20 + seed % 80},
+        "visibility": 1000 * (1 + seed % 10),
+        "wind": {"speed": round((seed % 150) / 10, 2), "deg": seed % 360},
+        "clouds": {"all": seed % 101},
+        "dt": STUB_START_TIME,
+        "sys": {"country": "ZZ"},
+        "id": city_id if city_id is not None else seed % 10_000_000,
+        "name": city_name,
+    }
+
+
+def build_forecast_payload(city_name: str) -> Dict:
+    """Build a 40-slot /forecast payload shaped like OpenWeatherMap's"""
+    seed = city_seed(city_name)
+    forecast_slots = []
+    for slot_index in range(40):
+        base_temperature = (seed % 300) / 10 - 5 + 4 * ((slot_index % 8) - 4) / 4
+        forecast_slots.append({
+            "dt": STUB_START_TIME + slot_index * 10800,
+            "main": {"temp": base_temperature, "temp_min": base_temperature - 1, "temp_max": base_temperature + 1,
+                     "feels_like": base_temperature - 2, "humidity": 20 + (seed + slot_index) % 80,
+                     "pressure": 990 + (seed + slot_index) % 40},
+            "wind": {"speed": ((seed + slot_index) % 120) / 10},
+            "clouds": {"all": (seed + slot_index) % 101},
+            "rain": {"3h": ((seed + slot_index) % 7) / 10},
+            "pop": ((seed + slot_index) % 11) / 10,
+        })
+    return {"list": forecast_slots, "city": {"name": city_name, "country": "ZZ", "timezone": 0}}
+
+
+def load_recorded_payloads(recorded_payloads_path: str = RECORDED_PAYLOADS_PATH) -> Dict:
+    """
+    Load recorded API responses for replay
+
+    Args:
+        recorded_payloads_path (str): JSON file {"weather": {city: payload}, "forecast": {city: payload}}
+
+    Returns:
+        Dict: {"weather": {name: payload}, "weather_by_id": {id: payload}, "forecast": {name: payload}},
+              names case-folded
+    """
+    with open(recorded_payloads_path, encoding="utf-8") as recorded_file:
+        recorded_responses = json.load(recorded_file)
+    weather_payloads = recorded_responses.get("weather", {})
+    return {
+        "weather": {city_name.casefold(): payload for city_name, payload in weather_payloads.items()},
+        "weather_by_id": {payload["id"]: payload for payload in weather_payloads.values() if "id" in payload},
+        "forecast": {city_name.casefold(): payload
+                     for city_name, payload in recorded_responses.get("forecast", {}).items()},
+    }
+
+
+class _StubRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real API
+    # Headers and body go out in separate writes; without TCP_NODELAY the body waits ~40 ms for a delayed ACK
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        stub_server: "StubOpenWeatherServer" = self.server.stub
+        request_url = urlparse(self.path)
+        query = {name: values[0] for name, values in parse_qs(request_url.query).items()}
+        endpoint = request_url.path.rstrip("/").rsplit("/", 1)[-1]
+        stub_server.count_request(endpoint)
+
+        response_delay_seconds, injected_error = stub_server.draw_response_behaviour()
+        if response_delay_seconds:
+            time.sleep(response_delay_seconds)
+
+        if injected_error:
+            stub_server.count_request("injected_errors")
+            error_headers = {}
+            if stub_server.error_status == 429:
+                error_headers["Retry-After"] = str(stub_server.retry_after_seconds)
+            self._send_json(stub_server.error_status,
+                            {"cod": str(stub_server.error_status), "message": "injected error"}, error_headers)
+        elif endpoint == "weather" and "q" in query:
+            self._send_json(200, stub_server.current_weather_payload(query["q"]))
+        elif endpoint == "weather" and "id" in query:
+            self._send_json(200, stub_server.current_weather_payload(f"City {query['id']}", int(query["id"])))
+        elif endpoint == "group" and "id" in query:
+            city_ids = [int(city_id) for city_id in query["id"].split(",") if city_id.strip().isdigit()]
+            payloads = [stub_server.current_weather_payload(f"City {city_id}", city_id) for city_id in city_ids]
+            self._send_json(200, {"cnt": len(payloads), "list": payloads})
+        elif endpoint == "forecast" and "q" in query:
+            self._send_json(200, stub_server.forecast_payload(query["q"]))
+        else:
+            self._send_json(404, {"cod": "404", "message": "city not found"})
+
+    def _send_json(self, status_code: int, payload: Dict, extra_headers: Optional[Dict[str, str]] = None):
+        response_body = json.dumps(payload).encode("utf-8")
+        self.send_response(status_code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(response_body)))
+        for header_name, header_value in (extra_headers or {}).items():
+            self.send_header(header_name, header_value)
+        self.end_headers()
+        self.wfile.write(response_body)
+
+    def log_message(self, format, *args):
+        pass  # keep benchmark output readable
+
+
+class StubOpenWeatherServer:
+    """Threaded local HTTP server answering like the OpenWeatherMap API"""
+
+    def __init__(self, port: int = 0, latency_seconds: float = 0.0, jitter_seconds: float = 0.0,
+                 error_rate: float = 0.0, error_status: int = 503, retry_after_seconds: int = 1,
+                 recorded_payloads: Optional[Dict] = None, seed: int = 7):
+        """
+        Args:
+            port (int): Port to listen on (0 = any free port)
+            latency_seconds (float): Delay before every response
+            jitter_seconds (float): Extra delay drawn uniformly from [0, jitter_seconds]
+            error_rate (float): Share of requests answered with error_status instead of data
+            error_status (int): Status code of injected errors (429 also sends Retry-After)
+            retry_after_seconds (int): Retry-After value sent with injected 429s
+            recorded_payloads (Dict): Payloads from load_recorded_payloads, replayed for their cities
+            seed (int): Seed for jitter and error injection, so runs are repeatable
+        """
+        self.latency_seconds = latency_seconds
+        self.jitter_seconds = jitter_seconds
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.retry_after_seconds = retry_after_seconds
+        self.recorded_payloads = recorded_payloads or {"weather": {}, "weather_by_id": {}, "forecast": {}}
+        self.request_counts = Counter()
+        self._counts_lock = threading.Lock()
+        self._behaviour_random = random.Random(seed)
+        self._behaviour_lock = threading.Lock()
+
+        self._http_server = ThreadingHTTPServer(("127.0.0.1", port), _StubRequestHandler)
+        self._http_server.daemon_threads = True
+        self._http_server.stub = self
+        self._serve_thread: Optional[threading.Thread] = None
+
+    @property
+    def api_root(self) -> str:
+        """Value for OPENWEATHER_API_ROOT"""
+        host, port = self._http_server.server_address[:2]
+        return f"http://{host}:{port}/data/2.5"
+
+    def count_request(self, endpoint: str):
+        with self._counts_lock:
+            self.request_counts[endpoint] += 1
+
+    def draw_response_behaviour(self):
+        """Return (delay in seconds, whether to answer with an injected error) for one request"""
+        with self._behaviour_lock:
+            jitter = self._behaviour_random.uniform(0, self.jitter_seconds) if self.jitter_seconds else 0.0
+            injected_error = bool(self.error_rate) and self._behaviour_random.random() < self.error_rate
+        return self.latency_seconds + jitter, injected_error
+
+    def current_weather_payload(self, city_name: str, city_id: Optional[int] = None) -> Dict:
+        """Recorded /weather payload for the city if there is one, else a synthetic payload"""
+        if city_id is not None:
+            recorded_payload = self.recorded_payloads["weather_by_id"].get(city_id)
+        else:
+            recorded_payload = self.recorded_payloads["weather"].get(city_name.casefold())
+        return recorded_payload or build_current_weather_payload(city_name, city_id)
+
+    def forecast_payload(self, city_name: str) -> Dict:
+        """Recorded /forecast payload for the city if there is one, else a synthetic payload"""
+        return self.recorded_payloads["forecast"].get(city_name.casefold()) or build_forecast_payload(city_name)
+
+    def describe(self) -> Dict:
+        """Settings of this stub, for benchmark reports"""
+        return {
+            "latency_ms": self.latency_seconds * 1000,
+            "jitter_ms": self.jitter_seconds * 1000,
+            "error_rate": self.error_rate,
+            "error_status": self.error_status,
+            "recorded_cities": sorted(self.recorded_payloads["weather"]),
+        }
+
+    def serve_forever(self):
+        """Serve on the calling thread until stop()"""
+        self._http_server.serve_forever()
+
+    def start(self) -> "StubOpenWeatherServer":
+        """Serve on a background thread"""
+        self._serve_thread = threading.Thread(target=self.serve_forever,
+                                              name="stub-openweather", daemon=True)
+        self._serve_thread.start()
+        return self
+
+    def stop(self):
+        """Stop serving and close the socket"""
+        self._http_server.shutdown()
+        self._http_server.server_close()
+
+
+def main():
+    argument_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    argument_parser.add_argument("--port", type=int, default=8099)
+    argument_parser.add_argument("--latency-ms", type=float, default=80.0, help="Delay before every response")
+    argument_parser.add_argument("--jitter-ms", type=float, default=0.0, help="Random extra delay, up to this much")
+    argument_parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests answered with an error")
+    argument_parser.add_argument("--error-status", type=int, default=503, help="Status of injected errors (e.g. 429, 500, 503)")
+    argument_parser.add_argument("--recorded", default=RECORDED_PAYLOADS_PATH,
+                                 help="Recorded payloads to replay ('' = synthetic payloads only)")
+    argument_parser.add_argument("--seed", type=int, default=7)
+    arguments = argument_parser.parse_args()
+
+    stub_server = StubOpenWeatherServer(
+        arguments.port, arguments.latency_ms / 1000, arguments.jitter_ms / 1000,
+        error_rate=arguments.error_rate, error_status=arguments.error_status,
+        recorded_payloads=load_recorded_payloads(arguments.recorded) if arguments.recorded else None,
+        seed=arguments.seed
+    )
+    print(f"Serving stub API, set OPENWEATHER_API_ROOT={stub_server.api_root}")
+    try:
+        stub_server.serve_forever()
+    except KeyboardInterrupt:
+        stub_server.stop()
+
+
+if __name__ == "__main__":
+    main()
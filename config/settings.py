@@ -4,10 +4,14 @@ from dotenv import load_dotenv
 load_dotenv()
 
 OPENWEATHER_API_KEY = os.getenv("OPENWEATHER_API_KEY")
-OPENWEATHER_BASE_URL = "http://api.openweathermap.org/data/2.5/weather"
+# Point OPENWEATHER_API_ROOT at a local stub (see benchmarks/stub_openweather_server.py) for load tests
+OPENWEATHER_API_ROOT = os.getenv("OPENWEATHER_API_ROOT", "http://api.openweathermap.org/data/2.5").rstrip("/")
+OPENWEATHER_BASE_URL = f"{OPENWEATHER_API_ROOT}/weather"
+OPENWEATHER_GROUP_URL = f"{OPENWEATHER_API_ROOT}/group"
+OPENWEATHER_FORECAST_URL = f"{OPENWEATHER_API_ROOT}/forecast"
 
-if not OPENWEATHER_API_KEY:
-    raise ValueError("OPENWEATHER_API_KEY not found in environment variables. Please check your .env file.")
+# A missing key is reported when the weather service is created, not at import time,
+# so the window can open (and show the error) without a configured key
 
 APP_TITLE = "Weather Data Visualization Dashboard"
 WINDOW_WIDTH = 800
@@ -27,3 +31,73 @@ CHART_FILENAME = "current_weather_chart.png"
 
 # Weather Data Units
 TEMPERATURE_UNIT = "metric"  # metric, imperial, or kelvin
+
+# Response Cache
+WEATHER_CACHE_TTL_SECONDS = 600  # OpenWeatherMap refreshes current data roughly every 10 minutes
+WEATHER_CACHE_MAX_ENTRIES = 512
+WEATHER_CACHE_STALE_WHILE_REVALIDATE = True  # Serve expired entries immediately and refresh in background
+
+# Persistent Cache
+PERSISTENT_CACHE_ENABLED = True  # Keep raw API payloads on disk: warm restarts and last-known-good readings during outages
+PERSISTENT_CACHE_PATH = "assets/cache/weather_responses.sqlite3"
+PERSISTENT_CACHE_MAX_AGE_SECONDS = 7 * 24 * 3600  # Older payloads are deleted
+PERSISTENT_CACHE_MAX_BYTES = 64 * 1024 * 1024  # Oldest payloads are deleted beyond this total size
+
+# HTTP Transport
+HTTP_POOL_CONNECTIONS = 4  # Number of host pools kept alive
+HTTP_POOL_MAXSIZE = 16  # Concurrent keep-alive connections per host
+HTTP_MAX_RETRIES = 3  # Retries for connection errors and 429/5xx responses
+HTTP_BACKOFF_FACTOR = 0.5  # Exponential backoff base in seconds; Retry-After takes precedence
+HTTP_TIMEOUT_SECONDS = 10
+HTTP_MAX_RETRY_AFTER_SECONDS = HTTP_TIMEOUT_SECONDS  # Longer Retry-After waits are cut short
+
+# Bulk Fetching
+BULK_FETCH_MAX_CONCURRENCY = 8  # Parallel API calls for multi-city lookups
+GROUP_REQUEST_MAX_IDS = 20  # OpenWeatherMap limit for city IDs per group request
+
+# Chart Rendering
+CHART_REUSE_FIGURE = True  # Update one persistent overview figure instead of rebuilding it per search
+CHART_DPI = 150
+CHART_STYLE = "seaborn-v0_8"
+CHART_RENDER_WORKERS = 4  # Size of the chart rendering pool
+CHART_RENDER_USE_PROCESSES = False  # Use a process pool instead of threads to render on all cores
+CHART_RENDERER = os.getenv("WEATHER_CHART_RENDERER", "matplotlib")  # "matplotlib" (PNG image) or "flet" (native chart controls)
+
+# City Comparison
+COMPARISON_LAYOUT = "small_multiples"  # "bars" (grouped), "heatmap" or "small_multiples"
+COMPARISON_MAX_LABELLED_CITIES = 60  # With more cities only every n-th name is shown, so labels never overlap
+COMPARISON_ANNOTATE_MAX_CITIES = 30  # Values are written on bars and heatmap cells up to this many cities
+COMPARISON_INCHES_PER_CITY = 0.25
+COMPARISON_MAX_HEIGHT_INCHES = 30  # Several hundred cities still fit one readable figure
+
+# Chart Cache
+CHART_CACHE_DIRECTORY = "assets/charts/cache"  # Content-addressed PNGs spilled from memory
+CHART_CACHE_MAX_MEMORY_BYTES = 32 * 1024 * 1024
+CHART_CACHE_MAX_DISK_BYTES = 256 * 1024 * 1024  # Oldest spilled PNGs are deleted beyond this total size
+
+# Observation History
+HISTORY_ENABLED = True  # Append every fetched reading to the local history store
+HISTORY_DIRECTORY = "assets/history"
+
+# Web Serving
+WEB_SERVER_PORT = 8080  # Port used by `python main.py --web`
+
+# Background Refresh
+REFRESH_CALLS_PER_MINUTE = 60  # OpenWeatherMap plan budget shared by searches and background refreshes
+REFRESH_BURST_CAPACITY = 10  # Calls that may be made back-to-back before the per-minute rate applies
+REFRESH_USER_RESERVED_TOKENS = 2  # Background refreshes never spend the last tokens, keeping them for searches
+REFRESH_INTERVAL_SECONDS = 540  # Refresh watched cities a little before WEATHER_CACHE_TTL_SECONDS runs out
+REFRESH_WORKERS = 2
+WATCHED_CITIES = [city.strip() for city in os.getenv("WEATHER_WATCHED_CITIES", "").split(",") if city.strip()]
+
+# Batch Export
+EXPORT_OUTPUT_DIRECTORY = "exports"  # Default output of `python main.py --export cities.txt`
+EXPORT_PROGRESS_EVERY = 500  # Cities between progress lines (0 = quiet)
+
+# Metrics
+METRICS_ENABLED = True  # Per-stage latency histograms and counters (a few microseconds per stage)
+METRICS_PORT = int(os.getenv("WEATHER_METRICS_PORT", "0"))  # Serve /metrics on this local port; 0 = no endpoint
+
+# City Index
+CITY_LIST_PATH = "assets/city.list.json.gz"  # http://bulk.openweathermap.org/sample/city.list.json.gz; searches go by name if missing
+CITY_SUGGESTION_LIMIT = 8
@@ -0,0 +1,243 @@
+import flet as ft
+import asyncio
+import base64
+from typing import Callable, Dict, List, Mapping, Sequence
+
+from backend.chart_data import (
+    TEMPERATURE_LABELS, ATMOSPHERIC_LABELS, WIND_VISIBILITY_LABELS,
+    TEMPERATURE_COLORS, ATMOSPHERIC_COLORS, WIND_VISIBILITY_COLORS,
+    overview_chart_values, overview_summary_text
+)
+from backend.metrics import timed
+from backend.shared_services import get_shared_chart_engine, peek_shared_chart_engine
+from config.settings import CHART_RENDERER
+
+# Headroom above the tallest bar so value labels and tooltips stay inside the chart
+AXIS_HEADROOM = 1.15
+
+
+class OverviewChartRenderer:
+    """
+    Draws the weather overview chart for one dashboard session
+
+    A renderer owns the control placed in the page layout and changes it in
+    place for every search; the dashboard only pushes the controls it returns.
+    """
+
+    renderer_name = ""
+
+    def build_control(self) -> ft.Control:
+        """Create the control placed in the page layout (hidden until the first chart)"""
+        raise NotImplementedError
+
+    def warm_up(self):
+        """Load whatever the first chart would otherwise wait for; called off the UI thread"""
+
+    async def show(self, weather_info: Mapping, before_wait: Callable[[], None]) -> List[ft.Control]:
+        """
+        Draw a reading into the chart control
+
+        Args:
+            weather_info (Mapping): Processed weather information (WeatherObservation or dict)
+            before_wait (Callable): Called before any wait, so the page can show what is ready
+
+        Returns:
+            List[ft.Control]: Controls that changed and need a page update
+        """
+        raise NotImplementedError
+
+
+class MatplotlibOverviewRenderer(OverviewChartRenderer):
+    """Overview rendered to PNG on the shared rendering pool and shown as an image"""
+
+    renderer_name = "matplotlib"
+
+    def __init__(self):
+        self.chart_image = None
+
+    def build_control(self) -> ft.Control:
+        self.chart_image = ft.Image(
+            width=600,
+            height=400,
+            fit=ft.ImageFit.CONTAIN,
+            visible=False
+        )
+        return self.chart_image
+
+    def warm_up(self):
+        # The plotting stack loads with the engine
+        get_shared_chart_engine()
+
+    async def show(self, weather_info: Mapping, before_wait: Callable[[], None]) -> List[ft.Control]:
+        chart_engine = peek_shared_chart_engine()
+        if chart_engine is None:
+            # Building the engine imports matplotlib; do it (or wait for the warm-up doing it) off the loop
+            chart_engine = await asyncio.to_thread(get_shared_chart_engine)
+        chart_future = chart_engine.submit_overview_chart_png(weather_info)
+        if not chart_future.done():
+            before_wait()
+        chart_png_bytes = await asyncio.wrap_future(chart_future)
+
+        with timed("png_base64"):
+            self.chart_image.src_base64 = base64.b64encode(chart_png_bytes).decode("ascii")
+        self.chart_image.visible = True
+        return [self.chart_image]
+
+
+class _OverviewBarChart:
+    """One native bar chart of the overview whose rods are moved in place"""
+
+    def __init__(self, axis_labels: Sequence[str], bar_colors: Sequence[str], value_suffixes: Sequence[str]):
+        self.value_suffixes = value_suffixes
+        self.bar_rods = [
+            ft.BarChartRod(from_y=0, to_y=0, width=36, color=bar_color, border_radius=4)
+            for bar_color in bar_colors
+        ]
+        # Bottom labels carry the value too, like the value labels on the matplotlib bars
+        self.value_texts = [
+            ft.Text(axis_label, size=11, text_align=ft.TextAlign.CENTER)
+            for axis_label in axis_labels
+        ]
+        self.axis_labels = list(axis_labels)
+        self.bar_chart = ft.BarChart(
+            bar_groups=[
+                ft.BarChartGroup(x=bar_index, bar_rods=[bar_rod])
+                for bar_index, bar_rod in enumerate(self.bar_rods)
+            ],
+            bottom_axis=ft.ChartAxis(
+                labels=[
+                    ft.ChartAxisLabel(value=bar_index, label=value_text)
+                    for bar_index, value_text in enumerate(self.value_texts)
+                ],
+                labels_size=40
+            ),
+            left_axis=ft.ChartAxis(labels_size=40),
+            horizontal_grid_lines=ft.ChartGridLines(color=ft.colors.GREY_300, width=1),
+            tooltip_bgcolor=ft.colors.with_opacity(0.8, ft.colors.GREY_800),
+            min_y=0,
+            max_y=1,
+            interactive=True,
+            height=200,
+            expand=True
+        )
+
+    def set_values(self, values: Sequence[float]):
+        """Move the rods to new values and rescale the axis"""
+        for bar_rod, value_text, axis_label, value_suffix, value in zip(
+            self.bar_rods, self.value_texts, self.axis_labels, self.value_suffixes, values
+        ):
+            value_label = f"{round(value, 1)}{value_suffix}"
+            bar_rod.to_y = value
+            bar_rod.tooltip = value_label
+            value_text.value = f"{axis_label}\n{value_label}"
+        self.bar_chart.min_y = min(0, min(values) * AXIS_HEADROOM)
+        self.bar_chart.max_y = max(values) * AXIS_HEADROOM if max(values) > 0 else 1
+
+
+def _chart_panel(title: str, content: ft.Control) -> ft.Container:
+    return ft.Container(
+        content=ft.Column(
+            controls=[ft.Text(title, weight=ft.FontWeight.BOLD), content],
+            horizontal_alignment=ft.CrossAxisAlignment.CENTER
+        ),
+        width=290,
+        padding=ft.padding.all(5)
+    )
+
+
+class FletOverviewRenderer(OverviewChartRenderer):
+    """
+    Overview built from native Flet chart controls and updated in place
+
+    The controls are created once per session; a new reading only changes rod
+    heights, labels, axis ranges and the summary text, so an update sends a
+    few hundred bytes of changed properties instead of a fresh PNG.
+    """
+
+    renderer_name = "flet"
+
+    def __init__(self):
+        self.chart_view = None
+        self.title_text = None
+        self.summary_text = None
+        self.temperature_chart = None
+        self.atmospheric_chart = None
+        self.wind_visibility_chart = None
+
+    def build_control(self) -> ft.Control:
+        self.title_text = ft.Text("Weather Dashboard", size=16, weight=ft.FontWeight.BOLD)
+        self.temperature_chart = _OverviewBarChart(TEMPERATURE_LABELS, TEMPERATURE_COLORS, ["°C", "°C"])
+        self.atmospheric_chart = _OverviewBarChart(ATMOSPHERIC_LABELS, ATMOSPHERIC_COLORS, ["", "", ""])
+        self.wind_visibility_chart = _OverviewBarChart(WIND_VISIBILITY_LABELS, WIND_VISIBILITY_COLORS, ["", ""])
+        self.summary_text = ft.Text("", size=12)
+
+        self.chart_view = ft.Container(
+            content=ft.Column(
+                controls=[
+                    self.title_text,
+                    ft.Row(
+                        controls=[
+                            _chart_panel("Temperature (°C)", self.temperature_chart.bar_chart),
+                            _chart_panel("Atmospheric Conditions", self.atmospheric_chart.bar_chart)
+                        ],
+                        alignment=ft.MainAxisAlignment.CENTER
+                    ),
+                    ft.Row(
+                        controls=[
+                            _chart_panel("Wind & Visibility", self.wind_visibility_chart.bar_chart),
+                            ft.Container(
+                                content=self.summary_text,
+                                bgcolor=ft.colors.LIGHT_BLUE_100,
+                                border_radius=8,
+                                padding=ft.padding.all(10),
+                                width=290
+                            )
+                        ],
+                        alignment=ft.MainAxisAlignment.CENTER,
+                        vertical_alignment=ft.CrossAxisAlignment.START
+                    )
+                ],
+                horizontal_alignment=ft.CrossAxisAlignment.CENTER
+            ),
+            width=600,
+            visible=False
+        )
+        return self.chart_view
+
+    def apply_weather(self, weather_info: Mapping) -> List[ft.Control]:
+        """Write a reading into the existing controls; no drawing or encoding happens here"""
+        temperature_data, atmospheric_metrics, wind_visibility_data = overview_chart_values(weather_info)
+        self.title_text.value = f"Weather Dashboard - {weather_info['city_name']}, {weather_info['country_code']}"
+        self.temperature_chart.set_values(temperature_data)
+        self.atmospheric_chart.set_values(atmospheric_metrics)
+        self.wind_visibility_chart.set_values(wind_visibility_data)
+        self.summary_text.value = overview_summary_text(weather_info).strip()
+        self.chart_view.visible = True
+        # Flet diffs the subtree, so only the changed properties go to the client
+        return [self.chart_view]
+
+    async def show(self, weather_info: Mapping, before_wait: Callable[[], None]) -> List[ft.Control]:
+        with timed("chart_controls_update"):
+            return self.apply_weather(weather_info)
+
+
+OVERVIEW_RENDERERS: Dict[str, type] = {
+    MatplotlibOverviewRenderer.renderer_name: MatplotlibOverviewRenderer,
+    FletOverviewRenderer.renderer_name: FletOverviewRenderer,
+}
+
+
+def create_overview_renderer(renderer_name: str = CHART_RENDERER) -> OverviewChartRenderer:
+    """
+    Create the overview renderer selected in the settings
+
+    Args:
+        renderer_name (str): "matplotlib" (PNG image) or "flet" (native chart controls)
+
+    Returns:
+        OverviewChartRenderer: New renderer for one session
+    """
+    renderer_class = OVERVIEW_RENDERERS.get(renderer_name)
+    if renderer_class is None:
+        raise ValueError(f"Unknown chart renderer '{renderer_name}', expected one of {sorted(OVERVIEW_RENDERERS)}")
+    return renderer_class()
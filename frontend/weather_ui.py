@@ -1,27 +1,92 @@
 import flet as ft
-import os
+import asyncio
+import logging
+import threading
+import time
 from typing import Optional
-from backend.weather_service import WeatherDataService
-from backend.chart_generator import WeatherChartGenerator
-from config.settings import APP_TITLE, WINDOW_WIDTH, WINDOW_HEIGHT
+from backend.shared_services import (
+    get_shared_city_index, get_shared_refresh_scheduler, get_shared_weather_service,
+    peek_shared_city_index, peek_shared_weather_service
+)
+from backend.metrics import increment, timed
+from frontend.chart_renderers import create_overview_renderer
+from config.settings import (
+    APP_TITLE, WINDOW_WIDTH, WINDOW_HEIGHT, WATCHED_CITIES, CITY_SUGGESTION_LIMIT
+)
+
+ui_logger = logging.getLogger(__name__)
+
+def describe_reading_age(age_seconds: float) -> str:
+    """Format how long ago a reading was observed, e.g. "12 min ago" or "3 h ago" """
+    if age_seconds < 60:
+        return "just now"
+    if age_seconds < 3600:
+        return f"{int(age_seconds // 60)} min ago"
+    if age_seconds < 86400:
+        return f"{int(age_seconds // 3600)} h ago"
+    return f"{int(age_seconds // 86400)} d ago"
 
 class WeatherDashboardUI:
-    """Main UI class for the weather dashboard"""
+    """
+    Main UI class for the weather dashboard
+    
+    One instance per page/session holds that session's controls and search
+    state; the weather service and chart engine are shared process-wide.
+    """
     
     def __init__(self):
-        self.weather_service = WeatherDataService()
-        self.chart_generator = WeatherChartGenerator()
         self.current_weather_data = None
         
+        # Search currently in flight, cancelled when a different city is requested
+        self.active_search_task: Optional[asyncio.Task] = None
+        self.active_search_key = None
+        
+        # City picked from the typeahead suggestions, searched by ID
+        self.selected_city = None
+        
+        # Controls changed since the last push; a search sends them in as few updates as possible
+        self._dirty_controls = []
+        self._update_batch_owner: Optional[asyncio.Task] = None
+        self.search_update_count = 0
+        self.completed_search_count = 0
+        self.total_update_count = 0
+        
         # UI Components
         self.city_input_field = None
+        self.city_suggestions_list = None
         self.search_button = None
         self.weather_info_display = None
-        self.weather_chart_image = None
+        self.weather_chart_view = None
+        
+        # Draws the overview chart; the backend is chosen by CHART_RENDERER
+        self.chart_renderer = create_overview_renderer()
         self.loading_indicator = None
         self.error_message_display = None
         self.page_reference = None
     
+    async def get_weather_service(self):
+        """
+        Get the shared async weather service without blocking the event loop
+        
+        The first call builds it on a worker thread: that opens the persistent cache
+        and history store, or waits for the warm-up thread already building them.
+        """
+        weather_service = peek_shared_weather_service()
+        if weather_service is None:
+            weather_service = await asyncio.to_thread(get_shared_weather_service)
+        return weather_service
+    
+    def warm_up_services(self):
+        """Load the HTTP client and chart renderer so the first search doesn't pay for it"""
+        try:
+            get_shared_weather_service()
+            self.chart_renderer.warm_up()
+            get_shared_city_index()
+            if WATCHED_CITIES:
+                get_shared_refresh_scheduler()
+        except Exception as warm_up_error:
+            ui_logger.warning(f"Background warm-up failed: {warm_up_error}")
+    
     def initialize_ui_components(self):
         """Initialize all UI components"""
         # City input field
@@ -30,9 +95,13 @@ class WeatherDashboardUI:
             hint_text="e.g., London, Tokyo, New York",
             width=300,
             autofocus=True,
+            on_change=self.handle_city_input_change,
             on_submit=self.handle_weather_search
         )
         
+        # Typeahead suggestions from the local city index
+        self.city_suggestions_list = ft.Column(spacing=0, visible=False)
+        
         # Search button
         self.search_button = ft.ElevatedButton(
             text="Get Weather Data",
@@ -59,15 +128,67 @@ class WeatherDashboardUI:
             visible=False
         )
         
-        # Weather chart image
-        self.weather_chart_image = ft.Image(
-            width=600,
-            height=400,
-            fit=ft.ImageFit.CONTAIN,
-            visible=False
-        )
+        # Weather chart (an image or native chart controls, depending on the renderer)
+        self.weather_chart_view = self.chart_renderer.build_control()
     
-    def handle_weather_search(self, event):
+    async def handle_city_input_change(self, event):
+        """Show typeahead suggestions while the user types"""
+        # Async so Flet runs it on the event loop rather than a worker thread, next to the searches
+        typed_text = self.city_input_field.value
+        if self.selected_city is not None and typed_text != self.selected_city.display_name:
+            self.selected_city = None
+        
+        # Suggestions appear once the index has loaded in the background
+        city_index = peek_shared_city_index()
+        if city_index is None:
+            return
+        self.show_city_suggestions(city_index.suggest(typed_text, CITY_SUGGESTION_LIMIT))
+    
+    def show_city_suggestions(self, city_records):
+        """Replace the suggestion list with the given cities (hidden when empty)"""
+        if not city_records and not self.city_suggestions_list.visible:
+            return
+        self.city_suggestions_list.controls = [
+            # Flet only awaits coroutine functions, so the record rides on the control instead of a lambda
+            ft.TextButton(
+                text=city_record.display_name,
+                data=city_record,
+                on_click=self.handle_suggestion_click
+            )
+            for city_record in city_records
+        ]
+        self.city_suggestions_list.visible = bool(city_records)
+        self.request_update(self.city_suggestions_list)
+    
+    async def handle_suggestion_click(self, event):
+        """Search the picked suggestion by its city ID"""
+        city_record = event.control.data
+        self.selected_city = city_record
+        self.city_input_field.value = city_record.display_name
+        self.request_update(self.city_input_field)
+        await self.handle_weather_search(event)
+    
+    async def resolve_city(self, city_name: str):
+        """
+        Resolve typed text to cities from the local index, without a network call
+        
+        Args:
+            city_name (str): Text from the search field
+            
+        Returns:
+            List[CityRecord]: Exact matches, best first (empty if the city is unknown),
+                              or None when no city list is installed
+        """
+        if self.selected_city is not None and city_name == self.selected_city.display_name:
+            return [self.selected_city]
+        
+        # The first search may have to wait for the index; load it off the event loop
+        city_index = await asyncio.to_thread(get_shared_city_index)
+        if city_index is None:
+            return None
+        return city_index.resolve(city_name)
+    
+    async def handle_weather_search(self, event):
         """Handle weather search button click or enter key press"""
         city_name = self.city_input_field.value.strip()
         
@@ -75,23 +196,138 @@ class WeatherDashboardUI:
             self.show_error_message("Please enter a city name")
             return
         
-        self.start_loading()
-        self.clear_error_message()
+        city_matches = await self.resolve_city(city_name)
+        if city_matches is not None and not city_matches:
+            # Unknown names fail locally; offer cities starting with the same letters instead
+            close_cities = peek_shared_city_index().suggest(city_name.split(",")[0][:3], CITY_SUGGESTION_LIMIT)
+            self.show_city_suggestions(close_cities)
+            self.show_error_message(f"Unknown city '{city_name}'. Check the spelling or pick a suggestion.")
+            return
+        # Several cities share the name: search the first and let the user switch between the first few
+        self.show_city_suggestions(
+            city_matches[:CITY_SUGGESTION_LIMIT] if city_matches and len(city_matches) > 1 else []
+        )
+        city_id = city_matches[0].city_id if city_matches else None
+        
+        try:
+            weather_service = await self.get_weather_service()
+            search_key = weather_service.weather_cache_key(city_name, city_id)
+        except ValueError as configuration_error:
+            self.show_error_message(str(configuration_error))
+            return
+        
+        if self.active_search_task is not None and not self.active_search_task.done():
+            if search_key == self.active_search_key:
+                return  # Same city already loading
+            self.active_search_task.cancel()
         
-        # Fetch weather data
-        weather_data = self.weather_service.get_complete_weather_info(city_name)
+        search_task = asyncio.create_task(self.run_weather_search(city_name, city_id))
+        self.active_search_task = search_task
+        self.active_search_key = search_key
         
-        if weather_data:
-            self.current_weather_data = weather_data
-            self.display_weather_information(weather_data)
-            self.generate_and_display_chart(weather_data)
-        else:
-            self.show_error_message(f"Could not find weather data for '{city_name}'. Please check the city name.")
+        try:
+            await search_task
+        except asyncio.CancelledError:
+            # Superseded by a newer search; only propagate our own cancellation
+            if self.active_search_task is search_task:
+                raise
+    
+    async def run_weather_search(self, city_name: str, city_id: Optional[int] = None):
+        """Fetch, display and chart the weather for a city without blocking the event loop"""
+        increment("searches")
+        with timed("search"):
+            self.begin_batched_updates()
+            self.start_loading()
+            self.clear_error_message()
+            # Loading feedback goes out right away; everything else waits for the next push
+            self.push_pending_updates()
+            
+            try:
+                with timed("weather_lookup"):
+                    weather_service = await self.get_weather_service()
+                    weather_lookup = await weather_service.lookup_weather_info(city_name, city_id)
+                weather_data = weather_lookup.weather_info
+                
+                if weather_data:
+                    self.current_weather_data = weather_data
+                    self.display_weather_information(weather_data, weather_lookup)
+                    await self.generate_and_display_chart(weather_data)
+                else:
+                    self.show_error_message(f"Could not find weather data for '{city_name}'. Please check the city name.")
+            finally:
+                # A superseding search owns the loading state from here on
+                if self.active_search_task is asyncio.current_task():
+                    self.stop_loading()
+                self.end_batched_updates()
+                ui_logger.debug(f"Search for '{city_name}' pushed {self.search_update_count} page updates")
+    
+    def mark_controls_dirty(self, *controls):
+        """Remember controls whose properties changed so the next push sends them"""
+        for control in controls:
+            if not any(control is dirty_control for dirty_control in self._dirty_controls):
+                self._dirty_controls.append(control)
+    
+    def is_batching_updates(self) -> bool:
+        """True when the running task is the search that currently batches page pushes"""
+        try:
+            return self._update_batch_owner is not None and asyncio.current_task() is self._update_batch_owner
+        except RuntimeError:
+            return False  # Not on the event loop
+    
+    def request_update(self, *controls):
+        """Mark controls dirty when the current search is batching its updates, else push them now"""
+        if self.is_batching_updates():
+            self.mark_controls_dirty(*controls)
+            return
+        # Typing, suggestions and superseded searches go out right away and leave the batch alone
+        with timed("ui_update"):
+            self.page_reference.update(*controls)
+        self.total_update_count += 1
+    
+    def push_pending_updates(self):
+        """Send every dirty control to the client in a single update (only the batching search flushes)"""
+        if not self._dirty_controls or not self.is_batching_updates():
+            return
+        dirty_controls, self._dirty_controls = self._dirty_controls, []
+        with timed("ui_update"):
+            self.page_reference.update(*dirty_controls)
+        self.search_update_count += 1
+        self.total_update_count += 1
+    
+    def begin_batched_updates(self):
+        """Hold back page pushes for the current search task, taking over a superseded search's batch"""
+        self._update_batch_owner = asyncio.current_task()
+        self.search_update_count = 0
+    
+    def end_batched_updates(self):
+        """Push whatever the search left dirty and stop batching; a superseded search leaves the new one's alone"""
+        if not self.is_batching_updates():
+            return
+        self.push_pending_updates()
+        self._update_batch_owner = None
+        self.completed_search_count += 1
+    
+    def get_update_stats(self) -> dict:
+        """
+        Get page update counters for this session
         
-        self.stop_loading()
+        Returns:
+            Dict: Updates pushed by the last search, searches completed and total updates pushed
+        """
+        return {
+            "last_search_updates": self.search_update_count,
+            "completed_searches": self.completed_search_count,
+            "total_updates": self.total_update_count
+        }
     
-    def display_weather_information(self, weather_data):
-        """Display weather information in text format"""
+    def display_weather_information(self, weather_data, weather_lookup=None):
+        """
+        Display weather information in text format
+        
+        Args:
+            weather_data (WeatherObservation): Reading to show
+            weather_lookup (WeatherLookup): How the reading was obtained; flags a last known reading
+        """
         city_name = weather_data['city_name']
         country = weather_data['country_code']
         temperature = weather_data['current_temperature']
@@ -100,6 +336,7 @@ class WeatherDashboardUI:
         pressure = weather_data['atmospheric_pressure']
         wind_speed = weather_data['wind_speed']
         description = weather_data['weather_description']
+        observation_timestamp = weather_data.get('observation_timestamp')
         
         weather_text = f"""
 🌍 {city_name}, {country}
@@ -110,18 +347,24 @@ class WeatherDashboardUI:
 ☁️ Conditions: {description.title()}
         """
         
+        if weather_lookup is not None and weather_lookup.is_last_known:
+            # The service could not reach the API and fell back to the last reading it stored
+            fetched_text = (f", fetched {describe_reading_age(weather_lookup.age_seconds)}"
+                            if weather_lookup.age_seconds is not None else "")
+            weather_text += f"⚠️ Live weather unavailable. Last known reading{fetched_text}\n"
+        elif observation_timestamp:
+            weather_text += f"🕒 Observed {describe_reading_age(time.time() - observation_timestamp)}\n"
+        
         self.weather_info_display.value = weather_text
-        self.page_reference.update()
+        self.request_update(self.weather_info_display)
     
-    def generate_and_display_chart(self, weather_data):
-        """Generate weather chart and display it"""
+    async def generate_and_display_chart(self, weather_data):
+        """Draw the weather chart with the session's renderer and display it"""
         try:
-            chart_file_path = self.chart_generator.create_weather_overview_chart(weather_data)
-            
-            if os.path.exists(chart_file_path):
-                self.weather_chart_image.src = chart_file_path
-                self.weather_chart_image.visible = True
-                self.page_reference.update()
+            # Show the text while a chart renders rather than holding it back
+            with timed("chart_display"):
+                changed_controls = await self.chart_renderer.show(weather_data, self.push_pending_updates)
+            self.request_update(*changed_controls)
         except Exception as chart_error:
             self.show_error_message(f"Error generating chart: {str(chart_error)}")
     
@@ -129,24 +372,24 @@ class WeatherDashboardUI:
         """Show loading indicator"""
         self.loading_indicator.visible = True
         self.search_button.disabled = True
-        self.page_reference.update()
+        self.request_update(self.loading_indicator, self.search_button)
     
     def stop_loading(self):
         """Hide loading indicator"""
         self.loading_indicator.visible = False
         self.search_button.disabled = False
-        self.page_reference.update()
+        self.request_update(self.loading_indicator, self.search_button)
     
     def show_error_message(self, message: str):
         """Display error message"""
         self.error_message_display.value = message
         self.error_message_display.visible = True
-        self.page_reference.update()
+        self.request_update(self.error_message_display)
     
     def clear_error_message(self):
         """Clear error message"""
         self.error_message_display.visible = False
-        self.page_reference.update()
+        self.request_update(self.error_message_display)
     
     def build_main_layout(self) -> ft.Column:
         """Build the main layout of the application"""
@@ -178,6 +421,12 @@ class WeatherDashboardUI:
                     padding=ft.padding.all(10)
                 ),
                 
+                # City suggestions
+                ft.Container(
+                    content=self.city_suggestions_list,
+                    alignment=ft.alignment.center
+                ),
+                
                 # Error message
                 ft.Container(
                     content=self.error_message_display,
@@ -193,7 +442,7 @@ class WeatherDashboardUI:
                 
                 # Weather chart
                 ft.Container(
-                    content=self.weather_chart_image,
+                    content=self.weather_chart_view,
                     alignment=ft.alignment.center,
                     padding=ft.padding.all(10)
                 )
@@ -231,10 +480,11 @@ class WeatherDashboardUI:
         
         page.add(scrollable_content)
         page.update()
-
-# Create global dashboard instance
-weather_dashboard = WeatherDashboardUI()
+        
+        # First frame is out; load the heavy modules while the user types
+        threading.Thread(target=self.warm_up_services, name="weather-warm-up", daemon=True).start()
 
 def create_weather_app(page: ft.Page):
-    """Main function to create the weather app"""
-    weather_dashboard.setup_main_page(page)
+    """Main function to create the weather app, called once per page/session"""
+    session_dashboard = WeatherDashboardUI()
+    session_dashboard.setup_main_page(page)
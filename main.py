@@ -1,4 +1,4 @@
-import flet as ft
+import argparse
 import sys
 import os
 
@@ -6,23 +6,94 @@ import os
 project_root = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, project_root)
 
-from frontend.weather_ui import create_weather_app
+from config.settings import (
+    WEB_SERVER_PORT, EXPORT_OUTPUT_DIRECTORY, BULK_FETCH_MAX_CONCURRENCY, CHART_RENDER_USE_PROCESSES, METRICS_PORT
+)
+
+def parse_command_line_arguments():
+    """Parse command line options"""
+    argument_parser = argparse.ArgumentParser(description="Weather Data Visualization Dashboard")
+    argument_parser.add_argument("--web", action="store_true",
+                                 help="Serve the dashboard to any number of browser sessions instead of opening a desktop window")
+    argument_parser.add_argument("--port", type=int, default=WEB_SERVER_PORT, help="Port for the dashboard server")
+    argument_parser.add_argument("--metrics-port", type=int, default=METRICS_PORT,
+                                 help="Serve Prometheus metrics and profiling switches on this local port (0 = off)")
+
+    export_options = argument_parser.add_argument_group("headless export")
+    export_options.add_argument("--export", metavar="CITY_LIST",
+                                help="Export weather and charts for every city in a file (one name or ID per line, - for stdin) without opening the UI")
+    export_options.add_argument("--output-dir", default=EXPORT_OUTPUT_DIRECTORY, help="Where the export is written")
+    export_options.add_argument("--format", choices=("jsonl", "csv"), default="jsonl", help="Export file format")
+    export_options.add_argument("--chart", choices=("overview", "simple", "none"), default="overview",
+                                help="Chart rendered per city")
+    export_options.add_argument("--concurrency", type=int, default=BULK_FETCH_MAX_CONCURRENCY,
+                                help="Parallel API calls")
+    export_options.add_argument("--render-processes", action="store_true", default=CHART_RENDER_USE_PROCESSES,
+                                help="Render charts on a process pool to use every core")
+    export_options.add_argument("--comparison", choices=("bars", "heatmap", "small_multiples"),
+                                help="Also draw all exported cities into one comparison.png")
+    export_options.add_argument("--comparison-sort", metavar="FIELD",
+                                help="Rank the comparison by this field, e.g. current_temperature or wind_speed")
+    export_options.add_argument("--comparison-top", type=int, metavar="N",
+                                help="Keep only the first N cities of the comparison")
+    return argument_parser.parse_args()
+
+def start_metrics_endpoint(metrics_port: int):
+    """Serve /metrics, /profile/start|stop and /trace/on|off on localhost"""
+    from backend.metrics import MetricsServer
+
+    metrics_server = MetricsServer(metrics_port).start()
+    print(f"📈 Metrics on {metrics_server.url} (profiling: /profile/start, /profile/stop)")
+    return metrics_server
+
+def run_headless_export(command_line_arguments):
+    """Run the batch export; flet is never imported on this path"""
+    from backend.batch_export import run_batch_export
+
+    print(f"📦 Exporting cities from {command_line_arguments.export} to {command_line_arguments.output_dir}")
+    run_batch_export(
+        command_line_arguments.export,
+        output_directory=command_line_arguments.output_dir,
+        export_format=command_line_arguments.format,
+        chart_kind=command_line_arguments.chart,
+        max_concurrency=command_line_arguments.concurrency,
+        render_processes=command_line_arguments.render_processes,
+        comparison_layout=command_line_arguments.comparison,
+        comparison_sort_by=command_line_arguments.comparison_sort,
+        comparison_top_n=command_line_arguments.comparison_top
+    )
+
+def launch_dashboard(command_line_arguments):
+    """Launch the Flet application"""
+    import flet as ft
+    from frontend.weather_ui import create_weather_app
 
-def main():
-    """Main function to launch the weather dashboard application"""
     print("🌤️  Starting Weather Data Visualization Dashboard...")
     print("📊 Loading user interface...")
-    
+    if command_line_arguments.web:
+        print(f"🌐 Serving web sessions on http://localhost:{command_line_arguments.port}")
+
     try:
-        # Launch the Flet application
+        # Launch the Flet application; every page/session gets its own dashboard
         ft.app(
             target=create_weather_app,
-            view=ft.AppView.FLET_APP,  # Desktop application
-            port=8080
+            view=ft.AppView.WEB_BROWSER if command_line_arguments.web else ft.AppView.FLET_APP,
+            port=command_line_arguments.port
         )
     except Exception as app_error:
         print(f"❌ Error starting the application: {app_error}")
         print("💡 Please check your internet connection and API key configuration")
 
+def main():
+    """Main function: launch the weather dashboard, or run a headless export with --export"""
+    command_line_arguments = parse_command_line_arguments()
+    if command_line_arguments.metrics_port:
+        start_metrics_endpoint(command_line_arguments.metrics_port)
+
+    if command_line_arguments.export:
+        run_headless_export(command_line_arguments)
+    else:
+        launch_dashboard(command_line_arguments)
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,49 @@
+import os
+import sys
+import time
+
+import pytest
+
+# Add the project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from backend import weather_service
+from backend.observation_store import ObservationHistoryStore
+from backend.persistent_cache import PersistentResponseCache
+from benchmarks.stub_openweather_server import build_current_weather_payload
+
+
+@pytest.fixture
+def bulk_service(tmp_path, monkeypatch):
+    """Weather service on scratch stores whose group requests are answered locally and recorded"""
+    monkeypatch.setattr(weather_service, "OPENWEATHER_API_KEY", "test-key")
+    monkeypatch.setattr(weather_service, "GROUP_REQUEST_MAX_IDS", 3)
+    weather_data_service = weather_service.WeatherDataService(
+        history_store=ObservationHistoryStore(str(tmp_path / "history")),
+        persistent_cache=PersistentResponseCache(str(tmp_path / "responses.sqlite3"), 3600, 1024 * 1024)
+    )
+    weather_data_service.requested_groups = []
+
+    def fetch_weather_group_data(city_ids):
+        weather_data_service.requested_groups.append(list(city_ids))
+        time.sleep(0.02)  # Keep groups in flight while later duplicates arrive
+        return {"list": [build_current_weather_payload(f"City{city_id}", city_id) for city_id in city_ids]}
+
+    weather_data_service.fetch_weather_group_data = fetch_weather_group_data
+    return weather_data_service
+
+
+def test_duplicate_city_ids_are_requested_once(bulk_service):
+    requested_cities = [1, "1", 2, 1, 2, 3, 4, "4", 1, 5, 4]
+
+    batch_results = list(bulk_service.get_complete_weather_info_many(requested_cities, max_concurrency=2))
+
+    requested_ids = [city_id for group in bulk_service.requested_groups for city_id in group]
+    assert sorted(requested_ids) == [1, 2, 3, 4, 5]
+    assert sorted(map(str, (batch_result["city"] for batch_result in batch_results))) == sorted(
+        map(str, requested_cities)
+    )
+    for batch_result in batch_results:
+        assert batch_result["error"] is None
+        assert batch_result["weather"]["city_id"] == int(batch_result["city"])
@@ -0,0 +1,50 @@
+import os
+import sys
+
+# Add the project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from backend.chart_cache import ChartImageCache
+
+
+def spilled_keys(spill_directory) -> set:
+    return {file_name[:-4] for file_name in os.listdir(spill_directory) if file_name.endswith(".png")}
+
+
+def test_spill_directory_keeps_newest_charts_within_the_byte_budget(tmp_path):
+    # Memory holds one chart, so every earlier chart spills; the disk holds three
+    chart_cache = ChartImageCache(max_memory_bytes=100, spill_directory=str(tmp_path), max_disk_bytes=300)
+    for chart_number in range(6):
+        chart_cache.put(f"chart{chart_number}", bytes(100))
+
+    assert spilled_keys(tmp_path) == {"chart2", "chart3", "chart4"}
+    assert chart_cache.get_stats()["disk_bytes"] == 300
+    assert chart_cache.get_stats()["disk_evictions"] == 2
+    assert chart_cache.get("chart0") is None
+    assert chart_cache.get("chart3") == bytes(100)
+
+
+def test_disk_hit_protects_a_chart_from_the_next_eviction(tmp_path):
+    chart_cache = ChartImageCache(max_memory_bytes=100, spill_directory=str(tmp_path), max_disk_bytes=200)
+    for chart_number in range(3):
+        chart_cache.put(f"chart{chart_number}", bytes(100))
+    assert chart_cache.get("chart0") == bytes(100)
+
+    chart_cache.put("chart3", bytes(100))
+    chart_cache.put("chart4", bytes(100))
+
+    assert "chart0" in spilled_keys(tmp_path)
+    assert "chart1" not in spilled_keys(tmp_path)
+
+
+def test_existing_spill_files_are_trimmed_oldest_first_on_start(tmp_path):
+    for chart_number in range(4):
+        chart_path = tmp_path / f"old{chart_number}.png"
+        chart_path.write_bytes(bytes(100))
+        os.utime(chart_path, (1000 + chart_number, 1000 + chart_number))
+
+    chart_cache = ChartImageCache(max_memory_bytes=100, spill_directory=str(tmp_path), max_disk_bytes=250)
+
+    assert spilled_keys(tmp_path) == {"old2", "old3"}
+    assert chart_cache.get_stats()["disk_files"] == 2
@@ -0,0 +1,33 @@
+import os
+import sys
+
+# Add the project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from backend.city_index import CityIndex
+
+
+def city_entry(city_id: int, name: str, state: str, country: str) -> dict:
+    return {"id": city_id, "name": name, "state": state, "country": country, "coord": {"lat": 0.0, "lon": 0.0}}
+
+
+CITY_INDEX = CityIndex([
+    city_entry(1, "São Paulo", "São Paulo", "BR"),
+    city_entry(2, "Springfield", "IL", "US"),
+    city_entry(3, "Springfield", "MO", "US"),
+    city_entry(4, "London", "", "GB"),
+    city_entry(5, "London", "ON", "CA"),
+])
+
+
+def test_qualifiers_match_accented_states_typed_without_accents():
+    assert [record.city_id for record in CITY_INDEX.resolve("Sao Paulo, Sao Paulo, BR")] == [1]
+    assert [record.city_id for record in CITY_INDEX.suggest("sao paulo, sao", 5)] == [1]
+
+
+def test_qualifiers_pick_state_or_country():
+    assert [record.city_id for record in CITY_INDEX.resolve("Springfield, MO")] == [3]
+    assert [record.city_id for record in CITY_INDEX.resolve("london, ca")] == [5]
+    assert {record.city_id for record in CITY_INDEX.resolve("Springfield")} == {2, 3}
+    assert CITY_INDEX.resolve("Springfield, TX") == []
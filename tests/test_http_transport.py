@@ -0,0 +1,44 @@
+import os
+import sys
+
+import httpx
+from urllib3 import HTTPResponse
+
+# Add the project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from backend.http_transport import BoundedRetryAfterRetry
+
+
+def rate_limited_response(retry_after: str) -> HTTPResponse:
+    return HTTPResponse(status=429, headers={"Retry-After": retry_after})
+
+
+def test_long_retry_after_is_capped():
+    retry_policy = BoundedRetryAfterRetry(total=3, respect_retry_after_header=True, max_retry_after_seconds=10)
+
+    assert retry_policy.get_retry_after(rate_limited_response("3600")) == 10
+    assert retry_policy.get_retry_after(rate_limited_response("2")) == 2
+
+
+def test_cap_survives_the_copy_made_after_each_attempt():
+    retry_policy = BoundedRetryAfterRetry(total=3, max_retry_after_seconds=10)
+
+    next_policy = retry_policy.increment(method="GET", url="/", response=rate_limited_response("3600"))
+
+    assert next_policy.total == 2
+    assert next_policy.get_retry_after(rate_limited_response("3600")) == 10
+
+
+def test_async_service_caps_retry_after(monkeypatch):
+    from backend import async_weather_service
+
+    monkeypatch.setattr(async_weather_service, "HTTP_MAX_RETRY_AFTER_SECONDS", 10)
+    weather_service = async_weather_service.AsyncWeatherDataService.__new__(
+        async_weather_service.AsyncWeatherDataService
+    )
+    weather_service.backoff_factor = 0.5
+
+    assert weather_service._retry_delay_seconds(httpx.Response(429, headers={"Retry-After": "3600"}), 0) == 10
+    assert weather_service._retry_delay_seconds(httpx.Response(503), 2) == 2.0
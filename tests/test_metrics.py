@@ -0,0 +1,72 @@
+import asyncio
+import os
+import sys
+
+# Add the project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from backend.metrics import MetricsRegistry
+
+
+def busy_work(iterations: int) -> int:
+    return sum(range(iterations))
+
+
+def test_overlapping_async_stages_keep_profiling_until_the_last_one_exits():
+    registry = MetricsRegistry(enabled=True)
+    registry.profiler.start()
+
+    async def search(first_pause: float, second_pause: float, work_function):
+        with registry.timed("search"):
+            await asyncio.sleep(first_pause)
+            with registry.timed("weather_lookup"):
+                await asyncio.sleep(second_pause)
+            work_function(1000)
+
+    def late_search_work(iterations: int) -> int:
+        return busy_work(iterations)
+
+    async def run_searches():
+        # The first search exits while the second is still inside its outermost stage
+        await asyncio.gather(search(0.0, 0.01, busy_work), search(0.005, 0.05, late_search_work))
+
+    asyncio.run(run_searches())
+    report = registry.profiler.stop(line_limit=1000)
+
+    assert "late_search_work" in report
+    assert registry.get_stats()["stages"]["search"]["count"] == 2
+    assert registry.get_stats()["stages"]["weather_lookup"]["count"] == 2
+
+
+def test_stages_on_worker_threads_are_profiled_from_a_copied_context():
+    registry = MetricsRegistry(enabled=True)
+    registry.profiler.start()
+
+    def draw_in_worker() -> int:
+        return busy_work(1000)
+
+    def render_in_worker() -> int:
+        with registry.timed("chart_draw"):
+            return draw_in_worker()
+
+    async def search():
+        with registry.timed("search"):
+            await asyncio.to_thread(render_in_worker)
+
+    asyncio.run(search())
+    assert "draw_in_worker" in registry.profiler.stop(line_limit=1000)
+
+
+def test_profiler_is_off_after_the_last_stage():
+    registry = MetricsRegistry(enabled=True)
+    registry.profiler.start()
+    with registry.timed("outer"):
+        with registry.timed("inner"):
+            busy_work(10)
+
+    def after_stages() -> int:
+        return busy_work(10)
+
+    after_stages()
+    assert "after_stages" not in registry.profiler.stop(line_limit=1000)
@@ -0,0 +1,119 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# Add the project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from backend.observation_store import HISTORY_COLUMNS, VALUE_COLUMNS, ObservationHistoryStore
+
+
+def make_reading(temperature: float, city_name: str = "London", country_code: str = "GB") -> dict:
+    reading = {column_name: 0.0 for column_name in VALUE_COLUMNS}
+    reading.update(city_name=city_name, country_code=country_code, current_temperature=temperature)
+    return reading
+
+
+@pytest.fixture
+def history_store(tmp_path):
+    return ObservationHistoryStore(str(tmp_path / "history"))
+
+
+def test_append_stores_rows_in_time_order(history_store):
+    assert history_store.append(make_reading(10.0), timestamp=100.0)
+    assert history_store.append(make_reading(11.5), timestamp=200.0)
+
+    readings = history_store.query_range("London", "GB")
+    np.testing.assert_array_equal(readings["timestamp"], [100.0, 200.0])
+    np.testing.assert_array_equal(readings["current_temperature"], np.array([10.0, 11.5], dtype=np.float32))
+    assert history_store.list_cities() == [{"city_name": "London", "country_code": "GB", "readings": 2}]
+
+
+def test_append_skips_readings_not_newer_than_the_last(history_store):
+    assert history_store.append(make_reading(10.0), timestamp=100.0)
+    assert not history_store.append(make_reading(12.0), timestamp=100.0)
+    assert not history_store.append(make_reading(12.0), timestamp=50.0)
+
+    assert history_store.query_range("London", "GB")["timestamp"].size == 1
+
+
+def test_query_range_is_half_open(history_store):
+    for timestamp in (100.0, 200.0, 300.0):
+        history_store.append(make_reading(timestamp / 10), timestamp=timestamp)
+
+    readings = history_store.query_range("London", "GB", start_time=100.0, end_time=300.0)
+    np.testing.assert_array_equal(readings["timestamp"], [100.0, 200.0])
+
+
+def test_torn_append_is_ignored_then_truncated(history_store):
+    history_store.append(make_reading(10.0), timestamp=100.0)
+    city_key = history_store.city_key("London", "GB")
+
+    # An interrupted append: the timestamp and one value column got their row, the rest did not
+    for column_name, column_dtype in HISTORY_COLUMNS[:2]:
+        with open(history_store._column_path(city_key, column_name), "ab") as column_file:
+            column_file.write(np.asarray([999.0], dtype=column_dtype).tobytes())
+    assert history_store.query_range("London", "GB")["timestamp"].size == 1
+
+    assert history_store.append(make_reading(20.0), timestamp=200.0)
+
+    readings = history_store.query_range("London", "GB")
+    np.testing.assert_array_equal(readings["timestamp"], [100.0, 200.0])
+    np.testing.assert_array_equal(readings["current_temperature"], np.array([10.0, 20.0], dtype=np.float32))
+    for column_name, column_dtype in HISTORY_COLUMNS:
+        assert os.path.getsize(history_store._column_path(city_key, column_name)) == 2 * column_dtype.itemsize
+
+
+def test_torn_partial_row_bytes_are_truncated(history_store):
+    history_store.append(make_reading(10.0), timestamp=100.0)
+    city_key = history_store.city_key("London", "GB")
+    with open(history_store._column_path(city_key, "wind_speed"), "ab") as column_file:
+        column_file.write(b"\x01\x02")
+
+    assert history_store.append(make_reading(20.0), timestamp=200.0)
+
+    readings = history_store.query_range("London", "GB")
+    np.testing.assert_array_equal(readings["wind_speed"], np.zeros(2, dtype=np.float32))
+
+
+def test_two_stores_on_one_directory_append_in_turn(tmp_path):
+    history_directory = str(tmp_path / "history")
+    dashboard_store = ObservationHistoryStore(history_directory)
+    export_store = ObservationHistoryStore(history_directory)
+
+    dashboard_store.append(make_reading(10.0), timestamp=100.0)
+    export_store.append(make_reading(20.0), timestamp=200.0)
+    assert not dashboard_store.append(make_reading(15.0), timestamp=150.0)
+
+    np.testing.assert_array_equal(dashboard_store.query_range("London", "GB")["timestamp"], [100.0, 200.0])
+
+
+def test_downsample_aggregates_each_bucket(history_store):
+    for timestamp, temperature in ((0.0, 10.0), (1800.0, 14.0), (3600.0, 20.0), (9000.0, 5.0), (9100.0, 7.0)):
+        history_store.append(make_reading(temperature), timestamp=timestamp)
+
+    hourly = history_store.downsample("London", "GB", bucket_seconds=3600)
+
+    np.testing.assert_array_equal(hourly["bucket_start"], [0.0, 3600.0, 7200.0])
+    np.testing.assert_array_equal(hourly["count"], [2, 1, 2])
+    np.testing.assert_allclose(hourly["current_temperature_mean"], [12.0, 20.0, 6.0])
+    np.testing.assert_array_equal(hourly["current_temperature_min"], [10.0, 20.0, 5.0])
+    np.testing.assert_array_equal(hourly["current_temperature_max"], [14.0, 20.0, 7.0])
+
+
+def test_downsample_respects_the_time_range(history_store):
+    for timestamp in (0.0, 3600.0, 7200.0):
+        history_store.append(make_reading(timestamp / 360), timestamp=timestamp)
+
+    hourly = history_store.downsample("London", "GB", bucket_seconds=3600, start_time=3600.0)
+    np.testing.assert_array_equal(hourly["bucket_start"], [3600.0, 7200.0])
+
+
+def test_downsample_of_unknown_city_is_empty(history_store):
+    hourly = history_store.downsample("Nowhere")
+
+    assert hourly["bucket_start"].size == 0
+    assert all(hourly[f"{column_name}_mean"].size == 0 for column_name in VALUE_COLUMNS)
@@ -0,0 +1,123 @@
+import asyncio
+import os
+import sys
+import time
+
+import pytest
+
+# Add the project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from backend import async_weather_service, weather_service
+from backend.observation_store import ObservationHistoryStore
+from backend.persistent_cache import PersistentResponseCache
+from benchmarks.stub_openweather_server import build_current_weather_payload
+
+
+@pytest.fixture
+def persistent_cache(tmp_path):
+    response_cache = PersistentResponseCache(str(tmp_path / "cache" / "responses.sqlite3"),
+                                             max_age_seconds=3600, max_bytes=1024 * 1024)
+    yield response_cache
+    response_cache.close()
+
+
+@pytest.fixture
+def service_factory(tmp_path, monkeypatch):
+    """Build weather services on scratch stores whose API calls return canned payloads (None = failure)"""
+    monkeypatch.setattr(weather_service, "OPENWEATHER_API_KEY", "test-key")
+    monkeypatch.setattr(async_weather_service, "OPENWEATHER_API_KEY", "test-key")
+    history_store = ObservationHistoryStore(str(tmp_path / "history"))
+
+    def build_service(persistent_cache, api_payload, service_class=weather_service.WeatherDataService):
+        # Without stale-while-revalidate an expired reading waits for the fetch, so its failure shows
+        weather_data_service = service_class(history_store=history_store, persistent_cache=persistent_cache,
+                                             stale_while_revalidate=False)
+        if service_class is weather_service.WeatherDataService:
+            weather_data_service.fetch_weather_data = lambda city_name, city_id=None: api_payload
+        else:
+            async def fetch_weather_data(city_name, city_id=None):
+                return api_payload
+            weather_data_service.fetch_weather_data = fetch_weather_data
+        return weather_data_service
+
+    return build_service
+
+
+def test_store_and_load_round_trip(persistent_cache):
+    raw_payload = build_current_weather_payload("London")
+    persistent_cache.store("london|metric", raw_payload, fetched_at=time.time() - 120)
+
+    loaded_payload, age_seconds = persistent_cache.load("london|metric")
+
+    assert loaded_payload == raw_payload
+    assert age_seconds == pytest.approx(120, abs=5)
+    assert persistent_cache.load("paris|metric") == (None, None)
+    assert persistent_cache.get_stats()["hits"] == 1
+    assert persistent_cache.get_stats()["misses"] == 1
+
+
+def test_payloads_older_than_max_age_are_evicted(persistent_cache):
+    persistent_cache.store("old|metric", build_current_weather_payload("Old"), fetched_at=time.time() - 7200)
+    persistent_cache.store("new|metric", build_current_weather_payload("New"))
+
+    assert persistent_cache.evict() == 1
+    assert persistent_cache.load("old|metric") == (None, None)
+    assert persistent_cache.load("new|metric")[0] is not None
+
+
+def test_oldest_payloads_are_evicted_over_the_size_budget(tmp_path):
+    sized_cache = PersistentResponseCache(str(tmp_path / "sized.sqlite3"), max_age_seconds=3600, max_bytes=10 ** 9)
+    sized_cache.store("city0|metric", build_current_weather_payload("City0"))
+    payload_bytes = sized_cache.get_stats()["stored_bytes"]
+    sized_cache.close()
+
+    small_cache = PersistentResponseCache(str(tmp_path / "small.sqlite3"), max_age_seconds=3600,
+                                          max_bytes=int(payload_bytes * 2.5))
+    now = time.time()
+    for city_number in range(4):
+        small_cache.store(f"city{city_number}|metric", build_current_weather_payload(f"City{city_number}"),
+                          fetched_at=now - 100 + city_number)
+
+    assert small_cache.evict() == 2
+    assert [small_cache.load(f"city{city_number}|metric")[0] is not None for city_number in range(4)] == [
+        False, False, True, True
+    ]
+    small_cache.close()
+
+
+def test_fresh_service_restarts_warm_from_disk(persistent_cache, service_factory):
+    first_service = service_factory(persistent_cache, build_current_weather_payload("London"))
+    assert first_service.get_complete_weather_info("London").city_name == "London"
+
+    # A new process: empty memory cache, and the API is down
+    restarted_service = service_factory(persistent_cache, None)
+    weather_lookup = restarted_service.lookup_weather_info("London")
+
+    assert weather_lookup.weather_info.city_name == "London"
+    assert not weather_lookup.is_last_known
+    assert weather_lookup.age_seconds < 60
+
+
+def test_failed_fetch_serves_the_last_known_reading_with_its_age(persistent_cache, service_factory):
+    cache_key = service_factory(persistent_cache, None).weather_cache_key("London")
+    persistent_cache.store(cache_key, build_current_weather_payload("London"), fetched_at=time.time() - 3 * 3600)
+
+    weather_lookup = service_factory(persistent_cache, None).lookup_weather_info("London")
+
+    assert weather_lookup.weather_info.city_name == "London"
+    assert weather_lookup.is_last_known
+    assert weather_lookup.age_seconds == pytest.approx(3 * 3600, abs=60)
+
+
+def test_async_service_flags_the_last_known_reading(persistent_cache, service_factory):
+    async_service = service_factory(persistent_cache, None, async_weather_service.AsyncWeatherDataService)
+    persistent_cache.store(async_service.weather_cache_key("London"), build_current_weather_payload("London"),
+                           fetched_at=time.time() - 3 * 3600)
+
+    weather_lookup = asyncio.run(async_service.lookup_weather_info("London"))
+
+    assert weather_lookup.weather_info.city_name == "London"
+    assert weather_lookup.is_last_known
+    assert weather_lookup.age_seconds == pytest.approx(3 * 3600, abs=60)
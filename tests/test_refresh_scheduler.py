@@ -0,0 +1,107 @@
+import os
+import sys
+import types
+
+import pytest
+
+# Add the project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from backend import refresh_scheduler
+from backend.refresh_scheduler import RefreshScheduler, TokenBucket
+from backend.weather_cache import WeatherResponseCache
+from config.settings import REFRESH_USER_RESERVED_TOKENS
+
+
+@pytest.fixture
+def fake_clock(monkeypatch):
+    """Replace the scheduler module's clock with one the test moves by hand"""
+    clock = types.SimpleNamespace(now=1000.0)
+    clock.monotonic = lambda: clock.now
+    monkeypatch.setattr(refresh_scheduler, "time", clock)
+    return clock
+
+
+def spend_all_tokens(call_budget: TokenBucket, reserve: int = 0) -> int:
+    granted_calls = 0
+    while call_budget.try_acquire(reserve):
+        granted_calls += 1
+    return granted_calls
+
+
+def test_full_bucket_allows_a_burst_then_refuses(fake_clock):
+    call_budget = TokenBucket(calls_per_minute=60, burst_capacity=10)
+
+    assert spend_all_tokens(call_budget) == 10
+    assert call_budget.seconds_until_available() == pytest.approx(1.0)
+
+
+def test_tokens_refill_at_the_per_minute_rate_up_to_the_burst(fake_clock):
+    call_budget = TokenBucket(calls_per_minute=60, burst_capacity=10)
+    spend_all_tokens(call_budget)
+
+    fake_clock.now += 3.5
+    assert spend_all_tokens(call_budget) == 3
+
+    # A long idle period never stores more than the burst capacity
+    fake_clock.now += 3600
+    assert spend_all_tokens(call_budget) == 10
+    assert call_budget.get_stats()["calls_granted"] == 23
+
+
+def test_background_refreshes_leave_the_reserve_for_searches(fake_clock):
+    call_budget = TokenBucket(calls_per_minute=60, burst_capacity=10)
+
+    background_calls = spend_all_tokens(call_budget, reserve=REFRESH_USER_RESERVED_TOKENS)
+
+    assert background_calls == 10 - REFRESH_USER_RESERVED_TOKENS
+    assert not call_budget.try_acquire(reserve=REFRESH_USER_RESERVED_TOKENS)
+    assert spend_all_tokens(call_budget) == REFRESH_USER_RESERVED_TOKENS
+    assert call_budget.seconds_until_available(reserve=REFRESH_USER_RESERVED_TOKENS) == pytest.approx(
+        REFRESH_USER_RESERVED_TOKENS + 1
+    )
+
+
+class FlakyWeatherService:
+    """Stand-in service whose first lookups fail, as during a run of 429s"""
+
+    def __init__(self, failures: int):
+        self.response_cache = WeatherResponseCache(600, 10)
+        self.failures = failures
+        self.lookups = 0
+
+    def weather_cache_key(self, city_name: str) -> str:
+        return city_name.casefold()
+
+    def refresh_weather_info(self, city_name: str):
+        self.lookups += 1
+        return None if self.lookups <= self.failures else {"city_name": city_name}
+
+
+def test_every_retry_spends_a_token():
+    weather_service = FlakyWeatherService(failures=2)
+    call_budget = TokenBucket(calls_per_minute=6000, burst_capacity=10)
+    scheduler = RefreshScheduler(weather_service, call_budget, worker_count=1, backoff_factor=0.001).start()
+    try:
+        assert scheduler.submit_user_lookup("Paris").result(timeout=5) == {"city_name": "Paris"}
+    finally:
+        scheduler.stop()
+
+    assert weather_service.lookups == 3
+    assert call_budget.calls_granted == 3
+    assert scheduler.get_stats()["lookups_retried"] == 2
+
+
+def test_lookup_gives_up_after_max_retries():
+    weather_service = FlakyWeatherService(failures=100)
+    call_budget = TokenBucket(calls_per_minute=6000, burst_capacity=10)
+    scheduler = RefreshScheduler(weather_service, call_budget, worker_count=1, max_retries=2,
+                                 backoff_factor=0.001).start()
+    try:
+        assert scheduler.submit_user_lookup("Paris").result(timeout=5) is None
+    finally:
+        scheduler.stop()
+
+    assert weather_service.lookups == 3
+    assert call_budget.calls_granted == 3
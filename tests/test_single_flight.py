@@ -0,0 +1,144 @@
+import asyncio
+import os
+import sys
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import pytest
+
+# Add the project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from backend.single_flight import AsyncSingleFlightGroup, SingleFlightGroup
+
+CALLER_COUNT = 8
+
+
+def run_callers_together(single_flight: SingleFlightGroup, work) -> list:
+    """Call single_flight.do from CALLER_COUNT threads while the leader's work is blocked, returning outcomes"""
+    def call():
+        try:
+            return single_flight.do("london", work)
+        except Exception as call_error:
+            return call_error
+
+    with ThreadPoolExecutor(max_workers=CALLER_COUNT) as executor:
+        caller_futures = [executor.submit(call) for _ in range(CALLER_COUNT)]
+        return [caller_future.result(timeout=5) for caller_future in caller_futures]
+
+
+def blocking_work(single_flight: SingleFlightGroup, outcome):
+    """Work that waits until every other caller has joined the flight, then returns or raises outcome"""
+    work_calls = []
+
+    def work():
+        work_calls.append(1)
+        while single_flight.get_stats()["coalesced_waiters"] < CALLER_COUNT - 1:
+            time.sleep(0.001)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    return work, work_calls
+
+
+def test_concurrent_callers_share_one_execution():
+    single_flight = SingleFlightGroup()
+    work, work_calls = blocking_work(single_flight, {"temperature": 14.2})
+
+    outcomes = run_callers_together(single_flight, work)
+
+    assert outcomes == [{"temperature": 14.2}] * CALLER_COUNT
+    assert len(work_calls) == 1
+    assert single_flight.get_stats() == {"in_flight": 0, "executions": 1, "coalesced_waiters": CALLER_COUNT - 1}
+
+
+def test_exception_reaches_every_waiter():
+    single_flight = SingleFlightGroup()
+    work_error = RuntimeError("upstream unavailable")
+    work, work_calls = blocking_work(single_flight, work_error)
+
+    outcomes = run_callers_together(single_flight, work)
+
+    assert all(outcome is work_error for outcome in outcomes)
+    assert len(work_calls) == 1
+    # The key is released, so the next call runs again
+    assert single_flight.do("london", lambda: "retried") == "retried"
+
+
+def test_shared_future_survives_one_caller_cancelling():
+    single_flight = SingleFlightGroup()
+    shared_future = Future()
+    first_caller = single_flight.share_future("chart", lambda: shared_future)
+    second_caller = single_flight.share_future("chart", lambda: pytest.fail("work started twice"))
+
+    assert first_caller.cancel()
+    shared_future.set_result(b"png")
+
+    assert second_caller.result(timeout=1) == b"png"
+    assert single_flight.get_stats()["in_flight"] == 0
+
+
+def test_async_callers_share_one_execution():
+    async def scenario():
+        single_flight = AsyncSingleFlightGroup()
+        work_calls = []
+
+        async def work():
+            work_calls.append(1)
+            await asyncio.sleep(0.01)
+            return "reading"
+
+        outcomes = await asyncio.gather(*(single_flight.do("london", work) for _ in range(CALLER_COUNT)))
+        return outcomes, work_calls, single_flight.get_stats()
+
+    outcomes, work_calls, stats = asyncio.run(scenario())
+    assert outcomes == ["reading"] * CALLER_COUNT
+    assert len(work_calls) == 1
+    assert stats == {"in_flight": 0, "executions": 1, "coalesced_waiters": CALLER_COUNT - 1}
+
+
+def test_async_exception_reaches_every_waiter():
+    async def scenario():
+        single_flight = AsyncSingleFlightGroup()
+
+        async def work():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("upstream unavailable")
+
+        return await asyncio.gather(*(single_flight.do("london", work) for _ in range(3)), return_exceptions=True)
+
+    outcomes = asyncio.run(scenario())
+    assert len(outcomes) == 3
+    assert all(isinstance(outcome, RuntimeError) for outcome in outcomes)
+    assert outcomes[0] is outcomes[1] is outcomes[2]
+
+
+def test_async_work_survives_a_cancelled_waiter():
+    async def scenario():
+        single_flight = AsyncSingleFlightGroup()
+        release_work = asyncio.Event()
+        work_finished = []
+
+        async def work():
+            await release_work.wait()
+            work_finished.append(1)
+            return "reading"
+
+        superseded_search = asyncio.create_task(single_flight.do("london", work))
+        other_session = asyncio.create_task(single_flight.do("london", work))
+        await asyncio.sleep(0)
+        superseded_search.cancel()
+        await asyncio.sleep(0)
+        release_work.set()
+
+        with pytest.raises(asyncio.CancelledError):
+            await superseded_search
+        return await other_session, work_finished, single_flight.get_stats()
+
+    other_result, work_finished, stats = asyncio.run(scenario())
+    assert other_result == "reading"
+    assert work_finished == [1]
+    assert stats["executions"] == 1
+    assert stats["in_flight"] == 0
@@ -0,0 +1,116 @@
+import os
+import sys
+import threading
+import types
+
+import pytest
+
+# Add the project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from backend import weather_cache, weather_service
+from backend.observation_store import ObservationHistoryStore
+from backend.persistent_cache import PersistentResponseCache
+from backend.weather_cache import WeatherResponseCache, build_weather_cache_key
+from benchmarks.stub_openweather_server import build_current_weather_payload
+
+
+@pytest.fixture
+def fake_clock(monkeypatch):
+    """Replace the cache module's clock with one the test moves by hand"""
+    clock = types.SimpleNamespace(now=1000.0)
+    clock.monotonic = lambda: clock.now
+    monkeypatch.setattr(weather_cache, "time", clock)
+    return clock
+
+
+def test_cache_key_ignores_case_and_whitespace():
+    assert build_weather_cache_key("  New   York ", "metric") == build_weather_cache_key("new york", "metric")
+    assert build_weather_cache_key("London", "metric") != build_weather_cache_key("London", "imperial")
+
+
+def test_entries_turn_stale_after_the_ttl(fake_clock):
+    response_cache = WeatherResponseCache(ttl_seconds=600, max_entries=10)
+    response_cache.store("london|metric", "reading")
+
+    fake_clock.now += 599
+    assert response_cache.lookup("london|metric") == ("reading", True)
+    fake_clock.now += 1
+    assert response_cache.lookup("london|metric") == ("reading", False)
+    assert response_cache.entry_age("london|metric") == 600
+
+
+def test_restored_entries_keep_their_age(fake_clock):
+    response_cache = WeatherResponseCache(ttl_seconds=600, max_entries=10)
+    response_cache.store("london|metric", "reading", age_seconds=900)
+
+    assert response_cache.lookup("london|metric") == ("reading", False)
+
+
+def test_least_recently_used_entry_is_evicted():
+    response_cache = WeatherResponseCache(ttl_seconds=600, max_entries=2)
+    response_cache.store("london|metric", "london")
+    response_cache.store("paris|metric", "paris")
+    response_cache.lookup("london|metric")
+
+    response_cache.store("tokyo|metric", "tokyo")
+
+    assert response_cache.lookup("paris|metric") == (None, False)
+    assert response_cache.lookup("london|metric") == ("london", True)
+    assert response_cache.lookup("tokyo|metric") == ("tokyo", True)
+    assert response_cache.get_stats()["evictions"] == 1
+
+
+def test_stats_count_hits_stale_hits_and_misses(fake_clock):
+    response_cache = WeatherResponseCache(ttl_seconds=600, max_entries=10)
+    response_cache.lookup("london|metric")
+    response_cache.store("london|metric", "reading")
+    response_cache.lookup("london|metric")
+    response_cache.lookup("london|metric")
+    fake_clock.now += 601
+    response_cache.lookup("london|metric")
+
+    assert response_cache.get_stats() == {
+        "entries": 1, "max_entries": 10, "ttl_seconds": 600,
+        "hits": 2, "stale_hits": 1, "misses": 1, "evictions": 0,
+    }
+
+
+def test_stale_hits_schedule_exactly_one_background_refresh(tmp_path, monkeypatch):
+    monkeypatch.setattr(weather_service, "OPENWEATHER_API_KEY", "test-key")
+    weather_data_service = weather_service.WeatherDataService(
+        stale_while_revalidate=True,
+        history_store=ObservationHistoryStore(str(tmp_path / "history")),
+        persistent_cache=PersistentResponseCache(str(tmp_path / "responses.sqlite3"), 3600, 1024 * 1024)
+    )
+    release_fetch = threading.Event()
+    refresh_done = threading.Event()
+    fetched_cities = []
+
+    def fetch_weather_data(city_name, city_id=None):
+        fetched_cities.append(city_name)
+        release_fetch.wait(5)
+        return build_current_weather_payload(city_name)
+
+    original_fetch_and_cache = weather_data_service._fetch_and_cache
+
+    def fetch_and_cache(*args):
+        try:
+            return original_fetch_and_cache(*args)
+        finally:
+            refresh_done.set()
+
+    weather_data_service.fetch_weather_data = fetch_weather_data
+    weather_data_service._fetch_and_cache = fetch_and_cache
+    cache_key = weather_data_service.weather_cache_key("London")
+    stale_reading = weather_data_service.process_weather_information(build_current_weather_payload("London"))
+    weather_data_service.response_cache.store(cache_key, stale_reading, age_seconds=3600)
+
+    served_readings = [weather_data_service.get_complete_weather_info("London") for _ in range(5)]
+    release_fetch.set()
+    assert refresh_done.wait(5)
+
+    assert all(served_reading is stale_reading for served_reading in served_readings)
+    assert fetched_cities == ["London"]
+    assert weather_data_service.response_cache.lookup(cache_key)[1]